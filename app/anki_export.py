@@ -0,0 +1,153 @@
+# app/anki_export.py
+# This module exports saved decks to Anki CSV files incrementally: a manifest remembers what
+# was exported, so each run writes only the cards added or changed since the last one.
+#
+#   python -m app.anki_export [--topic greetings ...] [--full] [--output-dir anki_exports]
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+from datetime import datetime
+import pandas as pd
+from app.config import ANKI_EXPORT_DIR, ANKI_MANIFEST_FILE, DATA_DIR
+from app.flashcard_utils import iter_topic_files, make_card_id
+from app.storage import dump_json_atomic, load_json
+
+COLUMNS = ["Front", "Back", "Audio", "Tags"]
+
+# exports read-modify-write the manifest; run them one at a time
+_lock = threading.Lock()
+
+
+def anki_row(card: dict) -> dict:
+    """The Front/Back/Audio fields Anki imports for one card."""
+    return {
+        "Front": card["word"],
+        "Back": f"{card['definition']}<br><br><b>Example:</b> {card.get('example', '')}<br><br><b>Synonyms:</b> {', '.join(card.get('synonyms', []))}<br><br><b>Antonyms:</b> {', '.join(card.get('antonyms', []))}",
+        "Audio": (
+            f"[sound:{os.path.basename(card.get('tts_path', ''))}]"
+            if card.get("tts_path")
+            else ""
+        ),
+    }
+
+
+def _fingerprint(row: dict) -> str:
+    text = "\x1f".join(str(row[c]) for c in COLUMNS)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def load_manifest(path: str) -> dict:
+    manifest = load_json(path) if os.path.exists(path) else {}
+    manifest.setdefault("decks", {})  # deck basename -> [size, mtime_ns] at its last export
+    manifest.setdefault("cards", {})  # card id -> fingerprint of the exported row
+    manifest.setdefault("exports", [])  # files written, oldest first
+    return manifest
+
+
+def _unique_path(output_dir: str, mode: str, now: datetime) -> str:
+    stem = f"anki_{mode}_{now.strftime('%Y%m%d%H%M%S')}"
+    path, n = os.path.join(output_dir, stem + ".csv"), 1
+    while os.path.exists(path):
+        path, n = os.path.join(output_dir, f"{stem}_{n}.csv"), n + 1
+    return path
+
+
+def export(
+    topics: list[str] | None = None,
+    full: bool = False,
+    data_dir: str = DATA_DIR,
+    output_dir: str = ANKI_EXPORT_DIR,
+    manifest_path: str = ANKI_MANIFEST_FILE,
+    now: datetime | None = None,
+) -> dict:
+    """Export the decks of topics (default: every deck) and return a report.
+
+    - delta (default): only cards that are new or whose exported fields changed
+      since the last export go into a new, uniquely named CSV; decks whose file
+      is unchanged since then are not even read. Nothing changed -> no file.
+    - full: every card of the selected decks. With all decks selected this
+      compacts the export history: the full file replaces every earlier export.
+    """
+    now = now or datetime.now()
+    with _lock:
+        manifest = load_manifest(manifest_path)
+        wanted = set(topics) if topics else None
+        rows, decks_read, seen = [], 0, set()
+        for topic, path in iter_topic_files(data_dir):
+            if wanted is not None and topic not in wanted:
+                continue
+            name = os.path.basename(path)
+            st = os.stat(path)
+            stamp = [st.st_size, st.st_mtime_ns]
+            seen.add(name)
+            if not full and manifest["decks"].get(name) == stamp:
+                continue
+            try:
+                cards = load_json(path)
+            except (OSError, ValueError) as e:
+                print(f"[anki_export] skipping {name}: {e}", file=sys.stderr)
+                continue
+            decks_read += 1
+            for card in cards if isinstance(cards, list) else []:
+                if not isinstance(card, dict) or not card.get("word"):
+                    continue
+                row = anki_row(card)
+                row["Tags"] = topic.replace(" ", "_")
+                card_id = make_card_id(topic, str(card["word"]))
+                fingerprint = _fingerprint(row)
+                if full or manifest["cards"].get(card_id) != fingerprint:
+                    rows.append(row)
+                manifest["cards"][card_id] = fingerprint
+            manifest["decks"][name] = stamp
+
+        mode = "full" if full else "delta"
+        report = {"mode": mode, "file": None, "cards": len(rows), "decks_read": decks_read, "removed": []}
+        if full and wanted is None:
+            # forget decks that no longer exist so a re-created topic is exported again
+            manifest["decks"] = {k: v for k, v in manifest["decks"].items() if k in seen}
+        if rows or full:
+            os.makedirs(output_dir, exist_ok=True)
+            out = _unique_path(output_dir, mode, now)
+            pd.DataFrame(rows, columns=COLUMNS).to_csv(out, index=False)
+            report["file"] = out
+            if full and wanted is None:
+                for entry in manifest["exports"]:
+                    try:
+                        os.remove(entry["file"])
+                        report["removed"].append(entry["file"])
+                    except FileNotFoundError:
+                        pass
+                manifest["exports"] = []
+            manifest["exports"].append(
+                {
+                    "file": out,
+                    "mode": mode,
+                    "at": now.isoformat(timespec="seconds"),
+                    "topics": sorted(wanted) if wanted else None,
+                    "cards": len(rows),
+                }
+            )
+        dump_json_atomic(manifest, manifest_path, "json")
+        return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export new and changed cards to an Anki CSV.")
+    parser.add_argument("--topic", action="append", dest="topics", help="repeat for several topics (default: all)")
+    parser.add_argument("--full", action="store_true", help="export every card instead of the changes")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--output-dir", default=ANKI_EXPORT_DIR)
+    args = parser.parse_args(argv)
+    report = export(args.topics, args.full, args.data_dir, args.output_dir)
+    if report["file"] is None:
+        print(f"[anki_export] nothing changed ({report['decks_read']} decks read)")
+    else:
+        print(f"[anki_export] {report['mode']}: {report['cards']} cards -> {report['file']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
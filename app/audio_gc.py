@@ -0,0 +1,240 @@
+# app/audio_gc.py
+# This module maintains tts_audio/: it hardlinks byte-identical audio files together, removes
+# files no deck references (mark-and-sweep) and caps the space used by player-derived .wav files.
+#
+#   python -m app.audio_gc [--apply] [--wav-cap-mb 200] [--grace-seconds 3600]
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from app import paths
+from app.config import AUDIO_DIR, AUDIO_GC_GRACE_SECONDS, AUDIO_WAV_CAP_MB, DATA_DIR, RESERVE_DIR, STATE_DIR
+from app.flashcard_utils import iter_topic_files
+from app.storage import load_json
+from app.warmer import iter_reserve_files
+
+HASH_CACHE_FILE = os.path.join(STATE_DIR, "audio_hashes.json")
+
+# one collection at a time; a second caller gets GCBusy instead of waiting
+_running = threading.Lock()
+
+
+class GCBusy(Exception):
+    pass
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class HashCache:
+    """sha256 per file, reused while the file's size and mtime are unchanged."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except json.JSONDecodeError:
+                self.entries = {}
+
+    def get(self, path: str, st: os.stat_result) -> str:
+        key = os.path.basename(path)
+        entry = self.entries.get(key)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        digest = _file_hash(path)
+        self.entries[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def save(self, live: set[str]) -> None:
+        self.entries = {k: v for k, v in self.entries.items() if k in live}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.entries))
+        os.replace(tmp, self.path)
+
+
+def referenced_audio(data_dir: str, reserve_dir: str = RESERVE_DIR) -> set[str]:
+    """Basenames of every audio file named by a card's tts_path in any deck, or in the warm
+    catalog's reserve (cards synthesized ahead of being served, see app.warmer)."""
+    names = set()
+    for _, path in iter_topic_files(data_dir):
+        try:
+            cards = load_json(path)
+        except (OSError, ValueError):
+            continue
+        for card in cards if isinstance(cards, list) else []:
+            if isinstance(card, dict) and card.get("tts_path"):
+                names.add(os.path.basename(card["tts_path"]))
+    for _, data in iter_reserve_files(reserve_dir):
+        for card in data.get("cards", []) if isinstance(data, dict) else []:
+            if isinstance(card, dict) and card.get("tts_path"):
+                names.add(os.path.basename(card["tts_path"]))
+    return names
+
+
+def _replace_with_link(canonical: str, duplicate: str) -> None:
+    tmp = duplicate + ".gc-link"
+    os.link(canonical, tmp)
+    os.replace(tmp, duplicate)
+
+
+def collect(
+    data_dir: str = DATA_DIR,
+    audio_dir: str = AUDIO_DIR,
+    dry_run: bool = True,
+    wav_cap_bytes: int = AUDIO_WAV_CAP_MB * 1024 * 1024,
+    grace_seconds: float = AUDIO_GC_GRACE_SECONDS,
+    hash_cache_path: str = HASH_CACHE_FILE,
+    now: float | None = None,
+    reserve_dir: str = RESERVE_DIR,
+) -> dict:
+    """Run one maintenance pass and return a report of what was (or would be) done.
+
+    - sweep: audio no deck (or reserved card) references is deleted once older than grace_seconds
+      (so audio of a generation that hasn't saved its deck yet survives);
+      "x.wav" next to a referenced "x.mp3" is the player's converted copy and
+      counts as referenced
+    - dedupe: referenced files with identical content are hardlinked to one
+      inode, keeping every name decks point to
+    - cap: converted .wav copies beyond wav_cap_bytes are evicted least
+      recently used first (the player re-creates them on demand)
+    """
+    if not _running.acquire(blocking=False):
+        raise GCBusy("audio collection already running")
+    try:
+        return _collect(data_dir, audio_dir, dry_run, wav_cap_bytes, grace_seconds, hash_cache_path, now, reserve_dir)
+    finally:
+        _running.release()
+
+
+def _collect(data_dir, audio_dir, dry_run, wav_cap_bytes, grace_seconds, hash_cache_path, now, reserve_dir):
+    now = time.time() if now is None else now
+    report = {
+        "dry_run": dry_run,
+        "scanned": 0,
+        "referenced": 0,
+        "orphans": [],
+        "duplicates": [],
+        "evicted": [],
+        "bytes_freed": 0,
+    }
+    if not os.path.isdir(audio_dir):
+        return report
+
+    # List before marking: a file created after the listing is never swept,
+    # and a deck saved before the mark protects everything it names.
+    files, where = {}, {}
+    for entry in paths.iter_audio(audio_dir):
+        files[entry.name] = entry.stat()
+        where[entry.name] = entry.path
+    report["scanned"] = len(files)
+    referenced = referenced_audio(data_dir, reserve_dir) & files.keys()
+    report["referenced"] = len(referenced)
+
+    derived = {
+        name
+        for name in files
+        if name.lower().endswith(".wav") and os.path.splitext(name)[0] + ".mp3" in files
+    }
+    keep = set(referenced)
+    keep.update(n for n in derived if os.path.splitext(n)[0] + ".mp3" in referenced)
+
+    # sweep
+    for name, st in sorted(files.items()):
+        if name in keep or now - st.st_mtime < grace_seconds:
+            continue
+        report["orphans"].append(name)
+        report["bytes_freed"] += st.st_size
+        if not dry_run:
+            try:
+                os.remove(where[name])
+            except FileNotFoundError:
+                pass
+    live = {n: st for n, st in files.items() if n not in report["orphans"]}
+
+    # dedupe referenced originals; only same-size files can be identical, so most are never hashed
+    hashes = HashCache(hash_cache_path)
+    by_size = {}
+    for name in sorted(referenced):
+        by_size.setdefault(live[name].st_size, []).append(name)
+    for size, names in by_size.items():
+        if len(names) < 2 or size == 0:
+            continue
+        canonical_for = {}
+        for name in names:
+            path = where[name]
+            digest = hashes.get(path, live[name])
+            canonical = canonical_for.setdefault(digest, name)
+            if canonical == name:
+                continue
+            if live[name].st_ino == live[canonical].st_ino:
+                continue
+            report["duplicates"].append({"file": name, "same_as": canonical})
+            if live[name].st_nlink == 1:
+                report["bytes_freed"] += size
+            if not dry_run:
+                _replace_with_link(where[canonical], path)
+    if not dry_run:
+        hashes.save(set(live))
+
+    # LRU cap on converted .wav copies
+    wavs = sorted(
+        (n for n in derived if n in live),
+        key=lambda n: max(live[n].st_atime, live[n].st_mtime),
+    )
+    total = sum(live[n].st_size for n in wavs)
+    for name in wavs:
+        if total <= wav_cap_bytes:
+            break
+        total -= live[name].st_size
+        report["evicted"].append(name)
+        report["bytes_freed"] += live[name].st_size
+        if not dry_run:
+            try:
+                os.remove(where[name])
+            except FileNotFoundError:
+                pass
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Deduplicate and garbage-collect tts_audio/.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--audio-dir", default=AUDIO_DIR)
+    parser.add_argument("--reserve-dir", default=RESERVE_DIR)
+    parser.add_argument("--apply", action="store_true", help="make changes (default is a dry run)")
+    parser.add_argument("--wav-cap-mb", type=float, default=AUDIO_WAV_CAP_MB)
+    parser.add_argument("--grace-seconds", type=float, default=AUDIO_GC_GRACE_SECONDS)
+    args = parser.parse_args(argv)
+
+    report = collect(
+        args.data_dir,
+        args.audio_dir,
+        dry_run=not args.apply,
+        wav_cap_bytes=int(args.wav_cap_mb * 1024 * 1024),
+        grace_seconds=args.grace_seconds,
+        reserve_dir=args.reserve_dir,
+    )
+    verb = "would free" if report["dry_run"] else "freed"
+    print(
+        f"[audio_gc] {report['scanned']} files, {report['referenced']} referenced: "
+        f"{len(report['orphans'])} orphans, {len(report['duplicates'])} duplicates, "
+        f"{len(report['evicted'])} evicted .wav; {verb} {report['bytes_freed'] / 1e6:.1f} MB"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
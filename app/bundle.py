@@ -0,0 +1,119 @@
+# app/bundle.py
+# This module packs every stored deck into one read-only bundle file the GUI can open with
+# mmap and decode card by card (reader: gui/utils/bundle.py).
+#
+#   python -m app.bundle [--data-dir saved_flashcards] [--out saved_flashcards/library.fcb]
+#
+# Layout (little-endian):
+#   header   MAGIC, version, field count, topic count, card count, then the offsets of the
+#            topic table, the record index and the string heap
+#   topics   UTF-8 JSON: {"fields": [...], "topics": [[topic, file, first_card, count], ...]}
+#   index    one fixed-size record per card: (offset, length) into the heap for each field;
+#            offset MISSING marks an absent field
+#   heap     the UTF-8 field values back to back; list/dict fields are stored as JSON text
+
+import argparse
+import json
+import os
+import struct
+import sys
+from app.config import BUNDLE_FILE, DATA_DIR
+from app.flashcard_utils import iter_topic_files
+from app.storage import load_json
+
+MAGIC = b"FCBUNDLE"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIIQQQ")
+SLOT = struct.Struct("<II")
+MISSING = 0xFFFFFFFF
+
+# (name, kind): "s" is stored as text, "j" as JSON. Keys outside this list go to "extra".
+FIELDS = (
+    ("word", "s"),
+    ("definition", "s"),
+    ("example", "s"),
+    ("synonyms", "j"),
+    ("antonyms", "j"),
+    ("tts_path", "s"),
+    ("extra", "j"),
+)
+_KIND = dict(FIELDS)
+_NAMED = set(_KIND) - {"extra"}
+
+
+def _encode(card: dict) -> list[bytes | None]:
+    """Field values of card in FIELDS order, as UTF-8 (None when absent)."""
+    # a text field holding something else (e.g. a list of words) rides along in "extra",
+    # so every "s" slot decodes as plain text
+    extra = {
+        k: v for k, v in card.items()
+        if k not in _NAMED or (_KIND[k] == "s" and not isinstance(v, str) and v is not None)
+    }
+    values = []
+    for name, kind in FIELDS:
+        if name == "extra":
+            value = extra or None
+        else:
+            value = None if name in extra else card.get(name)
+        if value is None:
+            values.append(None)
+        elif kind == "s":
+            values.append(value.encode("utf-8"))
+        else:
+            values.append(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return values
+
+
+def build(data_dir: str = DATA_DIR, out_path: str = BUNDLE_FILE) -> dict:
+    """Write a bundle of every deck in data_dir to out_path and return a summary."""
+    topics, index, heap = [], bytearray(), bytearray()
+    count = 0
+    for topic, path in iter_topic_files(data_dir):
+        try:
+            cards = load_json(path)
+        except (OSError, ValueError) as e:
+            print(f"[bundle] skipping {os.path.basename(path)}: {e}", file=sys.stderr)
+            continue
+        cards = [c for c in cards if isinstance(c, dict)] if isinstance(cards, list) else []
+        topics.append([topic, os.path.basename(path), count, len(cards)])
+        for card in cards:
+            for value in _encode(card):
+                if value is None:
+                    index += SLOT.pack(MISSING, 0)
+                else:
+                    index += SLOT.pack(len(heap), len(value))
+                    heap += value
+            count += 1
+    if len(heap) >= MISSING:
+        raise ValueError("bundle heap exceeds 4 GiB")
+
+    table = json.dumps({"fields": [list(f) for f in FIELDS], "topics": topics}, ensure_ascii=False).encode("utf-8")
+    topics_off = HEADER.size
+    index_off = topics_off + len(table)
+    heap_off = index_off + len(index)
+    header = HEADER.pack(MAGIC, VERSION, len(FIELDS), len(topics), count, topics_off, index_off, heap_off)
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(table)
+        f.write(index)
+        f.write(heap)
+    # readers that already mapped the old bundle keep their (unlinked) copy
+    os.replace(tmp, out_path)
+    return {"topics": len(topics), "cards": count, "bytes": heap_off + len(heap)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pack saved decks into a read-only bundle for the GUI.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--out", default=BUNDLE_FILE)
+    args = parser.parse_args(argv)
+    summary = build(args.data_dir, args.out)
+    print(f"[bundle] {summary['cards']} cards in {summary['topics']} topics -> {args.out} ({summary['bytes']} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# app/circuit_breaker.py
+# This module implements a circuit breaker used to fail fast while an external
+# dependency (the Mistral API) is down, instead of tying up threads in retries.
+
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures.
+
+    While open every call is rejected with CircuitOpen. After `probe_interval`
+    seconds the breaker goes half-open and lets a single probe call through:
+    success closes it, failure re-opens it for another interval.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, probe_interval: float = 30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._last_error = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.probe_interval:
+            self._state = HALF_OPEN
+        return self._state
+
+    def _retry_after(self) -> float:
+        return max(self._opened_at + self.probe_interval - self._clock(), 0.0)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpen unless a call may go through now."""
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN:
+                raise CircuitOpen(self.name, self._retry_after())
+            if state == HALF_OPEN:
+                if self._probing:
+                    # a probe is already in flight; everyone else keeps failing fast
+                    raise CircuitOpen(self.name, self.probe_interval)
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, error: Exception | None = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error) if error is not None else None
+            if self._probing or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def call(self, fn, *args, **kwargs):
+        self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def status(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            return {
+                "name": self.name,
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "probe_interval_s": self.probe_interval,
+                "retry_after_s": round(self._retry_after(), 3) if state == OPEN else 0.0,
+                "last_error": self._last_error,
+            }
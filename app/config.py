@@ -15,9 +15,107 @@ if not api_key:
         "[app.config] Warning: MISTRAL_API_KEY not set; Mistral client will be disabled unless provided at runtime"
     )
 
+# Generation: how many new cards a request aims for, and how hard it may try
+FLASHCARDS_PER_REQUEST = int(os.getenv("FLASHCARDS_PER_REQUEST", "5"))
+GENERATION_MAX_ROUNDS = int(os.getenv("GENERATION_MAX_ROUNDS", "3"))
+GENERATION_MAX_TOKENS = int(os.getenv("GENERATION_MAX_TOKENS", "8000"))
+# Large requests are split into parallel calls of at most GENERATION_CHUNK_SIZE cards
+GENERATION_CHUNK_SIZE = int(os.getenv("GENERATION_CHUNK_SIZE", "10"))
+GENERATION_PARALLELISM = int(os.getenv("GENERATION_PARALLELISM", "8"))
+MAX_CARDS_PER_REQUEST = int(os.getenv("MAX_CARDS_PER_REQUEST", "100"))
+TTS_PARALLELISM = int(os.getenv("TTS_PARALLELISM", "4"))
+# Bounded executors per pipeline stage: workers plus how many tasks may wait.
+# LLM and TTS workers are GENERATION_PARALLELISM and TTS_PARALLELISM above.
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+GENERATION_QUEUE_SIZE = int(os.getenv("GENERATION_QUEUE_SIZE", "16"))
+LLM_QUEUE_SIZE = int(os.getenv("LLM_QUEUE_SIZE", "32"))
+TTS_QUEUE_SIZE = int(os.getenv("TTS_QUEUE_SIZE", "200"))
+DISK_WORKERS = int(os.getenv("DISK_WORKERS", "4"))
+DISK_QUEUE_SIZE = int(os.getenv("DISK_QUEUE_SIZE", "64"))
+# Background prefetch generations (POST /flashcards/prefetch) get their own small stage and
+# are refused while interactive generations are waiting
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "1"))
+PREFETCH_QUEUE_SIZE = int(os.getenv("PREFETCH_QUEUE_SIZE", "2"))
+# Token-per-minute budgets enforced before a generation starts (0 disables)
+TOKEN_BUDGET_GLOBAL_TPM = int(os.getenv("TOKEN_BUDGET_GLOBAL_TPM", "500000"))
+TOKEN_BUDGET_CLIENT_TPM = int(os.getenv("TOKEN_BUDGET_CLIENT_TPM", "50000"))
+# Clients with a budget of their own; callers beyond that (and "unknown" ones) share one
+TOKEN_BUDGET_MAX_CLIENTS = int(os.getenv("TOKEN_BUDGET_MAX_CLIENTS", "1000"))
+# Rough token cost of one generated card, used to pre-charge requests
+TOKENS_PER_CARD_ESTIMATE = int(os.getenv("TOKENS_PER_CARD_ESTIMATE", "150"))
+# Cap on the "already known" word list sent to the model
+EXCLUSION_MAX_WORDS = int(os.getenv("EXCLUSION_MAX_WORDS", "150"))
+# Circuit breaker around the LLM: open after N consecutive failures, probe again after S seconds
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_PROBE_INTERVAL = float(os.getenv("LLM_BREAKER_PROBE_INTERVAL", "30"))
+
+# Text-to-speech backends tried in order (gtts, espeak, fake); a failing backend is
+# skipped for TTS_BACKEND_PROBE_INTERVAL seconds after TTS_BACKEND_FAILURES errors in a row
+TTS_BACKENDS = os.getenv("TTS_BACKENDS", "gtts,espeak")
+TTS_LANG = os.getenv("TTS_LANG", "ko")
+TTS_BACKEND_FAILURES = int(os.getenv("TTS_BACKEND_FAILURES", "3"))
+TTS_BACKEND_PROBE_INTERVAL = float(os.getenv("TTS_BACKEND_PROBE_INTERVAL", "60"))
+
+# On-disk format for decks and history: "json" (pretty-printed) or "gzip" (compact,
+# gzip-compressed JSON). Readers accept both, so switching only affects new writes.
+STORAGE_FORMAT = os.getenv("STORAGE_FORMAT", "json")
+# Where new deck and audio files go (app.paths): "sharded" into 256 hash-named subdirectories,
+# or "flat" directly in DATA_DIR / AUDIO_DIR. Readers accept both.
+STORAGE_LAYOUT = os.getenv("STORAGE_LAYOUT", "sharded")
+
 AUDIO_DIR = "tts_audio"
+# Audio maintenance (app.audio_gc): cap for the player's converted .wav copies, and how old
+# an unreferenced file must be before it is swept
+AUDIO_WAV_CAP_MB = int(os.getenv("AUDIO_WAV_CAP_MB", "200"))
+AUDIO_GC_GRACE_SECONDS = int(os.getenv("AUDIO_GC_GRACE_SECONDS", "3600"))
 DATA_DIR = "saved_flashcards"
 HISTORY_FILE = os.path.join(DATA_DIR, "history.json")
+# Packed read-only bundle of every deck for the GUI (python -m app.bundle); kept next to the
+# decks so the GUI lists it with the other saved files
+BUNDLE_FILE = os.path.join(DATA_DIR, "library.fcb")
+# Derived indexes and logs live outside DATA_DIR so they don't show up as decks
+STATE_DIR = "app_state"
+REVIEW_LOG_FILE = os.path.join(STATE_DIR, "reviews.log")
+STATS_DIR = os.path.join(STATE_DIR, "stats")
+USAGE_LEDGER_FILE = os.path.join(STATE_DIR, "usage.jsonl")
+SEARCH_INDEX_FILE = os.path.join(STATE_DIR, "search_index.jsonl")
+# history.json is the snapshot; generations since the last compaction are journaled here
+HISTORY_JOURNAL_FILE = os.path.join(STATE_DIR, "history.jsonl")
+HISTORY_COMPACT_EVENTS = int(os.getenv("HISTORY_COMPACT_EVENTS", "200"))
+# Revisioned change feed of card writes served by GET /sync and the /sync/ws WebSocket
+CHANGES_FILE = os.path.join(STATE_DIR, "changes.jsonl")
+# Cards rewritten by the command-line tools (app.enrich, app.prewarm_audio) wait here until the
+# server records them in the feed: only the server appends to CHANGES_FILE
+CHANGES_INBOX_DIR = os.path.join(STATE_DIR, "changes_inbox")
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+SYNC_PUSH_INTERVAL = float(os.getenv("SYNC_PUSH_INTERVAL", "1.0"))
+# Request tracing (app.tracing): finished traces are appended to TRACE_FILE, rotated at
+# TRACE_MAX_BYTES into TRACE_BACKUPS older files; GET /debug/traces ranks the last TRACE_RECENT
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") != "0"
+TRACE_FILE = os.path.join(STATE_DIR, "traces.jsonl")
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(5 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("TRACE_BACKUPS", "3"))
+TRACE_RECENT = int(os.getenv("TRACE_RECENT", "500"))
+# Warm catalog (app.warmer): requests per topic are counted with a DEMAND_HALF_LIFE_DAYS decay
+# and, together with history.json, rank topics; every WARM_INTERVAL seconds inside WARM_WINDOW
+# ("HH:MM-HH:MM" local time, empty = any time) and while no generation is waiting, a pass
+# tops up the WARM_TOPICS best topics to WARM_RESERVE_CARDS ready cards (audio included),
+# spending at most WARM_TOKEN_BUDGET tokens. POST /flashcards serves from the reserve first.
+WARMER_ENABLED = os.getenv("WARMER_ENABLED", "1") != "0"
+WARM_WINDOW = os.getenv("WARM_WINDOW", "01:00-06:00")
+WARM_INTERVAL = float(os.getenv("WARM_INTERVAL", "600"))
+WARM_TOPICS = int(os.getenv("WARM_TOPICS", "200"))
+WARM_RESERVE_CARDS = int(os.getenv("WARM_RESERVE_CARDS", "10"))
+WARM_TOKEN_BUDGET = int(os.getenv("WARM_TOKEN_BUDGET", "100000"))
+DEMAND_HALF_LIFE_DAYS = float(os.getenv("DEMAND_HALF_LIFE_DAYS", "7"))
+DEMAND_FILE = os.path.join(STATE_DIR, "topic_demand.json")
+RESERVE_DIR = os.path.join(STATE_DIR, "reserve")
+# Anki CSV exports, and the manifest of what the incremental export (app.anki_export) has written
+ANKI_EXPORT_DIR = "anki_exports"
+ANKI_MANIFEST_FILE = os.path.join(STATE_DIR, "anki_manifest.json")
+# Index initial consonants of Hangul syllables so "ㅇㄴㅎㅅㅇ" finds 안녕하세요
+SEARCH_JAMO = os.getenv("SEARCH_JAMO", "1") != "0"
 
 os.makedirs(AUDIO_DIR, exist_ok=True)
 os.makedirs(DATA_DIR, exist_ok=True)
+os.makedirs(STATE_DIR, exist_ok=True)
@@ -0,0 +1,114 @@
+# app/dedupe.py
+# This module provides word normalization and a global index of known words used to skip
+# duplicate cards (and their TTS) across topics, with MinHash near-duplicate definition checks.
+
+import re
+import threading
+import unicodedata
+import zlib
+import numpy as np
+
+# MinHash parameters: NUM_PERM = BANDS * ROWS. With 8 bands of 4 rows a pair with
+# Jaccard similarity 0.8 collides in at least one band ~98% of the time.
+NUM_PERM = 32
+BANDS = 8
+ROWS = 4
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.8
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20231001)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_word(word: str) -> str:
+    """NFC-normalize, casefold and drop whitespace and punctuation."""
+    text = unicodedata.normalize("NFC", word or "").casefold()
+    return "".join(
+        ch for ch in text if not ch.isspace() and not unicodedata.category(ch).startswith("P")
+    )
+
+
+def _normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def minhash(text: str) -> np.ndarray | None:
+    """Return the MinHash signature of the character shingles of text (None if empty)."""
+    text = _normalize_text(text)
+    if not text:
+        return None
+    if len(text) <= SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+
+def _bands(sig: np.ndarray):
+    for band in range(BANDS):
+        yield band, sig[band * ROWS : (band + 1) * ROWS].tobytes()
+
+
+class WordIndex:
+    """Global map of normalized word -> first stored card, plus per-topic
+    LSH buckets over definition signatures."""
+
+    def __init__(self):
+        self._entries: dict[str, dict] = {}
+        self._topic_words: dict[str, set] = {}
+        self._sigs: dict[tuple[str, str], np.ndarray] = {}
+        self._buckets: dict[tuple, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, topic: str, card: dict) -> None:
+        norm = normalize_word(card.get("word"))
+        if not norm:
+            return
+        with self._lock:
+            entry = self._entries.get(norm)
+            if entry is None or (not entry.get("tts_path") and card.get("tts_path")):
+                self._entries[norm] = {"topic": topic, "card": card, "tts_path": card.get("tts_path")}
+            words = self._topic_words.setdefault(topic, set())
+            if norm in words:
+                return
+            words.add(norm)
+            sig = minhash(card.get("definition"))
+            if sig is not None:
+                self._sigs[(topic, norm)] = sig
+                for band, key in _bands(sig):
+                    self._buckets.setdefault((topic, band, key), []).append(norm)
+
+    def lookup(self, word: str) -> dict | None:
+        """Return {"topic", "card", "tts_path"} for a known word, else None."""
+        return self._entries.get(normalize_word(word))
+
+    def in_topic(self, topic: str, word: str) -> bool:
+        return normalize_word(word) in self._topic_words.get(topic, ())
+
+    def near_duplicate(self, topic: str, sig: np.ndarray | None) -> str | None:
+        """Return a normalized word in topic whose definition nearly matches sig."""
+        if sig is None:
+            return None
+        candidates = set()
+        for band, key in _bands(sig):
+            candidates.update(self._buckets.get((topic, band, key), ()))
+        for norm in candidates:
+            if similarity(sig, self._sigs[(topic, norm)]) >= NEAR_DUPLICATE_THRESHOLD:
+                return norm
+        return None
@@ -0,0 +1,291 @@
+# app/enrich.py
+# This module is a command-line tool that adds richer fields (Hanja origin, frequency, multiple
+# meanings, extra examples) to cards that already exist, instead of regenerating whole decks.
+#
+#   python -m app.enrich --fields hanja,frequency [--topic food ...] [--batch 25] [--workers 4]
+#                        [--max-tokens 200000] [--dry-run]
+#
+# Decks are streamed one at a time; cards missing any requested field are packed many per LLM
+# call. A deck is rewritten (atomically, re-read first so cards the API appended meanwhile are
+# kept) once all of its cards have been answered, and finished decks are checkpointed, so an
+# interrupted, rate-limited or over-budget run resumes where it stopped. Enriched cards are
+# queued for the sync feed (app.services.sync_service.queue_changes) so GUI clients get the new
+# fields; the search and quiz indexes don't read them.
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fastapi import HTTPException
+from app.circuit_breaker import CircuitOpen
+from app.config import DATA_DIR, STATE_DIR
+from app.flashcard_utils import iter_topic_files, parse_flashcards
+from app.services.flashcard_service import complete_prompt
+from app.services.sync_service import queue_changes
+from app.storage import dump_json_atomic, load_json
+
+CHECKPOINT_FILE = os.path.join(STATE_DIR, "enrich_checkpoint.json")
+# client id the enrichment's LLM calls are recorded under in the usage ledger
+CLIENT_ID = "enrich"
+
+# field -> what the model is asked for
+FIELDS = {
+    "hanja": 'the Hanja (Chinese characters) the word comes from as a string, or null for native Korean words',
+    "frequency": 'how common the word is: one of "very common", "common", "uncommon", "rare"',
+    "meanings": "a list of the word's distinct meanings in English, most common first",
+    "examples": "a list of 2 further short Korean example sentences using the word, each with an English translation",
+}
+
+
+class _Stop(Exception):
+    """Raised by a batch when the run should stop (rate limited or LLM circuit open)."""
+
+
+def _missing(card, fields: list[str]) -> list[str]:
+    if not isinstance(card, dict) or not card.get("word"):
+        return []
+    return [f for f in fields if f not in card]
+
+
+def _build_prompt(cards: list[dict], fields: list[str]) -> str:
+    wanted = "\n".join(f"    - {f}: {FIELDS[f]}" for f in fields)
+    items = json.dumps(
+        [{"id": i, "word": c["word"], "definition": c.get("definition", "")} for i, c in enumerate(cards)],
+        ensure_ascii=False,
+    )
+    return f"""
+    For each KOREAN word below, add these fields:
+{wanted}
+    Words: {items}
+    Return a JSON array with one object per word, each with its "id" and the fields above.
+    """
+
+
+def _load_checkpoint(path: str) -> dict:
+    if os.path.exists(path):
+        try:
+            return load_json(path)
+        except ValueError:
+            pass
+    return {"decks": {}}
+
+
+def _save_checkpoint(path: str, checkpoint: dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    dump_json_atomic(checkpoint, path, "json")
+
+
+def _done(checkpoint: dict, name: str, mtime: float, fields: list[str]) -> bool:
+    entry = checkpoint["decks"].get(name)
+    return bool(entry) and entry["mtime"] == mtime and set(fields) <= set(entry["fields"])
+
+
+def scan(data_dir: str, fields: list[str], checkpoint: dict, topics: list[str] | None = None):
+    """Yield (topic, deck path, cards missing a requested field) one deck at a time."""
+    for topic, path in iter_topic_files(data_dir):
+        if topics and topic not in topics:
+            continue
+        name = os.path.basename(path)
+        if _done(checkpoint, name, os.path.getmtime(path), fields):
+            continue
+        try:
+            cards = load_json(path)
+        except (OSError, ValueError) as e:
+            print(f"[enrich] skipping {name}: {e}", file=sys.stderr)
+            continue
+        yield topic, path, [c for c in cards if _missing(c, fields)] if isinstance(cards, list) else []
+
+
+def enrich_batch(cards: list[dict], fields: list[str]) -> tuple[list[dict | None], int]:
+    """Ask for fields of every card in one LLM call; returns (per-card values or None, tokens)."""
+    try:
+        content, tokens = complete_prompt(_build_prompt(cards, fields), client_id=CLIENT_ID)
+    except HTTPException as e:
+        if e.status_code == 429:
+            raise _Stop("rate limited by the LLM API")
+        raise
+    except CircuitOpen as e:
+        raise _Stop(str(e))
+    try:
+        items = parse_flashcards(content)
+    except ValueError:
+        items = []
+    values = [None] * len(cards)
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        i = item.get("id")
+        if isinstance(i, int) and 0 <= i < len(cards) and all(f in item for f in fields):
+            values[i] = {f: item[f] for f in fields}
+    return values, tokens
+
+
+def merge(topic: str, path: str, results: dict[str, dict]) -> int:
+    """Write results (word -> fields) into the deck at path and queue the updated cards for
+    the sync feed; returns cards updated."""
+    cards = load_json(path)
+    updated = []
+    for card in cards if isinstance(cards, list) else []:
+        values = results.get(card.get("word")) if isinstance(card, dict) else None
+        if values:
+            card.update(values)
+            updated.append(card)
+    if updated:
+        dump_json_atomic(cards, path)
+        queue_changes(topic, updated)
+    return len(updated)
+
+
+def enrich(
+    fields: list[str],
+    data_dir: str = DATA_DIR,
+    topics: list[str] | None = None,
+    batch_size: int = 25,
+    workers: int = 4,
+    max_tokens: int = 0,
+    checkpoint_path: str = CHECKPOINT_FILE,
+    dry_run: bool = False,
+    out=sys.stdout,
+) -> dict:
+    """Fill fields on every card that lacks them and return a summary.
+
+    max_tokens (0 = unlimited) stops submitting batches once the tokens used plus
+    the expected cost of the calls still running reach it; running calls finish,
+    so the budget is approximate. Decks finished so far are merged and
+    checkpointed either way.
+    """
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"fields must be some of {', '.join(FIELDS)}")
+    checkpoint = _load_checkpoint(checkpoint_path)
+    summary = {"decks": 0, "cards": 0, "calls": 0, "tokens": 0, "enriched": 0, "unanswered": 0, "stopped": None}
+    if dry_run:
+        for _, _, missing in scan(data_dir, fields, checkpoint, topics):
+            summary["decks"] += 1
+            summary["cards"] += len(missing)
+        summary["calls"] = -(-summary["cards"] // batch_size)
+        return summary
+
+    # deck path -> {"topic", "left": cards not answered yet, "results": word -> fields, "complete": bool}
+    decks = {}
+
+    def finish(path: str) -> None:
+        deck = decks.pop(path)
+        summary["enriched"] += merge(deck["topic"], path, deck["results"]) if deck["results"] else 0
+        if deck["complete"]:
+            name = os.path.basename(path)
+            checkpoint["decks"][name] = {"mtime": os.path.getmtime(path), "fields": sorted(fields)}
+        _save_checkpoint(checkpoint_path, checkpoint)
+        print(f"[enrich] {os.path.basename(path)}: {len(deck['results'])} cards enriched", file=out)
+
+    def handle(future, batch) -> None:
+        try:
+            values, tokens = future.result()
+        except _Stop as e:
+            summary["stopped"] = summary["stopped"] or str(e)
+            values, tokens = [None] * len(batch), 0
+        except Exception as e:
+            print(f"[enrich] batch failed: {e}", file=out)
+            values, tokens = [None] * len(batch), 0
+        summary["tokens"] += tokens
+        for (path, card), value in zip(batch, values):
+            deck = decks[path]
+            deck["left"] -= 1
+            if value is None:
+                deck["complete"] = False
+                summary["unanswered"] += 1
+            else:
+                deck["results"][card["word"]] = value
+            if deck["left"] == 0:
+                finish(path)
+
+    def batches():
+        batch = []
+        for topic, path, missing in scan(data_dir, fields, checkpoint, topics):
+            summary["decks"] += 1
+            if not missing:
+                decks[path] = {"topic": topic, "left": 0, "results": {}, "complete": True}
+                finish(path)
+                continue
+            decks[path] = {"topic": topic, "left": len(missing), "results": {}, "complete": True}
+            for card in missing:
+                batch.append((path, card))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    in_flight = {}
+
+    def collect(block: bool) -> None:
+        finished = wait(in_flight, return_when=FIRST_COMPLETED)[0] if block else [f for f in in_flight if f.done()]
+        for future in finished:
+            handle(future, in_flight.pop(future))
+
+    def over_budget() -> bool:
+        if not max_tokens:
+            return False
+        if in_flight and summary["calls"] == len(in_flight):
+            # no call has come back yet, so there is no cost estimate: wait for one
+            collect(block=True)
+        answered = summary["calls"] - len(in_flight)
+        expected = summary["tokens"] / answered * len(in_flight) if answered else 0
+        return summary["tokens"] + expected >= max_tokens
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich")
+    try:
+        for batch in batches():
+            collect(block=False)
+            if over_budget():
+                summary["stopped"] = summary["stopped"] or f"token budget of {max_tokens} used"
+            if summary["stopped"]:
+                break
+            # keep at most one batch queued per worker so decks are read only as fast as they are answered
+            while len(in_flight) >= 2 * workers:
+                collect(block=True)
+            summary["calls"] += 1
+            summary["cards"] += len(batch)
+            in_flight[pool.submit(enrich_batch, [card for _, card in batch], fields)] = batch
+        for future in list(in_flight):
+            handle(future, in_flight.pop(future))
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        # decks cut short (stopped, interrupted) keep the answers they got; they are not checkpointed
+        for path in list(decks):
+            decks[path]["complete"] = False
+            finish(path)
+    pool.shutdown()
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Add richer fields to the cards of saved decks.")
+    parser.add_argument("--fields", required=True, help=f"comma-separated, from: {', '.join(FIELDS)}")
+    parser.add_argument("--topic", action="append", dest="topics", help="repeat for several topics (default: all)")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--batch", type=int, default=25, help="cards per LLM call")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent LLM calls")
+    parser.add_argument("--max-tokens", type=int, default=0, help="stop after this many tokens (0 = unlimited)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help="progress file used to resume")
+    parser.add_argument("--dry-run", action="store_true", help="only count the cards and calls needed")
+    args = parser.parse_args(argv)
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+    try:
+        summary = enrich(
+            fields, args.data_dir, args.topics, args.batch, args.workers, args.max_tokens, args.checkpoint, args.dry_run
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"[enrich] done: {json.dumps(summary)}")
+    if summary["stopped"]:
+        print(f"[enrich] stopped early ({summary['stopped']}); run again to resume")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
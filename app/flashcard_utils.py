@@ -1,27 +1,38 @@
 # app/flashcard_utils.py
 # This module provides utility functions for handling flashcards, including parsing and file management.
 
-import os
 import json
 import re
+import hashlib
 from datetime import datetime
+from app import paths, tracing
+from app.paths import TOPIC_FILE_RE  # noqa: F401 (re-exported)
 
 
 def get_topic_file(topic: str, data_dir: str) -> str | None:
     """Return path of existing topic file or None if not found"""
-    for f in os.listdir(data_dir):
-        if f.startswith(topic + "_") and f.endswith(".json"):
-            return os.path.join(data_dir, f)
-    return None
+    return paths.find_topic_deck(data_dir, topic)
+
+
+def iter_topic_files(data_dir: str):
+    """Yield (topic, path) for every deck file in data_dir, in either layout (see app.paths)."""
+    yield from paths.iter_decks(data_dir)
+
+
+def make_card_id(topic: str, word: str) -> str:
+    """Return a stable, URL-safe id for the card `word` in `topic`."""
+    key = f"{topic}\x1f{word}".encode("utf-8")
+    return hashlib.sha1(key).hexdigest()[:16]
 
 
 def parse_flashcards(text: str) -> list[dict]:
     """Parse flashcards from Mistral API response."""
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+    with tracing.span("parse_flashcards", chars=len(text or "")):
         try:
-            json_str = re.search(r"\[.*\]", text, re.S).group(0)
-            return json.loads(json_str)
-        except Exception as e:
-            raise ValueError(f"Failed to parse flashcards: {str(e)}")
+            return json.loads(text)
+        except json.JSONDecodeError:
+            try:
+                json_str = re.search(r"\[.*\]", text, re.S).group(0)
+                return json.loads(json_str)
+            except Exception as e:
+                raise ValueError(f"Failed to parse flashcards: {str(e)}")
@@ -1,18 +1,123 @@
 # app/history.py
-# This module manages loading and saving the history of reviewed flashcards.
+# This module manages the history of generated topics: the history.json snapshot plus an
+# append-only journal of changes since, replayed into an in-memory view.
 
-import os
 import json
+import os
+import threading
 from datetime import datetime
+from app.storage import dump_json, dump_json_atomic, load_json
+
+SORT_FIELDS = ("updated_at", "created_at", "topic", "count")
 
 
 def load_history(history_file: str) -> dict:
     if os.path.exists(history_file):
-        with open(history_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json(history_file)
     return {}
 
 
 def save_history(history: dict, history_file: str) -> None:
-    with open(history_file, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+    dump_json(history, history_file)
+
+
+def _apply(view: dict, event: dict) -> None:
+    """Fold one journal event into the view. Events carry absolute values, so
+    replaying an event twice (e.g. after a crash mid-compaction) is harmless."""
+    topic = event["topic"]
+    entry = view.get(topic)
+    if event["event"] == "created" or entry is None:
+        view[topic] = {
+            "filename": event["filename"],
+            "created_at": event["at"],
+            "updated_at": event["at"],
+            "count": event["count"],
+        }
+    else:
+        entry["updated_at"] = event["at"]
+        entry["count"] = event["count"]
+        entry["filename"] = event["filename"]
+
+
+class HistoryJournal:
+    """Topic history kept as snapshot + journal.
+
+    record() appends one JSON line per generation instead of rewriting
+    history.json; compact() folds the journal into the snapshot (written
+    atomically) and truncates it. The view is the snapshot with the journal
+    replayed on top and is what readers are served.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: str, compact_every: int = 200):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+        self._view = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        with self._lock:
+            view = load_history(self.snapshot_path)
+            pending = 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            _apply(view, json.loads(line))
+                        except (json.JSONDecodeError, KeyError):
+                            # tolerate a torn last line after a crash
+                            continue
+                        pending += 1
+            self._view, self._pending = view, pending
+
+    @property
+    def loaded(self) -> bool:
+        return self._view is not None
+
+    def record(self, topic: str, filename: str, count: int, created: bool, at: str | None = None) -> bool:
+        """Journal a generation for topic. Returns True once a compaction is due."""
+        event = {
+            "event": "created" if created else "updated",
+            "topic": topic,
+            "filename": filename,
+            "count": count,
+            "at": at or datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            if self._view is not None:
+                _apply(self._view, event)
+            self._pending += 1
+            return self._pending >= self.compact_every
+
+    def compact(self) -> None:
+        with self._lock:
+            if self._view is None or not self._pending:
+                return
+            dump_json_atomic(self._view, self.snapshot_path)
+            # the snapshot now covers every journaled event
+            with open(self.journal_path, "w", encoding="utf-8"):
+                pass
+            self._pending = 0
+
+    def view(self) -> dict:
+        with self._lock:
+            return {topic: dict(entry) for topic, entry in self._view.items()}
+
+    def query(self, q=None, sort="updated_at", descending=True, offset=0, limit=50) -> dict:
+        """Filter topics by substring, sort and page through them."""
+        with self._lock:
+            items = [
+                dict(entry, topic=topic)
+                for topic, entry in self._view.items()
+                if not q or q.lower() in topic.lower()
+            ]
+        items.sort(key=lambda e: (e.get(sort) is not None, e.get(sort)), reverse=descending)
+        return {
+            "total": len(items),
+            "offset": offset,
+            "limit": limit,
+            "items": items[offset : offset + limit],
+        }
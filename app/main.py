@@ -1,12 +1,66 @@
 # app/main.py
 # This is the main entry point for the FastAPI application, setting up routes and starting the server.
 
-from fastapi import FastAPI
-from app.routes import flashcards, saved, history
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app import stages, tracing
+from app.config import WARMER_ENABLED
+from app.services import health_service, warmer_service
+from app.routes import flashcards, saved, history, review, stats, search, metrics, usage, health, maintenance, sync, debug, quiz
+from app.usage import retry_after_header
 import tkinter as tk
 import uvicorn
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the caches in the background: /healthz answers at once, /readyz once this is done.
+    warm = asyncio.create_task(asyncio.to_thread(health_service.warm_up))
+    # Off-peak pre-generation of popular topics (see app.services.warmer_service)
+    stop_warmer = threading.Event()
+    if WARMER_ENABLED:
+        threading.Thread(target=warmer_service.run_warmer, args=(stop_warmer,), name="warmer", daemon=True).start()
+    yield
+    stop_warmer.set()
+    if not warm.done():
+        warm.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.exception_handler(stages.StageOverloaded)
+async def stage_overloaded(request: Request, exc: stages.StageOverloaded):
+    # shed load instead of queueing without bound
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server busy ({exc.stage} queue full). Please retry later."},
+        headers=retry_after_header(exc.retry_after),
+    )
+
+
+# probes polled every second would push real requests out of the recent-trace window
+UNTRACED_PATHS = {"/healthz", "/readyz"}
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    # one trace per request; its id comes from traceparent / X-Trace-Id when the client sends one
+    if request.url.path.startswith("/debug/") or request.url.path in UNTRACED_PATHS:
+        return await call_next(request)
+    trace_id, parent_id = tracing.incoming_ids(request.headers)
+    name = f"{request.method} {request.url.path}"
+    with tracing.trace_request(name, trace_id, parent_id) as root:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if route is not None:
+            root["route"] = route.path
+        root["status"] = response.status_code
+    response.headers["X-Trace-Id"] = trace_id
+    return response
 
 
 @app.get("/")
@@ -17,6 +71,16 @@ def home():
 app.include_router(flashcards.router)
 app.include_router(saved.router)
 app.include_router(history.router)
+app.include_router(review.router)
+app.include_router(stats.router)
+app.include_router(search.router)
+app.include_router(metrics.router)
+app.include_router(usage.router)
+app.include_router(health.router)
+app.include_router(maintenance.router)
+app.include_router(sync.router)
+app.include_router(debug.router)
+app.include_router(quiz.router)
 
 # Explain why those settings in uvicorn.run are used here
 # - "main:app" specifies the application instance to run.
@@ -0,0 +1,48 @@
+# app/metrics.py
+# This module keeps simple in-process counters and latency summaries, exposed by GET /metrics.
+
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_counters: dict[str, float] = {}
+_timings: dict[str, dict] = {}
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, seconds: float) -> None:
+    """Record one duration (in seconds) for name."""
+    with _lock:
+        t = _timings.get(name)
+        if t is None:
+            t = _timings[name] = {"count": 0, "total": 0.0, "max": 0.0}
+        t["count"] += 1
+        t["total"] += seconds
+        t["max"] = max(t["max"], seconds)
+
+
+@contextmanager
+def timed(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def snapshot() -> dict:
+    with _lock:
+        timings = {
+            name: {
+                "count": t["count"],
+                "avg_ms": round(1000 * t["total"] / t["count"], 2),
+                "max_ms": round(1000 * t["max"], 2),
+            }
+            for name, t in _timings.items()
+        }
+        return {"counters": dict(_counters), "timings": timings}
@@ -4,7 +4,9 @@
 from mistralai import Mistral
 from mistralai.models.sdkerror import SDKError
 from fastapi import HTTPException
+from app import tracing
 import asyncio
+import threading
 import time
 
 
@@ -15,10 +17,11 @@ def _sync_call_with_retry(client, prompt, max_retries=3):
     """
     for attempt in range(max_retries):
         try:
-            response = client.chat.complete(
-                model="mistral-small-latest",
-                messages=[{"role": "user", "content": prompt}],
-            )
+            with tracing.span("mistral.attempt", attempt=attempt + 1):
+                response = client.chat.complete(
+                    model="mistral-small-latest",
+                    messages=[{"role": "user", "content": prompt}],
+                )
             return response
         except SDKError as e:
             if "429" in str(e).lower() or "capacity exceeded" in str(e).lower():
@@ -33,32 +36,44 @@ def _sync_call_with_retry(client, prompt, max_retries=3):
                 raise HTTPException(status_code=503, detail=f"API error: {str(e)}")
 
 
-async def _async_call_with_retry(prompt, max_retries=3):
-    """Async call used when caller supplies only the prompt and awaits the result.
+_default_client = None
+_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Return the process-wide Mistral client for the configured API key, creating it once.
 
-    This function lazy-imports the module-level `client` from
-    `app.services.flashcard_service` so tests can patch that client.
+    Kept in this module so it is self-contained: importing a `client` from other
+    modules is fragile and caused runtime import errors in the past.
     """
-    # Create a default Mistral client here using configured API key so this
-    # module is self-contained. Importing a `client` from other modules is
-    # fragile and caused runtime import errors in the past.
+    global _default_client
+    if _default_client is None:
+        with _client_lock:
+            if _default_client is None:
+                from app.config import api_key
+                if not api_key:
+                    raise RuntimeError("MISTRAL_API_KEY not configured")
+                _default_client = Mistral(api_key=api_key)
+    return _default_client
+
+
+async def _async_call_with_retry(prompt, max_retries=3):
+    """Async call used when caller supplies only the prompt and awaits the result."""
     try:
-        from app.config import api_key
-        if not api_key:
-            raise RuntimeError("MISTRAL_API_KEY not configured")
-        default_client = Mistral(api_key=api_key)
+        default_client = get_default_client()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"No Mistral client available: {e}")
 
     for attempt in range(max_retries):
         try:
-            resp = default_client.chat.complete(
-                model="mistral-small-latest",
-                messages=[{"role": "user", "content": prompt}],
-            )
+            with tracing.span("mistral.attempt", attempt=attempt + 1):
+                resp = default_client.chat.complete(
+                    model="mistral-small-latest",
+                    messages=[{"role": "user", "content": prompt}],
+                )
 
-            if asyncio.iscoroutine(resp):
-                resp = await resp
+                if asyncio.iscoroutine(resp):
+                    resp = await resp
 
             return resp
         except SDKError as e:
@@ -0,0 +1,305 @@
+# app/paths.py
+# This module decides where deck and audio files live on disk. Every module that names, finds
+# or lists those files goes through it.
+#
+# Sharded layout (the default for new files): a file lives in a subdirectory named by the
+# first two hex digits of a SHA-1 over its key, so no directory holds more than ~1/256th of
+# the files:
+#   saved_flashcards/3f/food_20231001120000.json     key: the deck's topic
+#   tts_audio/a0/밥_1234.mp3                          key: the word (name before the first '_')
+# Optional per-user namespaces nest the same layout under users/<namespace>/.
+#
+# Readers accept the flat layout too (files directly in the root), so an existing install
+# keeps working while `python -m app.paths` migrates it online:
+#
+#   python -m app.paths [--data-dir saved_flashcards] [--audio-dir tts_audio] [--dry-run]
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+from app.config import AUDIO_DIR, DATA_DIR, STORAGE_LAYOUT
+from app.storage import dump_json, is_compressed, load_json
+
+LAYOUTS = ("sharded", "flat")
+AUDIO_EXTENSIONS = (".mp3", ".wav")
+# Deck files are named "<topic>_<YYYYmmddHHMMSS>.json"
+TOPIC_FILE_RE = re.compile(r"^(?P<topic>.+)_(?P<timestamp>\d{14})\.json$")
+SHARD_RE = re.compile(r"^[0-9a-f]{2}$")
+NAMESPACE_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+NAMESPACES_DIR = "users"
+
+
+def shard_of(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:2]
+
+
+def namespace_root(root: str, namespace: str | None = None) -> str:
+    """The directory holding namespace's files (root itself without a namespace)."""
+    if namespace is None:
+        return root
+    if not NAMESPACE_RE.match(namespace):
+        raise ValueError(f"invalid namespace {namespace!r}")
+    return os.path.join(root, NAMESPACES_DIR, namespace)
+
+
+def _deck_key(filename: str) -> str:
+    m = TOPIC_FILE_RE.match(filename)
+    return m.group("topic") if m else os.path.splitext(filename)[0]
+
+
+def _word_key(word: str) -> str:
+    # a word may end in "." ("감사합니다."), so no splitext here
+    return (word or "").lower().strip().split("_", 1)[0]
+
+
+def _audio_key(filename: str) -> str:
+    return _word_key(os.path.splitext(filename)[0])
+
+
+def shard_dirs(root: str) -> list[str]:
+    try:
+        return sorted(os.path.join(root, d) for d in os.listdir(root) if SHARD_RE.match(d))
+    except FileNotFoundError:
+        return []
+
+
+def _newest(paths: list[str]) -> str | None:
+    # a deck written to its flat path while the migration moved it exists twice; the newer wins
+    existing = [p for p in paths if os.path.exists(p)]
+    if len(existing) > 1:
+        existing.sort(key=lambda p: os.stat(p).st_mtime_ns, reverse=True)
+    return existing[0] if existing else None
+
+
+# --- decks -------------------------------------------------------------------------------
+
+
+def deck_path(data_dir: str, filename: str, namespace: str | None = None, layout: str | None = None) -> str:
+    """Where a new deck file named filename is written."""
+    root = namespace_root(data_dir, namespace)
+    if (layout or STORAGE_LAYOUT) == "flat":
+        return os.path.join(root, filename)
+    return os.path.join(root, shard_of(_deck_key(filename)), filename)
+
+
+def find_deck(data_dir: str, filename: str, namespace: str | None = None) -> str | None:
+    """Path of the existing deck file named filename, in either layout."""
+    filename = os.path.basename(filename)
+    root = namespace_root(data_dir, namespace)
+    return _newest(
+        [os.path.join(root, shard_of(_deck_key(filename)), filename), os.path.join(root, filename)]
+    )
+
+
+def find_topic_deck(data_dir: str, topic: str, namespace: str | None = None) -> str | None:
+    """Path of topic's deck file, or None. Lists only the topic's shard, plus the root while
+    it still holds flat files."""
+    root = namespace_root(data_dir, namespace)
+    candidates = []
+    for directory in (os.path.join(root, shard_of(topic)), root):
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in names:
+            m = TOPIC_FILE_RE.match(name)
+            if m and m.group("topic") == topic:
+                candidates.append(os.path.join(directory, name))
+    return _newest(candidates)
+
+
+def iter_decks(data_dir: str, namespace: str | None = None):
+    """Yield (topic, path) for every deck file, sorted by file name, in either layout."""
+    root = namespace_root(data_dir, namespace)
+    found = {}
+    for directory in [root] + shard_dirs(root):
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in names:
+            m = TOPIC_FILE_RE.match(name)
+            if not m:
+                continue
+            path = os.path.join(directory, name)
+            if name in found:
+                path = _newest([found[name][1], path])
+            found[name] = (m.group("topic"), path)
+    for name in sorted(found):
+        yield found[name]
+
+
+# --- audio -------------------------------------------------------------------------------
+
+
+def audio_dir_for(audio_dir: str, word: str, namespace: str | None = None, layout: str | None = None) -> str:
+    """The directory new audio for word is written to."""
+    root = namespace_root(audio_dir, namespace)
+    if (layout or STORAGE_LAYOUT) == "flat":
+        return root
+    return os.path.join(root, shard_of(_word_key(word)))
+
+
+def audio_lookup_dirs(audio_dir: str, word: str, namespace: str | None = None) -> list[str]:
+    """Directories that may hold existing audio for word: its shard, then the flat root."""
+    root = namespace_root(audio_dir, namespace)
+    return [os.path.join(root, shard_of(_word_key(word))), root]
+
+
+def find_audio(path: str | None) -> str | None:
+    """Resolve a card's stored tts_path: the path itself, else the same file in the other
+    layout (decks written before a migration may still name the flat path)."""
+    if not path:
+        return None
+    if os.path.exists(path):
+        return path
+    directory, name = os.path.split(path)
+    parent = os.path.dirname(directory)
+    candidates = [os.path.join(directory, shard_of(_audio_key(name)), name)]
+    if SHARD_RE.match(os.path.basename(directory)):
+        candidates.append(os.path.join(parent, name))
+    return next((p for p in candidates if os.path.exists(p)), None)
+
+
+def iter_audio(audio_dir: str, namespace: str | None = None):
+    """Yield an os.DirEntry for every audio file, in either layout."""
+    root = namespace_root(audio_dir, namespace)
+    for directory in [root] + shard_dirs(root):
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.name.lower().endswith(AUDIO_EXTENSIONS) and entry.is_file():
+                yield entry
+
+
+# --- migration ---------------------------------------------------------------------------
+
+
+def _move(src: str, dst: str, dry_run: bool) -> bool:
+    """Rename src to dst unless dst is already the newer copy; True if src was moved."""
+    if dry_run:
+        return True
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.exists(dst) and os.stat(dst).st_mtime_ns >= os.stat(src).st_mtime_ns:
+        os.remove(src)
+        return False
+    os.replace(src, dst)
+    return True
+
+
+def _rewrite_deck_audio(path: str, moved_audio: dict[str, str], attempts: int = 5) -> int:
+    """Point the deck's tts_paths at moved audio; returns paths rewritten.
+
+    The file is read again just before the replace, and the rewrite redone from it
+    if it changed meanwhile (e.g. the API appended cards), so those cards are kept.
+    """
+    for _ in range(attempts):
+        before = os.stat(path)
+        cards = load_json(path)
+        rewritten = 0
+        for card in cards if isinstance(cards, list) else []:
+            audio = card.get("tts_path") if isinstance(card, dict) else None
+            if audio and not os.path.exists(audio):
+                new = moved_audio.get(os.path.basename(audio)) or find_audio(audio)
+                if new:
+                    card["tts_path"] = new
+                    rewritten += 1
+        if not rewritten:
+            return 0
+        tmp = path + ".write"
+        dump_json(cards, tmp, "gzip" if is_compressed(path) else "json")
+        after = os.stat(path)
+        if (after.st_mtime_ns, after.st_size) == (before.st_mtime_ns, before.st_size):
+            os.replace(tmp, path)
+            return rewritten
+        os.remove(tmp)
+    raise OSError(f"deck kept changing during {attempts} attempts; retry later")
+
+
+def migrate(
+    data_dir: str = DATA_DIR,
+    audio_dir: str = AUDIO_DIR,
+    namespace: str | None = None,
+    dry_run: bool = False,
+    pause: float = 0.0,
+) -> dict:
+    """Move flat files into the sharded layout while the server keeps running.
+
+    Audio moves first, then each deck has its tts_paths pointed at the moved audio
+    and is renamed into its shard. Every step is a rename on the same filesystem,
+    and readers look in both layouts, so no request sees a missing file. Re-running
+    picks up whatever is left (e.g. after an interruption). pause sleeps between
+    files to limit the I/O load on a live server.
+
+    The API saves decks without a lock this process could share, so a deck's
+    rewrite is redone from the file whenever the file changed while it was being
+    prepared. A save landing between that last check and the rename itself could
+    still be lost: migrate while no generation is running (e.g. off-peak), or with
+    the server stopped, when that matters.
+    """
+    report = {"audio_moved": 0, "decks_moved": 0, "paths_rewritten": 0, "skipped": 0}
+    audio_root = namespace_root(audio_dir, namespace)
+    moved_audio = {}
+    try:
+        names = sorted(os.listdir(audio_root))
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        src = os.path.join(audio_root, name)
+        if not name.lower().endswith(AUDIO_EXTENSIONS) or not os.path.isfile(src):
+            continue
+        dst = os.path.join(audio_dir_for(audio_dir, _audio_key(name), namespace, "sharded"), name)
+        if _move(src, dst, dry_run):
+            report["audio_moved"] += 1
+        moved_audio[name] = dst
+        if pause:
+            time.sleep(pause)
+
+    data_root = namespace_root(data_dir, namespace)
+    try:
+        names = sorted(os.listdir(data_root))
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        src = os.path.join(data_root, name)
+        if not TOPIC_FILE_RE.match(name) or not os.path.isfile(src):
+            continue
+        if not dry_run:
+            try:
+                rewritten = _rewrite_deck_audio(src, moved_audio)
+            except (OSError, ValueError) as e:
+                print(f"[paths] skipping {name}: {e}", file=sys.stderr)
+                report["skipped"] += 1
+                continue
+            report["paths_rewritten"] += rewritten
+        if _move(src, deck_path(data_dir, name, namespace, "sharded"), dry_run):
+            report["decks_moved"] += 1
+        if pause:
+            time.sleep(pause)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Move flat deck and audio files into the sharded layout.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--audio-dir", default=AUDIO_DIR)
+    parser.add_argument("--namespace", default=None, help="migrate users/<namespace>/ instead of the shared root")
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between files")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    report = migrate(args.data_dir, args.audio_dir, args.namespace, args.dry_run, args.pause)
+    verb = "would move" if args.dry_run else "moved"
+    print(
+        f"[paths] {verb} {report['audio_moved']} audio files and {report['decks_moved']} decks "
+        f"({report['paths_rewritten']} tts_paths rewritten, {report['skipped']} skipped)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
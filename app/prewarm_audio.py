@@ -0,0 +1,194 @@
+# app/prewarm_audio.py
+# This module is a command-line tool that synthesizes missing TTS audio for every saved deck
+# ahead of time, so users don't wait for it lazily.
+#
+#   python -m app.prewarm_audio [--workers 4] [--rate 5] [--dry-run]
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app import paths
+from app.config import AUDIO_DIR, DATA_DIR, STATE_DIR
+from app.flashcard_utils import iter_topic_files
+from app.services.sync_service import queue_changes
+from app.storage import dump_json_atomic, load_json
+from app.tts import generate_tts, get_audio_index
+
+CHECKPOINT_FILE = os.path.join(STATE_DIR, "prewarm_checkpoint.json")
+
+
+class RateLimiter:
+    """Allow at most `rate` calls per second across threads (0 = unlimited)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _load_checkpoint(path: str) -> dict:
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            pass
+    return {"decks": {}}
+
+
+def _needs_audio(card) -> bool:
+    if not isinstance(card, dict) or not card.get("word"):
+        return False
+    return paths.find_audio(card.get("tts_path")) is None
+
+
+def _fmt_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+def scan(data_dir: str, checkpoint: dict) -> list[tuple[str, str, list[str]]]:
+    """Return (topic, deck path, words lacking audio) for decks not already done at their current mtime."""
+    pending = []
+    for topic, path in iter_topic_files(data_dir):
+        name = os.path.basename(path)
+        if checkpoint["decks"].get(name) == os.path.getmtime(path):
+            continue
+        try:
+            cards = load_json(path)
+        except (OSError, ValueError) as e:
+            print(f"[prewarm] skipping {name}: {e}", file=sys.stderr)
+            continue
+        words = sorted({c["word"] for c in cards if _needs_audio(c)}) if isinstance(cards, list) else []
+        pending.append((topic, path, words))
+    return pending
+
+
+def write_back(topic: str, path: str, audio_by_word: dict[str, str]) -> int:
+    """Set tts_path on the deck's cards that still lack audio and queue them for the sync
+    feed; returns cards updated.
+
+    The deck is re-read right before the write so cards the API appended
+    meanwhile are kept.
+    """
+    cards = load_json(path)
+    updated = []
+    for card in cards:
+        if _needs_audio(card) and card["word"] in audio_by_word:
+            card["tts_path"] = audio_by_word[card["word"]]
+            updated.append(card)
+    if updated:
+        dump_json_atomic(cards, path)
+        queue_changes(topic, updated)
+    return len(updated)
+
+
+def prewarm(
+    data_dir: str = DATA_DIR,
+    audio_dir: str = AUDIO_DIR,
+    workers: int = 4,
+    rate: float = 0.0,
+    checkpoint_path: str = CHECKPOINT_FILE,
+    dry_run: bool = False,
+    out=sys.stdout,
+) -> dict:
+    checkpoint = _load_checkpoint(checkpoint_path)
+    pending = scan(data_dir, checkpoint)
+    index = get_audio_index(audio_dir)
+    words = {w for _, _, ws in pending for w in ws}
+    to_synthesize = {w for w in words if not index.lookup(w)}
+    print(
+        f"[prewarm] {len(pending)} decks to check, {len(words)} words without audio, "
+        f"{len(to_synthesize)} need synthesis",
+        file=out,
+    )
+    summary = {"decks": len(pending), "words": len(words), "synthesized": 0, "failed": 0, "cards_updated": 0}
+    if dry_run:
+        return summary
+
+    limiter = RateLimiter(rate)
+    done = {}
+    start = time.monotonic()
+
+    def synthesize(word: str):
+        if word in to_synthesize:
+            limiter.wait()
+        try:
+            return word, generate_tts(word, audio_dir)
+        except Exception as e:
+            print(f"[prewarm] failed {word!r}: {e}", file=out)
+            return word, None
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prewarm")
+    try:
+        # queue every word once, in deck order, then finish decks as their words complete
+        futures = {}
+        for _, _, deck_words in pending:
+            for word in deck_words:
+                if word not in futures:
+                    futures[word] = pool.submit(synthesize, word)
+        for topic, path, deck_words in pending:
+            for word in deck_words:
+                if word in done:
+                    continue
+                done[word] = futures[word].result()[1]
+                if done[word] is None:
+                    summary["failed"] += 1
+                elif word in to_synthesize:
+                    summary["synthesized"] += 1
+            summary["cards_updated"] += write_back(topic, path, {w: done[w] for w in deck_words if done.get(w)})
+            if all(done.get(w) for w in deck_words):
+                checkpoint["decks"][os.path.basename(path)] = os.path.getmtime(path)
+                dump_json_atomic(checkpoint, checkpoint_path, "json")
+
+            finished = summary["synthesized"] + summary["failed"]
+            elapsed = time.monotonic() - start
+            speed = finished / elapsed if elapsed > 0 else 0.0
+            left = len(to_synthesize) - finished
+            eta = _fmt_eta(left / speed) if speed and left > 0 else "0m00s"
+            print(
+                f"[prewarm] {os.path.basename(path)}: {finished}/{len(to_synthesize)} synthesized, "
+                f"{speed:.1f} words/s, ETA {eta}",
+                file=out,
+            )
+    except KeyboardInterrupt:
+        # finished decks are checkpointed; drop queued words so the next run resumes from there
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Synthesize missing TTS audio for saved decks.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--audio-dir", default=AUDIO_DIR)
+    parser.add_argument("--workers", type=int, default=4, help="concurrent synthesis calls")
+    parser.add_argument("--rate", type=float, default=5.0, help="max synthesis calls per second (0 = unlimited)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help="progress file used to resume")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be synthesized")
+    args = parser.parse_args(argv)
+
+    summary = prewarm(
+        args.data_dir, args.audio_dir, args.workers, args.rate, args.checkpoint, args.dry_run
+    )
+    print(f"[prewarm] done: {json.dumps(summary)}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+# app/quiz.py
+# This module builds multiple-choice and matching drills from stored cards, with no LLM call.
+# Distractors come from a similarity index kept up to date as cards are saved: every card
+# has a short list of its nearest cards (shared definition words and shared syllables of the
+# word, rarer ones weighing more), so picking plausible wrong answers is a list lookup.
+
+import heapq
+import math
+import random
+import re
+import threading
+from app.dedupe import normalize_word
+from app.flashcard_utils import make_card_id
+
+QUESTION_TYPES = ("meaning", "word", "synonym", "antonym")
+QUIZ_TYPES = QUESTION_TYPES + ("mixed", "matching")
+
+# Neighbours kept per card. Adding a card compares it with the latest MAX_POSTINGS cards of each
+# of its features, rarest feature first, until MAX_CANDIDATES cards have been seen.
+NEIGHBORS = 8
+MAX_POSTINGS = 64
+MAX_CANDIDATES = 256
+# A shared syllable of the word counts this much of a shared definition word
+SYLLABLE_WEIGHT = 0.5
+
+_WORD_RE = re.compile(r"[^\W\d_]{2,}")
+_HANGUL_RE = re.compile(r"[가-힣]")
+_STOPWORDS = frozenset(
+    """the and for with that this from are was were used use using something someone one which
+    when where into not its his her your you have has had being been also any who what how very
+    more most such than then them they their there other some can may will would about over
+    make makes made way thing things person people""".split()
+)
+
+
+def _as_list(value) -> list[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        return []
+    return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+
+
+def _features(card: dict) -> set[str]:
+    words = {w for w in _WORD_RE.findall((card["definition"] or "").lower()) if w not in _STOPWORDS}
+    return {"d:" + w for w in words} | {"s:" + ch for ch in _HANGUL_RE.findall(card["word"])}
+
+
+class DistractorIndex:
+    """Cards by id with their NEIGHBORS most similar cards, maintained incrementally.
+
+    Adding a card scores it against a bounded set of cards sharing one of its
+    features (rare features first: they say the most about similarity), keeps its
+    best neighbours and offers itself to theirs, so the cost of an add doesn't
+    grow with the library. Scores use the document frequency at the time of the
+    add; they only rank candidates, so that drift is harmless.
+    """
+
+    def __init__(
+        self, neighbors: int = NEIGHBORS, max_postings: int = MAX_POSTINGS, max_candidates: int = MAX_CANDIDATES
+    ):
+        self.neighbors = neighbors
+        self.max_postings = max_postings
+        self.max_candidates = max_candidates
+        self._cards = {}  # card id -> {"id", "topic", "word", "norm", "definition", "synonyms", "antonyms"}
+        self._topics = {}  # topic -> [card id, ...]
+        self._postings = {}  # feature -> [card id, ...], most recent last
+        self._df = {}  # feature -> number of cards having it
+        self._near = {}  # card id -> [(score, card id), ...], best first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cards)
+
+    def add(self, topic: str, cards: list[dict]) -> int:
+        """Index cards saved to topic; returns how many were new."""
+        added = 0
+        with self._lock:
+            for card in cards:
+                if not isinstance(card, dict) or not card.get("word"):
+                    continue
+                card_id = make_card_id(topic, card["word"])
+                if card_id in self._cards:
+                    continue
+                self._add(card_id, topic, card)
+                added += 1
+        return added
+
+    def _add(self, card_id: str, topic: str, card: dict) -> None:
+        entry = {
+            "id": card_id,
+            "topic": topic,
+            "word": card["word"],
+            "norm": normalize_word(card["word"]),
+            "definition": card.get("definition") if isinstance(card.get("definition"), str) else "",
+            "synonyms": _as_list(card.get("synonyms")),
+            "antonyms": _as_list(card.get("antonyms")),
+        }
+        features = _features(entry)
+        total = len(self._cards) + 1
+        scores = {}
+        for feature in sorted(features, key=lambda f: self._df.get(f, 0)):
+            postings = self._postings.get(feature)
+            if not postings:
+                continue
+            if len(scores) >= self.max_candidates:
+                break
+            weight = math.log(1 + total / (self._df[feature] + 1))
+            if feature.startswith("s:"):
+                weight *= SYLLABLE_WEIGHT
+            for other in postings[-self.max_postings :]:
+                scores[other] = scores.get(other, 0.0) + weight
+        mine = []
+        for other, score in scores.items():
+            other_card = self._cards[other]
+            if other_card["norm"] == entry["norm"]:
+                # the same word in another topic is no distractor
+                continue
+            mine.append((score * 1.5 if other_card["topic"] == topic else score, other))
+        best = heapq.nlargest(2 * self.neighbors, mine)
+        # offer the new card to the neighbour lists of the cards closest to it
+        for score, other in best:
+            near = self._near[other]
+            if len(near) < self.neighbors or score > near[-1][0]:
+                near.append((score, card_id))
+                near.sort(key=lambda item: -item[0])
+                del near[self.neighbors :]
+        self._near[card_id] = best[: self.neighbors]
+        self._cards[card_id] = entry
+        self._topics.setdefault(topic, []).append(card_id)
+        for feature in features:
+            self._postings.setdefault(feature, []).append(card_id)
+            self._df[feature] = self._df.get(feature, 0) + 1
+            # keep postings bounded; older ids beyond the window are never scanned anyway
+            if len(self._postings[feature]) > 2 * self.max_postings:
+                del self._postings[feature][: -self.max_postings]
+
+    def topics(self) -> list[str]:
+        with self._lock:
+            return list(self._topics)
+
+    def topic_cards(self, topic: str) -> list[dict]:
+        with self._lock:
+            return [self._cards[i] for i in self._topics.get(topic, ())]
+
+    def near(self, card_id: str) -> list[dict]:
+        """The card's nearest cards, most similar first."""
+        with self._lock:
+            return [self._cards[i] for _, i in self._near.get(card_id, ())]
+
+    def sample(self, rng: random.Random, k: int) -> list[dict]:
+        with self._lock:
+            ids = list(self._cards) if len(self._cards) <= 4 * k else None
+            if ids is None:
+                # random ids without copying a large library: sample topics, then cards
+                topics = list(self._topics)
+                ids = [rng.choice(self._topics[rng.choice(topics)]) for _ in range(4 * k)]
+            return [self._cards[i] for i in rng.sample(ids, min(k, len(ids)))]
+
+
+def _pick(candidates, wrong_count: int, avoid: set[str]) -> list[str]:
+    """The first wrong_count distinct candidate strings not in avoid (compared normalized)."""
+    picked = []
+    seen = set(avoid)
+    for text in candidates:
+        key = normalize_word(text)
+        if not text or not key or key in seen:
+            continue
+        seen.add(key)
+        picked.append(text)
+        if len(picked) == wrong_count:
+            break
+    return picked
+
+
+def _candidates(index: DistractorIndex, card: dict, rng: random.Random, pool: list[dict]) -> list[dict]:
+    # nearest cards first, then the rest of the topic, then anywhere in the library
+    near = index.near(card["id"])
+    same_topic = rng.sample(pool, min(len(pool), 3 * len(QUESTION_TYPES) + 4))
+    return near + same_topic + index.sample(rng, 8)
+
+
+def build_question(index: DistractorIndex, card: dict, kind: str, choices: int, rng: random.Random, pool: list[dict]):
+    """One multiple-choice question about card, or None if card can't support kind."""
+    others = _candidates(index, card, rng, pool)
+    synonyms, antonyms = card["synonyms"], card["antonyms"]
+    wrong = choices - 1
+    if kind == "meaning":
+        if not card["definition"]:
+            return None
+        # a synonym's definition would be a second right answer
+        related = {normalize_word(w) for w in synonyms} | {card["norm"]}
+        options = [o["definition"] for o in others if o["norm"] not in related]
+        prompt, answer = f"What does {card['word']} mean?", card["definition"]
+        avoid = {normalize_word(answer)}
+    elif kind == "word":
+        if not card["definition"]:
+            return None
+        options = [o["word"] for o in others]
+        prompt, answer = f"Which word means: {card['definition']}?", card["word"]
+        avoid = {card["norm"]} | {normalize_word(w) for w in synonyms}
+    elif kind in ("synonym", "antonym"):
+        right, opposite = (synonyms, antonyms) if kind == "synonym" else (antonyms, synonyms)
+        if not right:
+            return None
+        answer = rng.choice(right)
+        # the word's own opposites are the most tempting wrong answers
+        options = opposite + [w for o in others for w in [o["word"]] + (o[kind + "s"] or [])]
+        prompt = f"Which word is a{'n' if kind == 'antonym' else ''} {kind} of {card['word']}?"
+        avoid = {card["norm"]} | {normalize_word(w) for w in right}
+    else:
+        raise ValueError(f"unknown question type {kind!r}")
+    distractors = _pick(options, wrong, avoid)
+    if not distractors:
+        return None
+    options = distractors + [answer]
+    rng.shuffle(options)
+    return {
+        "card_id": card["id"],
+        "type": kind,
+        "prompt": prompt,
+        "options": options,
+        "answer": options.index(answer),
+    }
+
+
+def build_matching(index: DistractorIndex, pool: list[dict], n: int, rng: random.Random) -> dict:
+    """Match n words to their definitions; the cards are a cluster of near neighbours so the
+    definitions are easy to confuse."""
+    pool = [c for c in pool if c["definition"]]
+    by_id = {c["id"]: c for c in pool}
+    chosen, seen_norms = [], set()
+    queue = rng.sample(pool, len(pool))
+    while queue and len(chosen) < n:
+        card = queue.pop()
+        if card["norm"] in seen_norms:
+            continue
+        chosen.append(card)
+        seen_norms.add(card["norm"])
+        # pull the card's neighbours from the same topic in next
+        queue.extend(by_id[o["id"]] for o in reversed(index.near(card["id"])) if o["id"] in by_id)
+    definitions = [c["definition"] for c in chosen]
+    rng.shuffle(definitions)
+    return {
+        "type": "matching",
+        "words": [c["word"] for c in chosen],
+        "definitions": definitions,
+        "answer": [definitions.index(c["definition"]) for c in chosen],
+        "card_ids": [c["id"] for c in chosen],
+    }
+
+
+def build_quiz(index: DistractorIndex, topic: str, n: int, kind: str = "mixed", choices: int = 4, seed=None) -> dict:
+    rng = random.Random(seed)
+    pool = index.topic_cards(topic)
+    if kind == "matching":
+        return {"topic": topic, "type": kind, "questions": [build_matching(index, pool, n, rng)] if pool else []}
+    kinds = list(QUESTION_TYPES) if kind == "mixed" else [kind]
+    questions = []
+    for card in rng.sample(pool, len(pool)):
+        rng.shuffle(kinds)
+        question = next(
+            (q for q in (build_question(index, card, k, choices, rng, pool) for k in kinds) if q), None
+        )
+        if question:
+            questions.append(question)
+            if len(questions) == n:
+                break
+    return {"topic": topic, "type": kind, "questions": questions}
@@ -0,0 +1,17 @@
+# app/routes/debug.py
+# This module defines the debugging routes: recent request traces, slowest first.
+
+from fastapi import APIRouter, Query
+from app.services.debug_service import get_trace_service, get_traces_service
+
+router = APIRouter()
+
+
+@router.get("/debug/traces")
+def get_traces(limit: int = Query(20, ge=1, le=500), min_ms: float = Query(0.0, ge=0)):
+    return get_traces_service(limit, min_ms)
+
+
+@router.get("/debug/traces/{trace_id}")
+def get_trace(trace_id: str):
+    return get_trace_service(trace_id)
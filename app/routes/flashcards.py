@@ -1,29 +1,50 @@
 # app/routes/flashcards.py
 # This module defines the routes related to flashcards, including creating new flashcards.
 
-from fastapi import APIRouter, Body, HTTPException
-from starlette.concurrency import run_in_threadpool
-from app.config import DATA_DIR
+from fastapi import APIRouter, Body, HTTPException, Request
+from app import paths, stages
+from app.config import DATA_DIR, FLASHCARDS_PER_REQUEST
+from app.services.export_service import export_anki_incremental_service
 from app.services.flashcard_service import create_flashcards_service, export_to_anki
+from app.services.usage_service import admit_generation, client_id_for, settle_generation
+from app.storage import load_json
 from typing import Optional
-import json
-import os
 
 router = APIRouter()
 
 
+async def _generate(request: Request, data: dict, stage: stages.Stage = None):
+    """Admit the request against the token budgets, then run the generation on stage
+    (default: the generation stage)."""
+    stage = stage or stages.generation
+    client_id = client_id_for(request)
+    count = data.get("count")
+    # reject over-budget requests right away instead of queueing them (429 + Retry-After)
+    handle = admit_generation(client_id, count if isinstance(count, int) else FLASHCARDS_PER_REQUEST)
+    result = None
+    try:
+        # Run the synchronous service on the bounded generation stage rather than the
+        # shared threadpool, so slow LLM calls can't starve cheap routes; a full
+        # stage raises StageOverloaded (503 + Retry-After, see app.main).
+        result = await stage.run(create_flashcards_service, data, client_id=client_id)
+        return result
+    finally:
+        settle_generation(handle, result)
+
+
 @router.post("/flashcards/export/anki")
-async def export_flashcards_to_anki(data: dict = Body(...)):
+async def export_flashcards_to_anki(request: Request, data: dict = Body(...)):
     try:
-        # Run the synchronous service in a threadpool so we don't block or misuse
-        # the event loop (create_flashcards_service performs blocking I/O and
-        # may call synchronous helpers that use run_until_complete).
-        result = await run_in_threadpool(create_flashcards_service, data)
+        result = await _generate(request, data)
+        if not result.get("file"):
+            # degraded response served from a cached completion; there is no deck to export
+            raise HTTPException(
+                status_code=503, detail="Flashcard generation is temporarily unavailable."
+            )
 
         # Fetch the flashcards from the saved file
-        topic_file = os.path.join(DATA_DIR, result["file"])
-        with open(topic_file, "r", encoding="utf-8") as f:
-            flashcards = json.load(f)
+        topic_file = paths.find_deck(DATA_DIR, result["file"]) or paths.deck_path(DATA_DIR, result["file"])
+        flashcards = load_json(topic_file)
 
         # Export to Anki
         output_path = export_to_anki(flashcards)
@@ -33,19 +54,49 @@ async def export_flashcards_to_anki(data: dict = Body(...)):
             "anki_file": output_path,
             "total_cards": len(flashcards),
         }
+    except stages.StageOverloaded:
+        raise
+    except HTTPException as he:
+        if he.status_code in (429, 503):
+            raise he
+        raise HTTPException(
+            status_code=500, detail=f"Failed to export flashcards: {he.detail}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to export flashcards: {str(e)}"
         )
 
 
+@router.post("/flashcards/export/anki/incremental")
+async def export_flashcards_to_anki_incremental(data: dict = Body(default={})):
+    # exports stored decks only (no generation); reading decks and writing the CSV is disk work
+    return await stages.disk.run(export_anki_incremental_service, data)
+
+
+@router.post("/flashcards/prefetch")
+async def prefetch_flashcards(request: Request, data: dict = Body(...)):
+    """Low-priority generation for the GUI's read-ahead: same result as POST /flashcards, but it
+    runs on the one-worker prefetch stage and is refused (503) while learners are waiting on
+    interactive generations, so it only ever uses spare capacity."""
+    if stages.generation.queued():
+        raise stages.StageOverloaded("prefetch", stages.generation.retry_after())
+    try:
+        return await _generate(request, data, stages.prefetch)
+    except stages.StageOverloaded:
+        raise
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.post("/flashcards")
-async def create_flashcards(data: dict = Body(...)):
+async def create_flashcards(request: Request, data: dict = Body(...)):
     try:
-        # Run the synchronous service in the threadpool to avoid calling
-        # run_until_complete on the server event loop.
-        result = await run_in_threadpool(create_flashcards_service, data)
-        return result
+        return await _generate(request, data)
+    except stages.StageOverloaded:
+        raise
     except HTTPException as he:
         raise he
     except Exception as e:
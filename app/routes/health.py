@@ -0,0 +1,25 @@
+# app/routes/health.py
+# This module defines the health routes: dependency circuit breaker state, liveness and readiness.
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.health_service import get_health_service, get_liveness_service, get_readiness_service
+
+router = APIRouter()
+
+
+@router.get("/health")
+def get_health():
+    return get_health_service()
+
+
+@router.get("/healthz")
+def get_healthz():
+    return get_liveness_service()
+
+
+@router.get("/readyz")
+def get_readyz():
+    # 503 until startup warm-up is done, so load balancers and start.sh wait for a warm worker
+    ready, body = get_readiness_service()
+    return JSONResponse(status_code=200 if ready else 503, content=body)
@@ -1,12 +1,20 @@
 # app/routes/history.py
 # This module defines the routes related to flashcard history, including retrieving topic history.
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from typing import Optional
+from app import stages
 from app.services.history_service import get_topic_history_service
 
 router = APIRouter()
 
 
 @router.get("/flashcards/history")
-def get_topic_history():
-    return get_topic_history_service()
+async def get_topic_history(
+    q: Optional[str] = None,
+    sort: Optional[str] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+):
+    return await stages.disk.run(get_topic_history_service, q, sort, order, offset, limit)
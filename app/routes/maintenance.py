@@ -0,0 +1,28 @@
+# app/routes/maintenance.py
+# This module defines maintenance routes: audio storage collection and the warm catalog.
+
+from fastapi import APIRouter
+from app import stages
+from app.services.maintenance_service import run_audio_gc_service
+from app.services.warmer_service import get_warmer_service, run_warm_pass_service
+
+router = APIRouter()
+
+
+@router.post("/maintenance/audio-gc")
+async def run_audio_gc(dry_run: bool = True):
+    # a full pass hashes and walks all of tts_audio/; it runs on the one-worker prefetch stage
+    # like the warm pass, so it never holds the disk workers serving saved decks, history and sync
+    return await stages.prefetch.run(run_audio_gc_service, dry_run)
+
+
+@router.get("/maintenance/warmer")
+def get_warmer():
+    return get_warmer_service()
+
+
+@router.post("/maintenance/warm")
+async def run_warm_pass(dry_run: bool = False):
+    # a pass outside the window, e.g. before an expected peak; runs on the one-worker prefetch
+    # stage and, like prefetch, yields to learners as soon as a generation is waiting
+    return await stages.prefetch.run(run_warm_pass_service, dry_run)
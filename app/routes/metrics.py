@@ -0,0 +1,21 @@
+# app/routes/metrics.py
+# This module exposes in-process counters and timings.
+
+from fastapi import APIRouter
+from app import metrics, stages
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def get_metrics():
+    data = metrics.snapshot()
+    counters = data["counters"]
+    calls = counters.get("generation.llm_calls", 0)
+    # Useful (new, unique) cards per LLM call across all generations
+    data["generation_yield_per_call"] = (
+        round(counters.get("generation.cards_useful", 0) / calls, 3) if calls else None
+    )
+    # queue depth and utilization of each pipeline stage
+    data["stages"] = stages.status()
+    return data
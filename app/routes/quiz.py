@@ -0,0 +1,19 @@
+# app/routes/quiz.py
+# This module defines the quiz route: multiple-choice and matching drills built from saved cards.
+
+from fastapi import APIRouter, Query
+from typing import Optional
+from app.services.quiz_service import build_quiz_service
+
+router = APIRouter()
+
+
+@router.get("/quiz")
+def get_quiz(
+    topic: str = Query(..., min_length=1),
+    n: int = Query(10, ge=1, le=100),
+    type: str = "mixed",
+    choices: int = Query(4, ge=2, le=8),
+    seed: Optional[int] = None,
+):
+    return build_quiz_service(topic, n, type, choices, seed)
@@ -0,0 +1,18 @@
+# app/routes/review.py
+# This module defines the spaced-repetition routes: fetching the next due card and grading a card.
+
+from fastapi import APIRouter, Body
+from typing import Optional
+from app.services.review_service import get_next_review_service, submit_review_service
+
+router = APIRouter()
+
+
+@router.get("/review/next")
+def get_next_review(topic: Optional[str] = None):
+    return get_next_review_service(topic)
+
+
+@router.post("/review/{card_id}")
+def submit_review(card_id: str, data: dict = Body(...)):
+    return submit_review_service(card_id, data.get("grade"))
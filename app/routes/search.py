@@ -0,0 +1,18 @@
+# app/routes/search.py
+# This module defines the full-text search route over all saved flashcards.
+
+from fastapi import APIRouter, Query
+from typing import Optional
+from app.services.search_service import search_flashcards_service
+
+router = APIRouter()
+
+
+@router.get("/flashcards/search")
+def search_flashcards(
+    q: str = Query(..., min_length=1),
+    topic: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    jamo: bool = True,
+):
+    return search_flashcards_service(q, topic=topic, limit=limit, jamo=jamo)
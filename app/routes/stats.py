@@ -0,0 +1,13 @@
+# app/routes/stats.py
+# This module defines the learning statistics route.
+
+from fastapi import APIRouter, Query
+from typing import Optional
+from app.services.stats_service import get_stats_service
+
+router = APIRouter()
+
+
+@router.get("/stats")
+def get_stats(topic: Optional[str] = None, days: int = Query(30, ge=1, le=365)):
+    return get_stats_service(topic=topic, days=days)
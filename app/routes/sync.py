@@ -0,0 +1,46 @@
+# app/routes/sync.py
+# This module defines the sync routes: the change feed over HTTP and pushed over a WebSocket.
+
+import asyncio
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from typing import Optional
+from app import stages
+from app.config import SYNC_PAGE_SIZE, SYNC_PUSH_INTERVAL
+from app.services.sync_service import get_changes_service
+
+router = APIRouter()
+
+
+@router.get("/sync")
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=5000),
+    feed: Optional[str] = None,
+):
+    return await stages.disk.run(get_changes_service, since, limit, feed)
+
+
+async def _until_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/sync/ws")
+async def push_changes(websocket: WebSocket, since: int = 0, feed: Optional[str] = None):
+    """Send everything after `since`, then each new batch of changes as it is recorded."""
+    await websocket.accept()
+    disconnected = asyncio.create_task(_until_disconnect(websocket))
+    try:
+        while not disconnected.done():
+            # the feed is in memory: polling it must not hold disk-stage slots per open socket
+            delta = await asyncio.to_thread(get_changes_service, since, SYNC_PAGE_SIZE, feed)
+            if delta["changes"] or delta["reset"]:
+                await websocket.send_json(delta)
+            since, feed = delta["rev"], delta["feed"]
+            if delta["more"]:
+                continue
+            await asyncio.wait({disconnected}, timeout=SYNC_PUSH_INTERVAL)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        disconnected.cancel()
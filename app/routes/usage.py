@@ -0,0 +1,12 @@
+# app/routes/usage.py
+# This module defines the token usage route.
+
+from fastapi import APIRouter
+from app.services.usage_service import get_usage_service
+
+router = APIRouter()
+
+
+@router.get("/usage")
+def get_usage():
+    return get_usage_service()
@@ -0,0 +1,256 @@
+# app/search_index.py
+# This module implements a Hangul-aware inverted index over flashcards. Korean text is
+# indexed as syllable uni/bigrams plus initial-consonant (choseong) n-grams so partial
+# and "ㅇㄴㅎ"-style queries match; other text is indexed as words and word prefixes.
+
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from array import array
+import numpy as np
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+# How much a token hit counts depending on the field it came from
+FIELD_WEIGHTS = {
+    "word": 3.0,
+    "synonyms": 1.5,
+    "antonyms": 1.0,
+    "definition": 1.0,
+    "example": 0.5,
+}
+
+# Card fields kept in memory and returned with each hit
+RESULT_FIELDS = ("card_id", "topic", "file", "word", "definition")
+
+_RUN_RE = re.compile(r"[가-힣]+|[ㄱ-ㅎ]+|[^\W_]+", re.UNICODE)
+
+
+def is_hangul_syllable(ch: str) -> bool:
+    return HANGUL_BASE <= ord(ch) <= HANGUL_LAST
+
+
+def choseong(ch: str) -> str:
+    """Return the initial consonant of a Hangul syllable (or ch unchanged)."""
+    if is_hangul_syllable(ch):
+        return CHOSEONG[(ord(ch) - HANGUL_BASE) // 588]
+    return ch
+
+
+def _ngrams(run: str, prefix: str = "") -> list[str]:
+    tokens = [prefix + c for c in run]
+    tokens.extend(prefix + run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def tokenize(text: str, jamo: bool = True, query: bool = False) -> list[str]:
+    """Split text into index tokens.
+
+    - Hangul runs: syllable unigrams and bigrams, plus choseong uni/bigrams if jamo
+      (documents only; a query spelled out in syllables shouldn't match on initials)
+    - runs of compatibility jamo (a choseong query such as "ㅇㄴ"): choseong n-grams
+    - anything else: lowercased words, and for documents their prefixes (length >= 2)
+    """
+    text = unicodedata.normalize("NFC", text or "").lower()
+    tokens = []
+    for run in _RUN_RE.findall(text):
+        first = run[0]
+        if is_hangul_syllable(first):
+            tokens.extend(_ngrams(run))
+            if jamo and not query:
+                tokens.extend(_ngrams("".join(choseong(c) for c in run), "^"))
+        elif "ㄱ" <= first <= "ㅎ":
+            if jamo:
+                tokens.extend(_ngrams(run, "^"))
+        elif query:
+            # match the word itself and any longer word it is a prefix of
+            tokens.extend((run, run + "*"))
+        else:
+            tokens.append(run)
+            tokens.extend(run[:i] + "*" for i in range(2, len(run)))
+    return tokens
+
+
+def _field_text(card: dict, field: str) -> str:
+    value = card.get(field)
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value)
+    return str(value or "")
+
+
+class SearchIndex:
+    """In-memory inverted index persisted as an append-only JSON-lines journal of
+    cards plus an occasional binary snapshot of the postings.
+
+    Postings are compact (doc id, weight) arrays per token; a query sums token
+    weights times IDF with np.bincount and keeps the top hits. A card that is
+    indexed again (same card id) shadows its previous document.
+    """
+
+    def __init__(self, journal_path: str | None = None, jamo: bool = True):
+        self.journal_path = journal_path
+        self.jamo = jamo
+        self.docs: list[dict] = []
+        # one byte per doc (1 = current version of its card), viewed as a bool array
+        self.live = bytearray()
+        self._doc_topic = array("I")
+        self._topics: dict[str, int] = {}
+        self._by_card: dict[str, int] = {}
+        self._postings: dict[str, tuple[array, array]] = {}
+        # docs read from the journal (not the snapshot) by the last load()
+        self.tail_docs = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._by_card)
+
+    def _index_doc(self, doc: dict) -> None:
+        doc_id = len(self.docs)
+        previous = self._by_card.get(doc["card_id"])
+        if previous is not None:
+            self.live[previous] = 0
+        self._by_card[doc["card_id"]] = doc_id
+        # keep only what results display; the journal has the full card
+        self.docs.append({k: doc.get(k) for k in RESULT_FIELDS})
+        self.live.append(1)
+        self._doc_topic.append(self._topics.setdefault(doc.get("topic") or "", len(self._topics)))
+
+        weights: dict[str, float] = {}
+        for field, fw in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(doc, field), self.jamo):
+                weights[token] = weights.get(token, 0.0) + fw
+        for token, w in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = (array("I"), array("f"))
+            posting[0].append(doc_id)
+            posting[1].append(w)
+
+    def add(self, docs: list[dict], persist: bool = True) -> None:
+        """Index docs (each a card dict plus "card_id" and "topic")."""
+        with self._lock:
+            for doc in docs:
+                self._index_doc(doc)
+            if persist and self.journal_path and docs:
+                append_journal(self.journal_path, docs)
+
+    def load(self) -> bool:
+        """Rebuild the index from its snapshot plus the journal written since.
+
+        Returns False if there is no journal.
+        """
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return False
+        offset = self._load_snapshot()
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            docs = []
+            for line in f:
+                try:
+                    docs.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # tolerate a torn last line after a crash
+                    continue
+        self.add(docs, persist=False)
+        self.tail_docs = len(docs)
+        return True
+
+    @property
+    def snapshot_path(self) -> str:
+        return self.journal_path + ".snapshot.npz"
+
+    def save_snapshot(self) -> None:
+        """Write postings and docs to a binary snapshot so load() skips re-tokenizing."""
+        with self._lock:
+            journal_offset = os.path.getsize(self.journal_path)
+            tokens = list(self._postings)
+            lengths = np.fromiter((len(self._postings[t][0]) for t in tokens), dtype=np.int64, count=len(tokens))
+            doc_ids = b"".join(self._postings[t][0].tobytes() for t in tokens)
+            weights = b"".join(self._postings[t][1].tobytes() for t in tokens)
+            meta = {
+                "journal_offset": journal_offset,
+                "tokens": tokens,
+                "topics": list(self._topics),
+                "docs": self.docs,
+                "by_card": self._by_card,
+            }
+            tmp = self.snapshot_path + ".tmp.npz"
+            np.savez(
+                tmp,
+                meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+                lengths=lengths,
+                doc_ids=np.frombuffer(doc_ids, dtype=np.uint32),
+                weights=np.frombuffer(weights, dtype=np.float32),
+                live=np.frombuffer(bytes(self.live), dtype=np.uint8),
+                doc_topic=np.frombuffer(self._doc_topic.tobytes(), dtype=np.uint32),
+            )
+            os.replace(tmp, self.snapshot_path)
+            self.tail_docs = 0
+
+    def _load_snapshot(self) -> int:
+        """Load the snapshot if present; returns the journal offset it covers."""
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        try:
+            with np.load(self.snapshot_path) as snap:
+                meta = json.loads(snap["meta"].tobytes().decode("utf-8"))
+                ends = np.cumsum(snap["lengths"])
+                doc_ids = snap["doc_ids"].tobytes()
+                weights = snap["weights"].tobytes()
+                live = snap["live"].tobytes()
+                doc_topic = snap["doc_topic"].tobytes()
+        except Exception as e:
+            print(f"[search_index] ignoring unreadable snapshot: {e}")
+            return 0
+        start = 0
+        for token, end in zip(meta["tokens"], ends.tolist()):
+            ids, ws = array("I"), array("f")
+            ids.frombytes(doc_ids[start * 4 : end * 4])
+            ws.frombytes(weights[start * 4 : end * 4])
+            self._postings[token] = (ids, ws)
+            start = end
+        self.docs = meta["docs"]
+        self._by_card = meta["by_card"]
+        self._topics = {t: i for i, t in enumerate(meta["topics"])}
+        self.live = bytearray(live)
+        self._doc_topic = array("I")
+        self._doc_topic.frombytes(doc_topic)
+        return meta["journal_offset"]
+
+    def search(self, query: str, topic: str | None = None, limit: int = 20, jamo: bool = True) -> list[dict]:
+        tokens = set(tokenize(query, jamo and self.jamo, query=True))
+        with self._lock:
+            n_docs = len(self.docs)
+            if not n_docs or not tokens:
+                return []
+            scores = np.zeros(n_docs, dtype=np.float64)
+            n_live = max(len(self._by_card), 1)
+            for token in tokens:
+                posting = self._postings.get(token)
+                if posting is None:
+                    continue
+                doc_ids = np.frombuffer(posting[0], dtype=np.uint32)
+                weights = np.frombuffer(posting[1], dtype=np.float32)
+                idf = math.log(1.0 + n_live / len(doc_ids))
+                scores += np.bincount(doc_ids, weights=weights, minlength=n_docs)[:n_docs] * idf
+            scores[np.frombuffer(self.live, dtype=np.uint8) == 0] = 0.0
+            if topic is not None:
+                code = self._topics.get(topic)
+                if code is None:
+                    return []
+                scores[np.frombuffer(self._doc_topic, dtype=np.uint32) != code] = 0.0
+            hits = np.nonzero(scores)[0]
+            if len(hits) > limit:
+                hits = hits[np.argpartition(-scores[hits], limit)[:limit]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            return [dict(self.docs[i], score=round(float(scores[i]), 4)) for i in hits]
+
+
+def append_journal(journal_path: str, docs: list[dict]) -> None:
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(d, ensure_ascii=False) + "\n" for d in docs))
@@ -0,0 +1,17 @@
+# app/services/debug_service.py
+# This module contains the service logic for the trace debugging endpoints.
+
+from fastapi import HTTPException
+from app import tracing
+
+
+def get_traces_service(limit: int, min_ms: float = 0.0) -> dict:
+    """Summaries of the slowest recent requests; fetch one by id for its spans."""
+    return {"traces": tracing.recorder.slowest(limit, min_ms)}
+
+
+def get_trace_service(trace_id: str) -> dict:
+    trace = tracing.recorder.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (only recent traces are kept in memory)")
+    return trace
@@ -0,0 +1,84 @@
+# app/services/dedupe_service.py
+# This module owns the process-wide index of known words used to de-duplicate generated
+# cards across topics before any TTS work is done.
+
+import threading
+from app.config import DATA_DIR
+from app.dedupe import NEAR_DUPLICATE_THRESHOLD, WordIndex, minhash, normalize_word, similarity
+from app.flashcard_utils import iter_topic_files
+from app.storage import load_json
+
+_index = None
+_init_lock = threading.Lock()
+
+
+def _build_index(data_dir: str) -> WordIndex:
+    index = WordIndex()
+    for topic, path in iter_topic_files(data_dir):
+        try:
+            cards = load_json(path)
+        except Exception as e:
+            print(f"[dedupe_service] skipping unreadable deck {path}: {e}")
+            continue
+        for card in cards if isinstance(cards, list) else []:
+            if isinstance(card, dict):
+                index.add(topic, card)
+    return index
+
+
+def get_word_index() -> WordIndex:
+    """Return the process-wide word index, building it from the decks on first use."""
+    global _index
+    if _index is None:
+        with _init_lock:
+            if _index is None:
+                _index = _build_index(DATA_DIR)
+    return _index
+
+
+def remember_cards(topic: str, cards: list[dict]) -> None:
+    """Record saved cards so later generations (in any topic) can reuse them."""
+    index = get_word_index()
+    for card in cards:
+        index.add(topic, card)
+
+
+def select_new_cards(topic: str, cards: list[dict], existing: list[dict]):
+    """Split generated cards into ones worth keeping and count what was skipped.
+
+    Drops cards whose normalized word is already in the topic (or earlier in the
+    batch) and cards whose definition nearly duplicates one already in the topic.
+    Kept cards that are known from another topic get that card's stored fields
+    and audio filled in, so no TTS is needed for them.
+
+    Returns (new_cards, report).
+    """
+    index = get_word_index()
+    seen = {normalize_word(c.get("word")) for c in existing if isinstance(c, dict)}
+    batch_sigs = []
+    new_cards = []
+    report = {"duplicates": 0, "near_duplicates": 0}
+    for card in cards:
+        if not isinstance(card, dict):
+            continue
+        norm = normalize_word(card.get("word"))
+        if not norm or norm in seen or index.in_topic(topic, card["word"]):
+            report["duplicates"] += 1
+            continue
+        sig = minhash(card.get("definition"))
+        if index.near_duplicate(topic, sig) or (
+            sig is not None and any(similarity(sig, other) >= NEAR_DUPLICATE_THRESHOLD for other in batch_sigs)
+        ):
+            report["near_duplicates"] += 1
+            continue
+        seen.add(norm)
+        if sig is not None:
+            batch_sigs.append(sig)
+        known = index.lookup(card["word"])
+        if known:
+            for key, value in known["card"].items():
+                card.setdefault(key, value)
+            if known.get("tts_path"):
+                card["tts_path"] = known["tts_path"]
+        new_cards.append(card)
+    return new_cards, report
@@ -0,0 +1,12 @@
+# app/services/export_service.py
+# This module contains the service logic for incremental, multi-deck Anki exports.
+
+from fastapi import HTTPException
+from app.anki_export import export
+
+
+def export_anki_incremental_service(data: dict):
+    topics = data.get("topics")
+    if topics is not None and (not isinstance(topics, list) or not all(isinstance(t, str) for t in topics)):
+        raise HTTPException(status_code=400, detail="topics must be a list of topic names.")
+    return export(topics or None, full=bool(data.get("full", False)))
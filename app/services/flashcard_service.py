@@ -2,21 +2,71 @@
 # This module contains the service logic for creating flashcards using the Mistral API,
 # generating TTS audio, saving flashcards to files, and updating history.
 
-from app.config import api_key, AUDIO_DIR, DATA_DIR, HISTORY_FILE
+from app.config import (
+    ANKI_EXPORT_DIR,
+    api_key,
+    AUDIO_DIR,
+    DATA_DIR,
+    FLASHCARDS_PER_REQUEST,
+    GENERATION_MAX_ROUNDS,
+    GENERATION_MAX_TOKENS,
+    EXCLUSION_MAX_WORDS,
+    GENERATION_CHUNK_SIZE,
+    MAX_CARDS_PER_REQUEST,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_PROBE_INTERVAL,
+)
+from app import metrics, paths, stages
+from app.anki_export import anki_row
+from app.circuit_breaker import CircuitBreaker, CircuitOpen
 from app.mistral_client import call_mistral_with_retry
 from app.tts import generate_tts
-from app.history import load_history, save_history
+from app.storage import dump_json, load_json
 from app.flashcard_utils import get_topic_file, parse_flashcards
+from app.services.dedupe_service import remember_cards, select_new_cards
+from app.services.history_service import record_topic
+from app.services.quiz_service import add_quiz_cards
+from app.services.review_service import register_cards
+from app.services.search_service import index_cards
+from app.services.sync_service import record_cards
+from app.services.usage_service import record_llm_call
+from app.services.warmer_service import record_request, return_reserved, take_reserved
+from app.usage import retry_after_header
+from collections import OrderedDict
+from concurrent.futures import Future, as_completed
 from datetime import datetime
-import json
+from fastapi import HTTPException
 import pandas as pd
 import os
 import re
+import threading
+import time
+
+# Each parallel chunk of a large request is steered to a different slice of the topic
+CHUNK_FACETS = [
+    "nouns for everyday objects, people and places",
+    "verbs and actions",
+    "adjectives and adverbs",
+    "common set phrases and expressions",
+    "words a beginner learns first",
+    "intermediate-level words",
+    "advanced or formal words",
+    "words used in conversation and questions",
+    "words related to feelings and opinions",
+    "words related to time, numbers and quantities",
+]
+
+llm_breaker = CircuitBreaker("mistral", LLM_BREAKER_FAILURES, LLM_BREAKER_PROBE_INTERVAL)
+# Last completion text per topic, served (marked stale) while the breaker is open
+_completion_cache: OrderedDict[str, str] = OrderedDict()
+# parallel chunks finish on several llm-stage workers at once
+_completion_cache_lock = threading.Lock()
+COMPLETION_CACHE_TOPICS = 256
 
 
 def export_to_anki(
     flashcards: list[dict],
-    output_dir: str = " anki_exports",
+    output_dir: str = ANKI_EXPORT_DIR,
     filename: str = "flashcards.csv",
 ):
     """Export flashcards to a CSV file compatible with Anki import.
@@ -27,19 +77,7 @@ def export_to_anki(
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
-    anki_data = []
-    for card in flashcards:
-        anki_data.append(
-            {
-                "Front": card["word"],
-                "Back": f"{card['definition']}<br><br><b>Example:</b> {card.get('example', '')}<br><br><b>Synonyms:</b> {', '.join(card.get('synonyms', []))}<br><br><b>Antonyms:</b> {', '.join(card.get('antonyms', []))}",
-                "Audio": (
-                    f"[sound:{os.path.basename(card.get('tts_path', ''))}]"
-                    if card.get("tts_path")
-                    else ""
-                ),
-            }
-        )
+    anki_data = [anki_row(card) for card in flashcards]
 
     # Convert to DataFrame and save as CSV
     df = pd.DataFrame(anki_data)
@@ -49,96 +87,333 @@ def export_to_anki(
     return output_path
 
 
-def create_flashcards_service(data: dict, now=None, client=None):
-    # If now is not provided, use current datetime
-    if now is None:
-        now = datetime.now()
-
-    # Use now instead of datetime.now() in your function
-    timestamp = now.strftime("%Y%m%d%H%M%S")
-    isoformat = now.isoformat(timespec="seconds")
+def _build_prompt(topic: str, count: int, exclude: list[str], facet: str | None = None) -> str:
+    """Build the generation prompt, listing words the topic already has.
 
-    # normalize topic: lowercase, trim, replace whitespace with underscores
-    raw_topic = data.get("topic", "general") or "general"
-    topic = re.sub(r"\s+", "_", raw_topic.strip().lower())
+    facet narrows the request to one slice of the topic so parallel chunks don't overlap.
+    """
+    focus = f"\n    Only use words that are {facet}." if facet else ""
     prompt = f"""
-    Create 5 flashcards to help a student learn faster about the topic in KOREAN "{topic}".
+    Create {count} flashcards to help a student learn faster about the topic in KOREAN "{topic}".{focus}
     Each flashcard must be a JSON object with:
     - word
     - definition
     - example
     - synonyms (at least 2)
     - antonyms (at least 2)
-    Return a JSON array of 5 such flashcards.
+    Return a JSON array of {count} such flashcards.
     """
+    if exclude:
+        # Most recent words first; older ones are summarized by count only
+        shown = exclude[-EXCLUSION_MAX_WORDS:][::-1]
+        more = len(exclude) - len(shown)
+        prompt += f"""
+    The student already knows these words, do NOT use them: {", ".join(shown)}{f" (and {more} more)" if more else ""}.
+    """
+    return prompt
+
+
+def _complete(prompt: str, client=None):
+    """Run one chat completion and return the raw response."""
+    # call_mistral_with_retry supports two calling conventions:
+    # - synchronous: call_mistral_with_retry(client, prompt)
+    # - async: await call_mistral_with_retry(prompt)
+    # In the service we prefer the synchronous form; tests patch
+    # call_mistral_with_retry directly so client may be None in tests.
+    if client is not None:
+        return call_mistral_with_retry(client, prompt)
+    resp = call_mistral_with_retry(prompt)
+    # resp may be a coroutine when the single-arg async path is returned
+    if hasattr(resp, "__await__"):
+        # run synchronously for tests / threadpool by creating a fresh event loop
+        import asyncio
+
+        try:
+            resp = asyncio.run(resp)
+        except RuntimeError:
+            # fallback for unusual environments: create a new loop explicitly
+            loop = asyncio.new_event_loop()
+            try:
+                resp = loop.run_until_complete(resp)
+            finally:
+                loop.close()
+    return resp
+
+
+def _call_llm(prompt: str, client=None, topic: str | None = None, client_id: str | None = None):
+    """_complete behind the circuit breaker, plus token accounting in the usage ledger.
+
+    Raises CircuitOpen without calling the API while the breaker is open.
+    """
+    start = time.perf_counter()
     try:
-        # call_mistral_with_retry supports two calling conventions:
-        # - synchronous: call_mistral_with_retry(client, prompt)
-        # - async: await call_mistral_with_retry(prompt)
-        # In the service we prefer the synchronous form; tests patch
-        # call_mistral_with_retry directly so client may be None in tests.
-        if client is None:
-            resp = call_mistral_with_retry(prompt)
-            # resp may be a coroutine when the single-arg async path is returned
-            if hasattr(resp, "__await__"):
-                # run synchronously for tests / threadpool by creating a fresh event loop
-                import asyncio
-
-                try:
-                    resp = asyncio.run(resp)
-                except RuntimeError:
-                    # fallback for unusual environments: create a new loop explicitly
-                    loop = asyncio.new_event_loop()
-                    try:
-                        resp = loop.run_until_complete(resp)
-                    finally:
-                        loop.close()
-            response = resp
-        else:
-            response = call_mistral_with_retry(client, prompt)
-
-        text = response.choices[0].message.content
-        flashcards = parse_flashcards(text)
-    except Exception as e:
-        # Bubble up so callers can convert to HTTPException if needed
+        response = llm_breaker.call(_complete, prompt, client)
+    except CircuitOpen:
+        metrics.incr("llm.circuit_rejected")
         raise
+    record_llm_call(response, topic, client_id, time.perf_counter() - start)
+    content = response.choices[0].message.content
+    if topic and isinstance(content, str):
+        with _completion_cache_lock:
+            _completion_cache[topic] = content
+            _completion_cache.move_to_end(topic)
+            while len(_completion_cache) > COMPLETION_CACHE_TOPICS:
+                _completion_cache.popitem(last=False)
+    return response
+
+
+def _total_tokens(response) -> int:
+    usage = getattr(response, "usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return total if isinstance(total, int) else 0
+
+
+def complete_prompt(prompt: str, client_id: str | None = None) -> tuple[str, int]:
+    """One completion for callers outside card generation (e.g. app.enrich): its text and
+    total tokens. Goes through the same breaker and usage ledger as generation, so it raises
+    CircuitOpen, and HTTPException for API errors, like _call_llm."""
+    response = _call_llm(prompt, client_id=client_id)
+    return response.choices[0].message.content, _total_tokens(response)
+
+
+def _parse_batch(response) -> list:
+    batch = parse_flashcards(response.choices[0].message.content)
+    return batch if isinstance(batch, list) else []
+
+
+def _split_chunks(target: int, size: int) -> list[int]:
+    """Split target into chunk sizes of at most size, e.g. 25, 10 -> [10, 10, 5]."""
+    return [min(size, target - i) for i in range(0, target, size)]
+
+
+def _generate_unique_cards(
+    topic: str, existing: list[dict], target: int, client=None, on_new=None, client_id=None
+):
+    """Ask the model for `target` cards the topic doesn't have yet.
+
+    Requests larger than one chunk first fan out into parallel calls, each on its
+    own facet of the topic. Then top-up rounds ask only for the shortfall,
+    excluding every word seen so far, until the target is met, a round adds
+    nothing new, or the round/token caps are hit. on_new(cards) is called as
+    each batch is accepted, so callers can start TTS while other chunks are
+    still generating.
+
+    Returns (new_cards, dedupe_report, generation_stats).
+    """
+    exclude = [c["word"] for c in existing if isinstance(c, dict) and c.get("word")]
+    new_cards = []
+    dedupe = {"duplicates": 0, "near_duplicates": 0}
+    stats = {"llm_calls": 0, "cards_returned": 0, "tokens": 0, "chunks": 0}
+
+    def accept(response) -> list:
+        stats["llm_calls"] += 1
+        stats["tokens"] += _total_tokens(response)
+        batch = _parse_batch(response)
+        stats["cards_returned"] += len(batch)
+        kept, report = select_new_cards(topic, batch, existing + new_cards)
+        for key, value in report.items():
+            dedupe[key] += value
+        new_cards.extend(kept)
+        exclude.extend(c["word"] for c in batch if isinstance(c, dict) and c.get("word"))
+        if kept and on_new:
+            on_new(kept)
+        return kept
 
-    for card in flashcards:
+    chunks = _split_chunks(target, GENERATION_CHUNK_SIZE)
+    if len(chunks) > 1:
+        stats["chunks"] = len(chunks)
+        futures = []
+        for i, n in enumerate(chunks):
+            prompt = _build_prompt(topic, n, exclude, CHUNK_FACETS[i % len(CHUNK_FACETS)])
+            try:
+                futures.append(stages.llm.submit(_call_llm, prompt, client, topic, client_id))
+            except stages.StageOverloaded:
+                # the LLM stage is saturated: go with the chunks that fit, the
+                # top-up rounds below ask for the remainder one call at a time
+                if not futures:
+                    raise
+                break
+        errors = []
+        for future in as_completed(futures):
+            try:
+                accept(future.result())
+            except Exception as e:
+                errors.append(e)
+        if errors and not new_cards:
+            # an open circuit takes precedence so the caller can serve degraded results
+            raise next((e for e in errors if isinstance(e, CircuitOpen)), errors[0])
+
+    rounds = 0
+    while (
+        len(new_cards) < target
+        and rounds < GENERATION_MAX_ROUNDS
+        and stats["tokens"] < GENERATION_MAX_TOKENS
+    ):
+        ask = min(target - len(new_cards), GENERATION_CHUNK_SIZE)
+        rounds += 1
+        try:
+            response = _call_llm(_build_prompt(topic, ask, exclude), client, topic, client_id)
+        except CircuitOpen:
+            if not new_cards:
+                raise
+            # keep what the chunks already produced rather than failing the request
+            break
+        if not accept(response):
+            # The model keeps returning known words; more rounds won't help
+            break
+
+    stats["cards_useful"] = len(new_cards)
+    stats["yield_per_call"] = round(len(new_cards) / stats["llm_calls"], 3) if stats["llm_calls"] else 0.0
+    metrics.incr("generation.requests")
+    metrics.incr("generation.llm_calls", stats["llm_calls"])
+    metrics.incr("generation.cards_returned", stats["cards_returned"])
+    metrics.incr("generation.cards_useful", len(new_cards))
+    metrics.incr("generation.tokens", stats["tokens"])
+    return new_cards, dedupe, stats
+
+
+def _attach_audio(card: dict) -> bool | None:
+    """Give card a tts_path, reusing an existing file when possible. Returns True if reused,
+    False if synthesized and None if TTS failed: the card is then kept without audio
+    (app.prewarm_audio fills it in later) rather than failing the whole request."""
+    existing = paths.find_audio(card.get("tts_path"))
+    if existing:
+        card["tts_path"] = existing
+        return True
+    try:
         card["tts_path"] = generate_tts(card["word"], AUDIO_DIR)
+    except Exception as e:
+        # includes CircuitOpen from the TTS backends, which must not pass for an LLM outage
+        metrics.incr("tts.failed")
+        print(f"[flashcard_service] no audio for {card['word']!r}: {e}")
+        card["tts_path"] = None
+        return None
+    return False
+
+
+def _degraded_result(topic: str, topic_file: str, existing: list[dict], error: CircuitOpen) -> dict:
+    """Serve the topic's stored cards (or its last cached completion) while the LLM circuit is open."""
+    cards, source = existing, "stored"
+    if not cards:
+        with _completion_cache_lock:
+            cached = _completion_cache.get(topic)
+        batch = parse_flashcards(cached) if cached else []
+        cards, source = [c for c in batch if isinstance(c, dict)] if isinstance(batch, list) else [], "cached_completion"
+    if not cards:
+        raise HTTPException(
+            status_code=503,
+            detail="Flashcard generation is temporarily unavailable. Please retry later.",
+            headers=retry_after_header(error.retry_after),
+        )
+    metrics.incr("generation.degraded")
+    return {
+        "topic": topic,
+        "added": [],
+        "file": os.path.basename(topic_file) if existing else None,
+        "total_cards": len(existing),
+        "cards": cards,
+        "stale": True,
+        "degraded": {"reason": "llm_circuit_open", "source": source, "retry_after": round(error.retry_after, 3)},
+    }
+
+
+def _submit_tts(card: dict) -> Future:
+    """Queue TTS for card; when the TTS stage is full, synthesize in the calling thread."""
+    try:
+        return stages.tts.submit(_attach_audio, card)
+    except stages.StageOverloaded:
+        metrics.incr("tts.ran_inline")
+        future = Future()
+        future.set_result(_attach_audio(card))
+        return future
+
+
+def _requested_count(data: dict) -> int:
+    count = data.get("count", FLASHCARDS_PER_REQUEST)
+    if isinstance(count, bool) or not isinstance(count, int) or not 1 <= count <= MAX_CARDS_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"count must be an integer between 1 and {MAX_CARDS_PER_REQUEST}",
+        )
+    return count
+
+
+def create_flashcards_service(data: dict, now=None, client=None, client_id=None):
+    # If now is not provided, use current datetime
+    if now is None:
+        now = datetime.now()
+
+    # Use now instead of datetime.now() in your function
+    timestamp = now.strftime("%Y%m%d%H%M%S")
+    isoformat = now.isoformat(timespec="seconds")
+
+    # normalize topic: lowercase, trim, replace whitespace with underscores
+    raw_topic = data.get("topic", "general") or "general"
+    topic = re.sub(r"\s+", "_", raw_topic.strip().lower())
+    count = _requested_count(data)
 
     topic_file = get_topic_file(topic, DATA_DIR)
-    if topic_file and os.path.exists(topic_file):
-        with open(topic_file, "r", encoding="utf-8") as f:
-            existing = json.load(f)
+    created = not (topic_file and os.path.exists(topic_file))
+    if not created:
+        existing = load_json(topic_file)
     else:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        topic_file = os.path.join(DATA_DIR, f"{topic}_{timestamp}.json")
+        topic_file = paths.deck_path(DATA_DIR, f"{topic}_{timestamp}.json")
         existing = []
 
-    existing_words = {c["word"] for c in existing}
-    new_cards = [c for c in flashcards if c["word"] not in existing_words]
-    existing.extend(new_cards)
-
-    with open(topic_file, "w", encoding="utf-8") as f:
-        json.dump(existing, f, ensure_ascii=False, indent=2)
-
-    history = load_history(HISTORY_FILE)
-    now = datetime.now().isoformat(timespec="seconds")
-    if topic not in history:
-        history[topic] = {
-            "filename": os.path.basename(topic_file),
-            "created_at": now,
-            "updated_at": now,
-            "count": len(existing),
-        }
-    else:
-        history[topic]["updated_at"] = now
-        history[topic]["count"] = len(existing)
-    save_history(history, HISTORY_FILE)
+    # Popular topics have cards (and audio) pre-generated off-peak by the warmer; serve those
+    # first and only generate the shortfall.
+    record_request(topic)
+    reserved = take_reserved(topic, existing, count)
+    try:
+        # De-duplication happens before TTS so discarded cards never cost a synthesis call.
+        # TTS for a batch starts as soon as it is accepted, while other chunks generate.
+        tts_futures = [_submit_tts(c) for c in reserved]
+        try:
+            new_cards, dedupe, generation = _generate_unique_cards(
+                topic,
+                existing + reserved,
+                count - len(reserved),
+                client,
+                on_new=lambda cards: tts_futures.extend(_submit_tts(c) for c in cards),
+                client_id=client_id,
+            )
+        except CircuitOpen as e:
+            if not reserved:
+                return _degraded_result(topic, topic_file, existing, e)
+            # the reserved cards are still worth serving without the rest
+            new_cards, dedupe = [], {"duplicates": 0, "near_duplicates": 0}
+            generation = {
+                "llm_calls": 0, "cards_returned": 0, "tokens": 0, "chunks": 0, "cards_useful": 0, "yield_per_call": 0.0
+            }
+        new_cards = reserved + new_cards
+        generation["reserved"] = len(reserved)
+        reused = [f.result() for f in tts_futures]
+        dedupe["audio_reused"] = reused.count(True)
+        dedupe["tts_generated"] = reused.count(False)
+        dedupe["tts_failed"] = reused.count(None)
+        existing.extend(new_cards)
+
+        dump_json(existing, topic_file)
+    except Exception:
+        # the request failed before its deck was saved: the reserved cards go to the next one
+        return_reserved(topic, reserved)
+        raise
+
+    remember_cards(topic, new_cards)
+    register_cards(topic, os.path.basename(topic_file), new_cards)
+    index_cards(topic, os.path.basename(topic_file), new_cards)
+    record_cards(topic, new_cards)
+    add_quiz_cards(topic, new_cards)
+
+    record_topic(topic, os.path.basename(topic_file), len(existing), created)
 
     return {
         "topic": topic,
         "added": [c["word"] for c in new_cards],
+        "cards": new_cards,
         "file": os.path.basename(topic_file),
         "total_cards": len(existing),
+        "dedupe": dedupe,
+        "generation": generation,
     }
@@ -0,0 +1,122 @@
+# app/services/health_service.py
+# This module contains the service logic for the health endpoints: the state of the
+# circuit breakers guarding external dependencies, liveness, and readiness after the
+# startup warm-up of the process-wide caches.
+
+import os
+import threading
+import time
+from app import mistral_client, tts, tts_backends
+from app.circuit_breaker import CLOSED
+from app.config import AUDIO_DIR, DATA_DIR, STATE_DIR
+from app.services import dedupe_service, flashcard_service, history_service, quiz_service, search_service
+
+_started = time.time()
+_lock = threading.Lock()
+# warm-up progress: step -> {"ok", "ms", "error"?}; "done" once every step has run
+_warmup = {"done": False, "steps": {}}
+
+
+def _warm_audio_index():
+    return len(tts.get_audio_index(AUDIO_DIR))
+
+
+# What the first requests would otherwise build: (step, loader)
+WARMUP_STEPS = [
+    ("word_index", dedupe_service.get_word_index),
+    ("search_index", search_service.get_search_index),
+    ("quiz_index", quiz_service.get_distractor_index),
+    ("audio_index", _warm_audio_index),
+    ("history", history_service.get_history_store),
+    ("llm_client", mistral_client.get_default_client),
+]
+
+
+def _timed(fn) -> dict:
+    start = time.perf_counter()
+    try:
+        fn()
+        result = {"ok": True}
+    except Exception as e:
+        result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    result["ms"] = round(1000 * (time.perf_counter() - start), 2)
+    return result
+
+
+def warm_up() -> dict:
+    """Load the caches the request path needs; run once at startup (see app.main lifespan).
+
+    A failing step is recorded rather than raised: the caches that did load still
+    help, and readiness reports which step failed.
+    """
+    for name, fn in WARMUP_STEPS:
+        result = _timed(fn)
+        if not result["ok"]:
+            print(f"[health] warm-up step {name} failed: {result['error']}")
+        with _lock:
+            _warmup["steps"][name] = result
+    with _lock:
+        _warmup["done"] = True
+        return {"done": True, "steps": dict(_warmup["steps"])}
+
+
+def _check_writable(directory: str) -> None:
+    probe = os.path.join(directory, f".readyz_{os.getpid()}")
+    with open(probe, "w", encoding="utf-8") as f:
+        f.write("ok")
+    os.remove(probe)
+
+
+def get_health_service():
+    dependencies = {"mistral": flashcard_service.llm_breaker.status()}
+    try:
+        dependencies.update(tts_backends.get_chain().status())
+    except RuntimeError as e:
+        dependencies["tts"] = {"state": "unavailable", "last_error": str(e)}
+    return {
+        "status": "ok" if all(d["state"] == CLOSED for d in dependencies.values()) else "degraded",
+        "dependencies": dependencies,
+    }
+
+
+def get_liveness_service():
+    """The process is up and serving; says nothing about its dependencies."""
+    return {"status": "alive", "uptime_s": round(time.time() - _started, 1)}
+
+
+def get_readiness_service():
+    """Ready once warm-up has finished and storage and the audio directory are writable.
+
+    Returns (ready, body). The LLM and TTS only degrade readiness: stored decks
+    can still be served while they are unavailable.
+    """
+    with _lock:
+        warmup = {"done": _warmup["done"], "steps": dict(_warmup["steps"])}
+    checks = {
+        "storage": _timed(lambda: (_check_writable(DATA_DIR), _check_writable(STATE_DIR))),
+        "audio_dir": _timed(lambda: _check_writable(AUDIO_DIR)),
+    }
+    llm = warmup["steps"].get("llm_client", {})
+    breaker = flashcard_service.llm_breaker.status()
+    checks["mistral"] = {
+        "ok": bool(llm.get("ok")) and breaker["state"] == CLOSED,
+        "state": breaker["state"],
+        "ms": llm.get("ms", 0.0),
+    }
+    if llm.get("error"):
+        checks["mistral"]["error"] = llm["error"]
+
+    def tts_status():
+        states = tts_backends.get_chain().status()
+        if not any(s["state"] == CLOSED for s in states.values()):
+            raise RuntimeError("every TTS backend circuit is open")
+
+    checks["tts"] = _timed(tts_status)
+
+    required = ("storage", "audio_dir")
+    ready = warmup["done"] and all(checks[name]["ok"] for name in required)
+    if not ready:
+        status = "warming_up" if not warmup["done"] else "unavailable"
+    else:
+        status = "ready" if all(c["ok"] for c in checks.values()) else "degraded"
+    return ready, {"status": status, "ready": ready, "warmup": warmup, "dependencies": checks}
@@ -1,10 +1,46 @@
 # app/services/history_service.py
-# This module contains the service logic for retrieving flashcard topic history.
+# This module contains the service logic for flashcard topic history: journaling generations
+# and serving the in-memory view, with optional filtering, sorting and pagination.
 
-from app.history import load_history
-from app.config import HISTORY_FILE
+import threading
+from fastapi import HTTPException
+from app import stages
+from app.config import HISTORY_COMPACT_EVENTS, HISTORY_FILE, HISTORY_JOURNAL_FILE
+from app.history import SORT_FIELDS, HistoryJournal
 
+_store = None
+_init_lock = threading.Lock()
 
-def get_topic_history_service():
-    history = load_history(HISTORY_FILE)
-    return history
+
+def get_history_store() -> HistoryJournal:
+    """Return the process-wide history, loading snapshot + journal on first use."""
+    global _store
+    if _store is None:
+        with _init_lock:
+            if _store is None:
+                store = HistoryJournal(HISTORY_FILE, HISTORY_JOURNAL_FILE, HISTORY_COMPACT_EVENTS)
+                store.load()
+                _store = store
+    return _store
+
+
+def record_topic(topic: str, filename: str, count: int, created: bool) -> None:
+    """Journal a generation; compaction runs in the background on the disk stage."""
+    store = _store if _store is not None else get_history_store()
+    if store.record(topic, filename, count, created):
+        try:
+            stages.disk.submit(store.compact)
+        except stages.StageOverloaded:
+            # the journal simply grows a little more until the next attempt
+            pass
+
+
+def get_topic_history_service(q=None, sort=None, order="desc", offset=0, limit=None):
+    store = get_history_store()
+    if q is None and sort is None and limit is None and not offset:
+        # no query parameters: the full {topic: entry} mapping, as before
+        return store.view()
+    sort = sort or "updated_at"
+    if sort not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_FIELDS)}")
+    return store.query(q, sort, order != "asc", offset, limit or 50)
@@ -0,0 +1,12 @@
+# app/services/maintenance_service.py
+# This module contains the service logic for storage maintenance tasks (audio dedupe and GC).
+
+from fastapi import HTTPException
+from app.audio_gc import GCBusy, collect
+
+
+def run_audio_gc_service(dry_run: bool = True):
+    try:
+        return collect(dry_run=dry_run)
+    except GCBusy:
+        raise HTTPException(status_code=409, detail="Audio collection already running.")
@@ -0,0 +1,60 @@
+# app/services/quiz_service.py
+# This module contains the service logic for quizzes: the process-wide distractor index built
+# from the saved decks, kept current as cards are saved, and quiz building for GET /quiz.
+
+import re
+import threading
+from fastapi import HTTPException
+from app import metrics
+from app.config import DATA_DIR
+from app.flashcard_utils import iter_topic_files
+from app.quiz import QUIZ_TYPES, DistractorIndex, build_quiz
+from app.storage import load_json
+
+_index = None
+_init_lock = threading.Lock()
+
+
+def _build_index(data_dir: str) -> DistractorIndex:
+    index = DistractorIndex()
+    for topic, path in iter_topic_files(data_dir):
+        try:
+            cards = load_json(path)
+        except Exception as e:
+            print(f"[quiz_service] skipping unreadable deck {path}: {e}")
+            continue
+        index.add(topic, cards if isinstance(cards, list) else [])
+    return index
+
+
+def get_distractor_index() -> DistractorIndex:
+    """Return the process-wide distractor index, building it from the decks on first use."""
+    global _index
+    if _index is None:
+        with _init_lock:
+            if _index is None:
+                _index = _build_index(DATA_DIR)
+    return _index
+
+
+def add_quiz_cards(topic: str, cards: list[dict]) -> None:
+    """Index freshly saved cards. No-op until the index is built, since building it reads
+    every deck anyway."""
+    if _index is None:
+        return
+    _index.add(topic, cards)
+
+
+def build_quiz_service(topic: str, n: int = 10, kind: str = "mixed", choices: int = 4, seed=None):
+    if kind not in QUIZ_TYPES:
+        raise HTTPException(status_code=400, detail=f"type must be one of {', '.join(QUIZ_TYPES)}")
+    topic = re.sub(r"\s+", "_", topic.strip().lower())
+    index = get_distractor_index()
+    with metrics.timed("quiz.build"):
+        quiz = build_quiz(index, topic, n, kind, choices, seed)
+    if not quiz["questions"]:
+        if not index.topic_cards(topic):
+            raise HTTPException(status_code=404, detail=f"No saved cards for topic: {topic}")
+        raise HTTPException(status_code=422, detail=f"Not enough cards in {topic} for a {kind} quiz")
+    metrics.incr("quiz.questions", len(quiz["questions"]))
+    return quiz
@@ -0,0 +1,119 @@
+# app/services/review_service.py
+# This module contains the service logic for spaced-repetition reviews: building the
+# scheduler from saved decks and the review log, picking the next card and recording grades.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException
+from app import paths
+from app.config import DATA_DIR, REVIEW_LOG_FILE
+from app.flashcard_utils import iter_topic_files, make_card_id
+from app.srs import ReviewLog, ReviewScheduler
+from app.storage import load_json
+
+_scheduler = None
+_review_log = ReviewLog(REVIEW_LOG_FILE)
+_init_lock = threading.Lock()
+# Recently read decks as path -> (mtime_ns, {word: card}), so GET /review/next doesn't parse
+# the whole deck each time
+_DECK_CACHE_SIZE = 32
+_deck_cache = OrderedDict()
+_deck_cache_lock = threading.Lock()
+
+
+def _build_scheduler(data_dir: str, review_log: ReviewLog) -> ReviewScheduler:
+    scheduler = ReviewScheduler()
+    for topic, path in iter_topic_files(data_dir):
+        try:
+            cards = load_json(path)
+        except Exception as e:
+            print(f"[review_service] skipping unreadable deck {path}: {e}")
+            continue
+        filename = os.path.basename(path)
+        for card in cards if isinstance(cards, list) else []:
+            word = card.get("word")
+            if word:
+                scheduler.add_card(make_card_id(topic, word), topic, word, filename)
+    for ts, card_id, grade, _elapsed, interval, ease in review_log.replay():
+        scheduler.apply(card_id, ts, grade, interval, ease)
+    return scheduler
+
+
+def get_scheduler() -> ReviewScheduler:
+    """Return the process-wide scheduler, building it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _init_lock:
+            if _scheduler is None:
+                _scheduler = _build_scheduler(DATA_DIR, _review_log)
+    return _scheduler
+
+
+def register_cards(topic: str, filename: str, cards: list[dict]) -> None:
+    """Add freshly saved cards to the queue. No-op until the scheduler is built,
+    since building it reads every deck anyway."""
+    if _scheduler is None:
+        return
+    for card in cards:
+        if card.get("word"):
+            _scheduler.add_card(make_card_id(topic, card["word"]), topic, card["word"], filename)
+
+
+def _deck_words(path: str) -> dict[str, dict] | None:
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _deck_cache_lock:
+        cached = _deck_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            _deck_cache.move_to_end(path)
+            return cached[1]
+    try:
+        cards = load_json(path)
+    except Exception:
+        return None
+    # first card wins for a repeated word, as the linear scan did
+    words = {}
+    for card in cards if isinstance(cards, list) else []:
+        if isinstance(card, dict):
+            words.setdefault(card.get("word"), card)
+    with _deck_cache_lock:
+        _deck_cache[path] = (mtime, words)
+        _deck_cache.move_to_end(path)
+        while len(_deck_cache) > _DECK_CACHE_SIZE:
+            _deck_cache.popitem(last=False)
+    return words
+
+
+def _load_card(state) -> dict | None:
+    path = paths.find_deck(DATA_DIR, state.filename)
+    if path is None:
+        return None
+    words = _deck_words(path)
+    return words.get(state.word) if words else None
+
+
+def get_next_review_service(topic: str | None = None, now: float | None = None):
+    now = time.time() if now is None else now
+    scheduler = get_scheduler()
+    state = scheduler.next_due(topic)
+    if state is None:
+        return {"card": None}
+    return {
+        "card": _load_card(state),
+        "schedule": state.to_dict(),
+        "is_due": state.due <= now,
+    }
+
+
+def submit_review_service(card_id: str, grade, now: float | None = None):
+    if not isinstance(grade, int) or isinstance(grade, bool) or not 0 <= grade <= 5:
+        raise HTTPException(status_code=400, detail="grade must be an integer between 0 and 5")
+    now = time.time() if now is None else now
+    state, _ = get_scheduler().review(card_id, grade, now, log=_review_log)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Unknown card: {card_id}")
+    return {"card_id": card_id, "grade": grade, "schedule": state.to_dict()}
@@ -2,19 +2,23 @@
 # This module contains the service logic for listing and retrieving saved flashcards.
 
 import os
-import json
+from fastapi import HTTPException
+from app import paths
 from app.config import DATA_DIR
+from app.storage import load_json
 
 
 def list_saved_flashcards_service():
-    files = sorted(os.listdir(DATA_DIR))
+    files = [os.path.basename(path) for _, path in paths.iter_decks(DATA_DIR)]
     return {"saved_flashcards": files}
 
 
 def get_saved_flashcards_service(filename: str):
-    file_path = os.path.join(DATA_DIR, filename)
-    if os.path.exists(file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            flashcards = json.load(f)
+    # DATA_DIR also holds history.json and the library.fcb bundle; only decks are served here
+    if not paths.TOPIC_FILE_RE.match(filename):
+        raise HTTPException(status_code=404, detail=f"Not a saved deck: {filename}")
+    file_path = paths.find_deck(DATA_DIR, filename)
+    if file_path is not None:
+        flashcards = load_json(file_path)
         return {"filename": filename, "flashcards": flashcards}
     return {"error": "file not found"}
@@ -0,0 +1,74 @@
+# app/services/search_service.py
+# This module contains the service logic for full-text search across all saved decks.
+
+import os
+import threading
+from app.config import DATA_DIR, SEARCH_INDEX_FILE, SEARCH_JAMO
+from app.flashcard_utils import iter_topic_files, make_card_id
+from app.search_index import SearchIndex, append_journal
+from app.storage import load_json
+
+# Re-snapshot on load once this many docs had to be re-tokenized from the journal
+SNAPSHOT_AFTER_DOCS = 5000
+
+_index = None
+_init_lock = threading.Lock()
+
+
+def _card_docs(topic: str, filename: str, cards: list[dict]) -> list[dict]:
+    return [
+        dict(card, card_id=make_card_id(topic, card["word"]), topic=topic, file=filename)
+        for card in cards
+        if isinstance(card, dict) and card.get("word")
+    ]
+
+
+def _build_index(data_dir: str, journal_path: str) -> SearchIndex:
+    index = SearchIndex(journal_path, jamo=SEARCH_JAMO)
+    if index.load():
+        if index.tail_docs >= SNAPSHOT_AFTER_DOCS:
+            index.save_snapshot()
+        return index
+    # First run: index every deck once and write the journal
+    docs = []
+    for topic, path in iter_topic_files(data_dir):
+        try:
+            cards = load_json(path)
+        except Exception as e:
+            print(f"[search_service] skipping unreadable deck {path}: {e}")
+            continue
+        docs.extend(_card_docs(topic, os.path.basename(path), cards if isinstance(cards, list) else []))
+    open(journal_path, "a", encoding="utf-8").close()
+    index.add(docs)
+    index.save_snapshot()
+    return index
+
+
+def get_search_index() -> SearchIndex:
+    """Return the process-wide index, loading (or building) it on first use."""
+    global _index
+    if _index is None:
+        with _init_lock:
+            if _index is None:
+                _index = _build_index(DATA_DIR, SEARCH_INDEX_FILE)
+    return _index
+
+
+def index_cards(topic: str, filename: str, cards: list[dict]) -> None:
+    """Add newly saved cards to the index.
+
+    If the index isn't loaded yet only the journal is appended to; without a
+    journal the next load indexes the decks from scratch, so nothing is needed.
+    """
+    docs = _card_docs(topic, filename, cards)
+    if not docs:
+        return
+    if _index is not None:
+        _index.add(docs)
+    elif os.path.exists(SEARCH_INDEX_FILE):
+        append_journal(SEARCH_INDEX_FILE, docs)
+
+
+def search_flashcards_service(q: str, topic: str | None = None, limit: int = 20, jamo: bool = True):
+    results = get_search_index().search(q, topic=topic, limit=limit, jamo=jamo)
+    return {"query": q, "total": len(results), "results": results}
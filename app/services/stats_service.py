@@ -0,0 +1,73 @@
+# app/services/stats_service.py
+# This module contains the service logic for learning statistics. It keeps a review
+# snapshot and running aggregates in memory and folds in only reviews logged since the last call.
+
+import threading
+import time
+import numpy as np
+from app.config import REVIEW_LOG_FILE, STATS_DIR
+from app.services.review_service import get_scheduler
+from app.stats import LearningStats, ReviewSnapshot
+
+_lock = threading.Lock()
+_snapshot = None
+_stats = None
+_topic_codes = ([], np.zeros(0, dtype=np.int64))
+
+
+def _topic_of(card_id: str) -> str | None:
+    state = get_scheduler().get(card_id)
+    return state.topic if state else None
+
+
+def _refresh():
+    global _snapshot, _stats
+    if _snapshot is None:
+        _snapshot = ReviewSnapshot(STATS_DIR)
+        _stats = LearningStats()
+        _stats.update(_snapshot.reviews())
+    _stats.update(_snapshot.sync(REVIEW_LOG_FILE, topic_of=_topic_of))
+    return _snapshot, _stats
+
+
+def _card_topic_codes(snapshot: ReviewSnapshot):
+    """Return (sorted topic names, topic code per card), rebuilt only when new cards appear."""
+    global _topic_codes
+    topics, card_topic = _topic_codes
+    if len(card_topic) != len(snapshot.card_topics):
+        topics = sorted(set(snapshot.card_topics))
+        codes = {t: i for i, t in enumerate(topics)}
+        card_topic = np.array([codes[t] for t in snapshot.card_topics], dtype=np.int64)
+        _topic_codes = (topics, card_topic)
+    return topics, card_topic
+
+
+def get_stats_service(topic: str | None = None, days: int = 30, now: float | None = None):
+    now = time.time() if now is None else now
+    with _lock:
+        snapshot, stats = _refresh()
+        topics, card_topic = _card_topic_codes(snapshot)
+
+        if topic is None:
+            retention = stats.retention_curve()
+            forecast = stats.forecast(now, days)
+        else:
+            # Topic-scoped retention is computed on demand from the memory-mapped rows
+            code = topics.index(topic) if topic in topics else -1
+            topic_mask = card_topic == code
+            rows = snapshot.reviews()
+            scoped = LearningStats()
+            scoped.update(rows[topic_mask[rows["card"]]] if len(rows) else rows)
+            retention = scoped.retention_curve()
+            forecast = stats.forecast(now, days, mask=topic_mask)
+
+        scheduler = get_scheduler()
+        return {
+            "topic": topic,
+            "total_reviews": stats.rows,
+            "cards_known": len(scheduler),
+            "cards_reviewed": int((stats.card_reviews > 0).sum()),
+            "retention": retention,
+            "forecast": forecast,
+            "difficulty": stats.topic_difficulty(card_topic, topics),
+        }
@@ -0,0 +1,104 @@
+# app/services/sync_service.py
+# This module contains the service logic for the card change feed: recording saved cards and
+# answering "what changed since revision N" for syncing clients.
+
+import os
+import threading
+import time
+import uuid
+from app.config import CHANGES_FILE, CHANGES_INBOX_DIR, DATA_DIR, SYNC_PAGE_SIZE
+from app.flashcard_utils import iter_topic_files
+from app.storage import dump_json_atomic, load_json
+from app.sync import ChangeFeed
+
+_feed = None
+_init_lock = threading.Lock()
+_inbox_lock = threading.Lock()
+
+
+def _seed(feed: ChangeFeed) -> None:
+    # A new feed starts with every card already on disk, so the first sync is a full copy.
+    for topic, path in iter_topic_files(DATA_DIR):
+        try:
+            cards = load_json(path)
+        except (OSError, ValueError):
+            continue
+        feed.record(topic, [c for c in cards if isinstance(c, dict)] if isinstance(cards, list) else [])
+
+
+def get_feed() -> ChangeFeed:
+    """Return the process-wide change feed, loading (or seeding) it on first use."""
+    global _feed
+    if _feed is None:
+        with _init_lock:
+            if _feed is None:
+                fresh = not os.path.exists(CHANGES_FILE)
+                feed = ChangeFeed(CHANGES_FILE)
+                feed.load()
+                if fresh:
+                    _seed(feed)
+                _feed = feed
+    return _feed
+
+
+def record_cards(topic: str, cards: list[dict]) -> None:
+    if cards:
+        get_feed().record(topic, cards)
+
+
+def queue_changes(topic: str, cards: list[dict]) -> None:
+    """Hand cards a command-line tool rewrote to the server's feed.
+
+    The tools run in their own process, and revisions are only consistent if one
+    process appends them, so the cards go to CHANGES_INBOX_DIR and the server
+    records them on its next sync request (or start).
+    """
+    if not cards:
+        return
+    os.makedirs(CHANGES_INBOX_DIR, exist_ok=True)
+    name = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}.json"
+    dump_json_atomic({"topic": topic, "cards": cards}, os.path.join(CHANGES_INBOX_DIR, name), "json")
+
+
+def _drain_inbox(feed: ChangeFeed) -> None:
+    # oldest first (names start with the time they were queued); dump_json_atomic writes
+    # "<name>.write" first, so a file still being written doesn't end in .json
+    with _inbox_lock:
+        try:
+            names = sorted(n for n in os.listdir(CHANGES_INBOX_DIR) if n.endswith(".json"))
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(CHANGES_INBOX_DIR, name)
+            try:
+                data = load_json(path)
+                cards = [c for c in data["cards"] if isinstance(c, dict)]
+                feed.record(data["topic"], cards)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"[sync_service] setting aside unreadable queued changes {name}: {e}")
+                os.replace(path, path + ".bad")
+                continue
+            os.remove(path)
+
+
+def get_changes_service(since: int = 0, limit: int = SYNC_PAGE_SIZE, feed_id: str | None = None) -> dict:
+    """Changes after `since` as {feed, rev, head, reset, more, changes}.
+
+    `rev` is the cursor to send as `since` next time. A client that synced against
+    another feed (its `feed_id` differs, or its `since` is beyond the head) gets
+    `reset` and a full copy: its revisions mean nothing in this one.
+    """
+    feed = get_feed()
+    _drain_inbox(feed)
+    reset = since > feed.rev or (feed_id is not None and feed_id != feed.feed_id)
+    if reset:
+        since = 0
+    changes, more, head = feed.since(since, limit)
+    return {
+        "feed": feed.feed_id,
+        "rev": changes[-1]["rev"] if more else head,
+        "head": head,
+        "reset": reset,
+        "more": more,
+        "changes": changes,
+    }
@@ -0,0 +1,80 @@
+# app/services/usage_service.py
+# This module contains the service logic for the token usage ledger and for admission
+# control of generation requests against token-per-minute budgets.
+
+import contextvars
+from fastapi import HTTPException, Request
+from app.config import (
+    TOKEN_BUDGET_CLIENT_TPM,
+    TOKEN_BUDGET_GLOBAL_TPM,
+    TOKEN_BUDGET_MAX_CLIENTS,
+    TOKENS_PER_CARD_ESTIMATE,
+    USAGE_LEDGER_FILE,
+)
+from app.usage import AdmissionController, BudgetExceeded, UsageLedger, retry_after_header
+
+ledger = UsageLedger(USAGE_LEDGER_FILE)
+admission = AdmissionController(
+    TOKEN_BUDGET_GLOBAL_TPM, TOKEN_BUDGET_CLIENT_TPM, max_clients=TOKEN_BUDGET_MAX_CLIENTS
+)
+
+# Prompt overhead charged on top of the per-card estimate
+_BASE_ESTIMATE = 400
+
+# Tokens of each LLM call made for the generation being served (record_llm_call appends;
+# the stages copy the context into their workers), so a failed request still settles at
+# what it spent
+_spent: contextvars.ContextVar = contextvars.ContextVar("generation_tokens", default=None)
+
+
+def client_id_for(request: Request) -> str:
+    """Identify the caller: explicit X-Client-Id header, else the peer address."""
+    header = request.headers.get("x-client-id")
+    if header:
+        return header
+    return request.client.host if request.client else "unknown"
+
+
+def admit_generation(client_id: str, count: int):
+    """Reserve budget for a generation of `count` cards or fail fast with 429."""
+    estimate = _BASE_ESTIMATE + count * TOKENS_PER_CARD_ESTIMATE
+    try:
+        handle = admission.admit(client_id, estimate)
+    except BudgetExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{e.scope.capitalize()} token budget exceeded. Please retry later.",
+            headers=retry_after_header(e.retry_after),
+        )
+    _spent.set([])
+    return handle
+
+
+def settle_generation(handle, result) -> None:
+    """Replace the reserved estimate with the tokens the generation actually used.
+
+    A request that failed (result None) settles at the tokens its LLM calls recorded.
+    """
+    if isinstance(result, dict):
+        tokens = (result.get("generation") or {}).get("tokens", 0)
+    else:
+        tokens = sum(_spent.get() or ())
+    admission.settle(handle, tokens if isinstance(tokens, int) else 0)
+
+
+def record_llm_call(response, topic: str, client_id: str | None, latency_s: float) -> None:
+    """Add one completion's token usage (from response.usage) to the ledger."""
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", 0)
+    completion_tokens = getattr(usage, "completion_tokens", 0)
+    prompt_tokens = prompt_tokens if isinstance(prompt_tokens, int) else 0
+    completion_tokens = completion_tokens if isinstance(completion_tokens, int) else 0
+    ledger.record(topic, client_id, prompt_tokens, completion_tokens, latency_s)
+    spent = _spent.get()
+    if spent is not None:
+        # list.append is atomic; parallel chunks record from several threads
+        spent.append(prompt_tokens + completion_tokens)
+
+
+def get_usage_service():
+    return {"ledger": ledger.summary(), "budgets": admission.status()}
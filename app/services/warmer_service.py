@@ -0,0 +1,206 @@
+# app/services/warmer_service.py
+# This module contains the service logic for the warm catalog: counting topic requests, serving
+# reserved cards to generations, and the off-peak pass that pre-generates cards (and their
+# audio) for the most requested topics within a token budget.
+
+import threading
+import time
+from datetime import datetime
+from fastapi import HTTPException
+from app import metrics, stages
+from app.circuit_breaker import CLOSED, CircuitOpen
+from app.config import (
+    DATA_DIR,
+    DEMAND_FILE,
+    DEMAND_HALF_LIFE_DAYS,
+    RESERVE_DIR,
+    WARM_INTERVAL,
+    WARM_RESERVE_CARDS,
+    WARM_TOKEN_BUDGET,
+    WARM_TOPICS,
+    WARM_WINDOW,
+)
+from app.flashcard_utils import get_topic_file
+from app.services import history_service
+from app.services.dedupe_service import select_new_cards
+from app.storage import load_json
+from app.warmer import DemandCounter, Reserve, in_window, rank_topics
+
+# client id the warmer's LLM calls are recorded under in the usage ledger
+CLIENT_ID = "warmer"
+HALF_LIFE_S = DEMAND_HALF_LIFE_DAYS * 86400
+
+_demand = None
+_reserve = None
+_init_lock = threading.Lock()
+# one pass at a time; a second caller gets WarmerBusy instead of waiting
+_running = threading.Lock()
+_last_pass = None
+
+
+class WarmerBusy(Exception):
+    pass
+
+
+def get_demand() -> DemandCounter:
+    global _demand
+    if _demand is None:
+        with _init_lock:
+            if _demand is None:
+                demand = DemandCounter(DEMAND_FILE, HALF_LIFE_S)
+                demand.load()
+                _demand = demand
+    return _demand
+
+
+def get_reserve() -> Reserve:
+    global _reserve
+    if _reserve is None:
+        with _init_lock:
+            if _reserve is None:
+                reserve = Reserve(RESERVE_DIR)
+                reserve.load()
+                _reserve = reserve
+    return _reserve
+
+
+def record_request(topic: str) -> None:
+    get_demand().hit(topic)
+
+
+def take_reserved(topic: str, existing: list[dict], count: int) -> list[dict]:
+    """Up to count reserved cards of topic that are still new to its deck."""
+    reserve = get_reserve()
+    if not reserve.count(topic):
+        return []
+    cards = reserve.take(topic, count, lambda pool: select_new_cards(topic, pool, existing)[0])
+    metrics.incr("warmer.cards_served", len(cards))
+    return cards
+
+
+def return_reserved(topic: str, cards: list[dict]) -> None:
+    """Put cards from take_reserved back when the request that took them failed."""
+    get_reserve().put_back(topic, cards)
+    metrics.incr("warmer.cards_served", -len(cards))
+
+
+def _idle() -> bool:
+    # the same rule as POST /flashcards/prefetch: only spare capacity, never a waiting learner
+    return not stages.generation.queued()
+
+
+def _deck_cards(topic: str) -> list[dict]:
+    path = get_topic_file(topic, DATA_DIR)
+    if not path:
+        return []
+    cards = load_json(path)
+    return [c for c in cards if isinstance(c, dict)] if isinstance(cards, list) else []
+
+
+def warm_pass(
+    budget: int = WARM_TOKEN_BUDGET,
+    limit: int = WARM_TOPICS,
+    reserve_cards: int = WARM_RESERVE_CARDS,
+    dry_run: bool = False,
+    idle=_idle,
+) -> dict:
+    """Top up the reserve of the limit best-ranked topics to reserve_cards cards each.
+
+    Topics are visited best first and the pass stops when budget tokens are spent,
+    a learner's generation is waiting (idle() is False) or the LLM circuit opens;
+    whatever was reserved so far stays. dry_run only reports what would be asked for.
+    """
+    # imported here: flashcard_service serves reserved cards through this module
+    from app.services import flashcard_service
+
+    global _last_pass
+    if not _running.acquire(blocking=False):
+        raise WarmerBusy("a warm pass is already running")
+    try:
+        demand, reserve = get_demand(), get_reserve()
+        ranked = rank_topics(demand.scores(), history_service.get_history_store().view(), HALF_LIFE_S, limit)
+        report = {
+            "dry_run": dry_run, "ranked": len(ranked), "topics_warmed": 0, "cards": 0, "tokens": 0, "tts_failed": 0,
+            "stopped": None,
+        }
+        wanted = []
+        start = time.perf_counter()
+        for topic, score in ranked:
+            need = reserve_cards - reserve.count(topic)
+            if need <= 0:
+                continue
+            if dry_run:
+                wanted.append({"topic": topic, "score": score, "cards": need})
+                continue
+            if report["tokens"] >= budget:
+                report["stopped"] = "budget"
+                break
+            if not idle():
+                report["stopped"] = "busy"
+                break
+            if flashcard_service.llm_breaker.status()["state"] != CLOSED:
+                report["stopped"] = "llm_circuit_open"
+                break
+            existing = _deck_cards(topic) + reserve.cards(topic)
+            try:
+                cards, _, stats = flashcard_service._generate_unique_cards(topic, existing, need, client_id=CLIENT_ID)
+                report["tokens"] += stats["tokens"]
+                # synthesize now, so the learner who gets these cards doesn't wait for audio either;
+                # a TTS failure leaves the card without audio (it is retried when served)
+                report["tts_failed"] += [flashcard_service._attach_audio(card) for card in cards].count(None)
+            except CircuitOpen:
+                # only the LLM's: _attach_audio handles the TTS backends' own breakers
+                report["stopped"] = "llm_circuit_open"
+                break
+            except Exception as e:
+                print(f"[warmer] could not warm {topic!r}: {e}")
+                continue
+            reserve.add(topic, cards)
+            report["topics_warmed"] += bool(cards)
+            report["cards"] += len(cards)
+        if dry_run:
+            report["wanted"] = wanted
+            report["cards"] = sum(w["cards"] for w in wanted)
+        report["ms"] = round(1000 * (time.perf_counter() - start), 2)
+        report["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        demand.save()
+        metrics.incr("warmer.cards_reserved", 0 if dry_run else report["cards"])
+        metrics.incr("warmer.tokens", report["tokens"])
+        if not dry_run:
+            _last_pass = report
+        return report
+    finally:
+        _running.release()
+
+
+def run_warmer(stop: threading.Event, interval: float = WARM_INTERVAL, window: str = WARM_WINDOW) -> None:
+    """Background loop (started by the app lifespan): a pass every interval seconds inside window."""
+    while not stop.wait(interval):
+        try:
+            if in_window(window, datetime.now().time()):
+                warm_pass()
+            else:
+                get_demand().save()
+        except WarmerBusy:
+            pass
+        except Exception as e:
+            print(f"[warmer] pass failed: {e}")
+    get_demand().save()
+
+
+def run_warm_pass_service(dry_run: bool = False):
+    try:
+        return warm_pass(dry_run=dry_run)
+    except WarmerBusy:
+        raise HTTPException(status_code=409, detail="A warm pass is already running.")
+
+
+def get_warmer_service():
+    ranked = rank_topics(get_demand().scores(), history_service.get_history_store().view(), HALF_LIFE_S, 10)
+    return {
+        "window": WARM_WINDOW or None,
+        "in_window": in_window(WARM_WINDOW, datetime.now().time()),
+        "reserve": get_reserve().status(),
+        "top_topics": [{"topic": t, "score": s, "reserved": get_reserve().count(t)} for t, s in ranked],
+        "last_pass": _last_pass,
+    }
@@ -0,0 +1,207 @@
+# app/srs.py
+# This module implements SM-2 spaced-repetition scheduling: a heap-based queue of due
+# cards across all decks and an append-only review log used to rebuild it.
+
+import heapq
+import os
+import threading
+import time
+
+DAY = 86400.0
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+
+
+class CardState:
+    """Scheduling state for a single card."""
+
+    __slots__ = ("card_id", "topic", "word", "filename", "due", "interval", "ease",
+                 "reps", "lapses", "last_review", "seq")
+
+    def __init__(self, card_id, topic, word, filename, due, seq):
+        self.card_id = card_id
+        self.topic = topic
+        self.word = word
+        self.filename = filename
+        self.due = due
+        self.interval = 0.0
+        self.ease = DEFAULT_EASE
+        self.reps = 0
+        self.lapses = 0
+        self.last_review = None
+        self.seq = seq
+
+    def to_dict(self) -> dict:
+        return {
+            "card_id": self.card_id,
+            "topic": self.topic,
+            "word": self.word,
+            "filename": self.filename,
+            "due": self.due,
+            "interval_days": self.interval,
+            "ease": round(self.ease, 3),
+            "reps": self.reps,
+            "lapses": self.lapses,
+            "last_review": self.last_review,
+        }
+
+
+def sm2(interval: float, ease: float, reps: int, grade: int) -> tuple[float, float, int]:
+    """Apply one SM-2 step. Returns (interval_days, ease, reps)."""
+    if grade < 3:
+        return 1.0, max(MIN_EASE, ease - 0.2), 0
+    ease = max(MIN_EASE, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    reps += 1
+    if reps == 1:
+        interval = 1.0
+    elif reps == 2:
+        interval = 6.0
+    else:
+        interval = round(interval * ease, 2)
+    return interval, ease, reps
+
+
+class ReviewLog:
+    """Append-only review log, one tab-separated record per line:
+
+    ts, card_id, grade, elapsed_days, interval_days, ease
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, ts, card_id, grade, elapsed, interval, ease) -> None:
+        line = f"{ts:.3f}\t{card_id}\t{grade}\t{elapsed:.4f}\t{interval:.4f}\t{ease:.4f}\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def replay(self):
+        """Yield (ts, card_id, grade, elapsed, interval, ease) in log order."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 6:
+                    # tolerate a torn last line after a crash
+                    continue
+                yield (float(parts[0]), parts[1], int(parts[2]), float(parts[3]),
+                       float(parts[4]), float(parts[5]))
+
+
+class ReviewScheduler:
+    """Priority queue of cards ordered by due time.
+
+    Heaps hold (due, seq, card_id) entries; rescheduling pushes a new entry and
+    stale ones are dropped lazily when they reach the top, so both next-due
+    lookups and reviews are O(log n). One heap spans all decks and one heap per
+    topic serves filtered queries.
+    """
+
+    def __init__(self):
+        self._cards: dict[str, CardState] = {}
+        self._heaps: dict[str | None, list] = {None: []}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __contains__(self, card_id):
+        return card_id in self._cards
+
+    def get(self, card_id: str) -> CardState | None:
+        return self._cards.get(card_id)
+
+    def add_card(self, card_id, topic, word, filename, due=None) -> bool:
+        """Register a new card (due immediately by default). Returns False if known."""
+        with self._lock:
+            state = self._cards.get(card_id)
+            if state is not None:
+                state.filename = filename
+                return False
+            self._seq += 1
+            state = CardState(card_id, topic, word, filename, due or 0.0, self._seq)
+            self._cards[card_id] = state
+            self._push(state)
+            return True
+
+    def _push(self, state: CardState) -> None:
+        entry = (state.due, state.seq, state.card_id)
+        heapq.heappush(self._heaps[None], entry)
+        heapq.heappush(self._heaps.setdefault(state.topic, []), entry)
+
+    def _peek(self, heap: list) -> CardState | None:
+        while heap:
+            due, _, card_id = heap[0]
+            state = self._cards.get(card_id)
+            if state is not None and state.due == due:
+                return state
+            heapq.heappop(heap)
+        return None
+
+    def next_due(self, topic: str | None = None) -> CardState | None:
+        """Return the card with the earliest due time (optionally within a topic)."""
+        with self._lock:
+            heap = self._heaps.get(topic)
+            if heap is None:
+                return None
+            return self._peek(heap)
+
+    def apply(self, card_id, ts, grade, interval, ease) -> CardState | None:
+        """Set a card's schedule from an already computed review outcome."""
+        with self._lock:
+            return self._apply(card_id, ts, grade, interval, ease)
+
+    def _apply(self, card_id, ts, grade, interval, ease) -> CardState | None:
+        state = self._cards.get(card_id)
+        if state is None:
+            return None
+        if grade < 3:
+            state.reps = 0
+            state.lapses += 1
+        else:
+            state.reps += 1
+        state.interval = interval
+        state.ease = ease
+        state.last_review = ts
+        state.due = ts + interval * DAY
+        self._push(state)
+        self._maybe_compact()
+        return state
+
+    def review(self, card_id: str, grade: int, now: float | None = None, log: ReviewLog | None = None):
+        """Grade a card (0-5) and reschedule it with SM-2, appending the outcome to log if given.
+
+        Returns (state, elapsed_days) or (None, 0.0) for unknown cards.
+        """
+        now = time.time() if now is None else now
+        # one lock for the read and the update, so two grades of a card can't both start
+        # from the same reps/interval
+        with self._lock:
+            state = self._cards.get(card_id)
+            if state is None:
+                return None, 0.0
+            elapsed = (now - state.last_review) / DAY if state.last_review else 0.0
+            interval, ease, _ = sm2(state.interval, state.ease, state.reps, grade)
+            state = self._apply(card_id, now, grade, interval, ease)
+            # logged under the same lock, so replaying the log applies grades in the order
+            # the scheduler did
+            if log is not None:
+                log.append(now, card_id, grade, elapsed, interval, ease)
+            return state, elapsed
+
+    def _maybe_compact(self) -> None:
+        # Drop stale heap entries once they outnumber live cards
+        heap = self._heaps[None]
+        if len(heap) <= 2 * len(self._cards) + 1024:
+            return
+        self._heaps = {None: []}
+        for state in self._cards.values():
+            entry = (state.due, state.seq, state.card_id)
+            self._heaps[None].append(entry)
+            self._heaps.setdefault(state.topic, []).append(entry)
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
@@ -0,0 +1,127 @@
+# app/stages.py
+# This module provides the bounded executors that run each stage of the pipeline
+# (generation requests, LLM calls, TTS, disk I/O) so one slow stage can't starve the others.
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.config import (
+    DISK_QUEUE_SIZE,
+    DISK_WORKERS,
+    GENERATION_PARALLELISM,
+    GENERATION_QUEUE_SIZE,
+    GENERATION_WORKERS,
+    LLM_QUEUE_SIZE,
+    PREFETCH_QUEUE_SIZE,
+    PREFETCH_WORKERS,
+    TTS_PARALLELISM,
+    TTS_QUEUE_SIZE,
+)
+
+
+class StageOverloaded(Exception):
+    def __init__(self, stage: str, retry_after: float):
+        super().__init__(f"{stage} stage is overloaded")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class Stage:
+    """A thread pool with at most `workers` running and `queue_size` waiting tasks.
+
+    submit() never blocks: when every slot is taken it raises StageOverloaded
+    with a retry hint derived from the recent average task duration.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._avg_s = 0.0
+
+    def queued(self) -> int:
+        with self._lock:
+            return self._in_flight - self._running
+
+    def retry_after(self) -> float:
+        with self._lock:
+            queued = self._in_flight - self._running
+            return max(1.0, self._avg_s * (queued + 1) / self.workers)
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise StageOverloaded(self.name, self.retry_after())
+        with self._lock:
+            self._in_flight += 1
+        # carry the caller's context variables into the worker thread
+        ctx = contextvars.copy_context()
+        try:
+            future = self._pool.submit(self._run, ctx, fn, args, kwargs)
+        except Exception:
+            self._done(0.0, ran=False)
+            raise
+        # a task cancelled while still queued (e.g. its request went away) never reaches _run
+        future.add_done_callback(self._cancelled)
+        return future
+
+    def _cancelled(self, future) -> None:
+        if future.cancelled():
+            self._done(0.0, ran=False)
+
+    def _run(self, ctx, fn, args, kwargs):
+        with self._lock:
+            self._running += 1
+        start = time.perf_counter()
+        try:
+            return ctx.run(fn, *args, **kwargs)
+        finally:
+            self._done(time.perf_counter() - start)
+
+    def _done(self, elapsed: float, ran: bool = True) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if ran:
+                self._running -= 1
+                self._completed += 1
+                # exponentially weighted so the retry hint follows current conditions
+                self._avg_s = elapsed if self._completed == 1 else 0.8 * self._avg_s + 0.2 * elapsed
+        self._slots.release()
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) on this stage (raises StageOverloaded if full)."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "utilization": round(self._running / self.workers, 3),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_task_s": round(self._avg_s, 4),
+            }
+
+
+generation = Stage("generation", GENERATION_WORKERS, GENERATION_QUEUE_SIZE)
+llm = Stage("llm", GENERATION_PARALLELISM, LLM_QUEUE_SIZE)
+tts = Stage("tts", TTS_PARALLELISM, TTS_QUEUE_SIZE)
+disk = Stage("disk", DISK_WORKERS, DISK_QUEUE_SIZE)
+prefetch = Stage("prefetch", PREFETCH_WORKERS, PREFETCH_QUEUE_SIZE)
+
+
+def status() -> dict:
+    return {s.name: s.status() for s in (generation, llm, tts, disk, prefetch)}
@@ -0,0 +1,233 @@
+# app/stats.py
+# This module computes learning statistics (retention curve, due-load forecast, per-topic
+# difficulty) with NumPy over a columnar, memory-mappable snapshot of the review log.
+
+import io
+import json
+import os
+import numpy as np
+import pandas as pd
+from app.srs import DAY
+
+# One fixed-size record per review; the snapshot file is a flat array of these
+REVIEW_DTYPE = np.dtype(
+    [
+        ("ts", "<f8"),
+        ("card", "<i4"),
+        ("grade", "i1"),
+        ("elapsed", "<f4"),
+        ("interval", "<f4"),
+        ("ease", "<f4"),
+    ]
+)
+LOG_COLUMNS = ["ts", "card_id", "grade", "elapsed", "interval", "ease"]
+# Retention is bucketed by whole days since the previous review, capped here
+MAX_RETENTION_DAYS = 365
+
+
+class ReviewSnapshot:
+    """Columnar copy of the review log, kept in sync incrementally.
+
+    Files in snapshot_dir:
+    - reviews.bin: REVIEW_DTYPE records, opened with np.memmap
+    - cards.tsv: "card_id<TAB>topic" per line; line number is the card code
+    - meta.json: how much of the log and of the two files above is committed
+    """
+
+    def __init__(self, snapshot_dir: str):
+        self.dir = snapshot_dir
+        os.makedirs(snapshot_dir, exist_ok=True)
+        self.reviews_path = os.path.join(snapshot_dir, "reviews.bin")
+        self.cards_path = os.path.join(snapshot_dir, "cards.tsv")
+        self.meta_path = os.path.join(snapshot_dir, "meta.json")
+        self.meta = {"log_offset": 0, "rows": 0, "cards": 0}
+        self.card_ids: list[str] = []
+        self.card_topics: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta.update(json.load(f))
+        # Drop anything written after the last committed meta (e.g. a crash mid-sync)
+        size = self.meta["rows"] * REVIEW_DTYPE.itemsize
+        if os.path.exists(self.reviews_path) and os.path.getsize(self.reviews_path) != size:
+            with open(self.reviews_path, "r+b") as f:
+                f.truncate(size)
+        if os.path.exists(self.cards_path):
+            committed = 0
+            with open(self.cards_path, "r+b") as f:
+                for line in f:
+                    if len(self.card_ids) >= self.meta["cards"]:
+                        break
+                    card_id, _, topic = line.decode("utf-8").rstrip("\n").partition("\t")
+                    self._codes[card_id] = len(self.card_ids)
+                    self.card_ids.append(card_id)
+                    self.card_topics.append(topic)
+                    committed += len(line)
+                # later lines would shift the codes of the cards the next sync appends
+                if os.path.getsize(self.cards_path) != committed:
+                    f.truncate(committed)
+
+    def reviews(self) -> np.ndarray:
+        """Return every committed review as a read-only memory-mapped array."""
+        if self.meta["rows"] == 0:
+            return np.empty(0, dtype=REVIEW_DTYPE)
+        return np.memmap(self.reviews_path, dtype=REVIEW_DTYPE, mode="r", shape=(self.meta["rows"],))
+
+    def sync(self, log_path: str, topic_of=None) -> np.ndarray:
+        """Append log lines written since the last sync and return them as new rows.
+
+        topic_of(card_id) -> str names the topic of cards seen for the first time.
+        """
+        if not os.path.exists(log_path):
+            return np.empty(0, dtype=REVIEW_DTYPE)
+        with open(log_path, "rb") as f:
+            f.seek(self.meta["log_offset"])
+            chunk = f.read()
+        # Only consume complete lines; a partially written one is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return np.empty(0, dtype=REVIEW_DTYPE)
+        frame = pd.read_csv(
+            io.BytesIO(chunk[:end]),
+            sep="\t",
+            header=None,
+            names=LOG_COLUMNS,
+            dtype={"card_id": str},
+            on_bad_lines="skip",
+        ).dropna()
+
+        new_cards = []
+        for card_id in frame["card_id"].unique():
+            if card_id not in self._codes:
+                topic = (topic_of(card_id) if topic_of else None) or ""
+                self._codes[card_id] = len(self.card_ids)
+                self.card_ids.append(card_id)
+                self.card_topics.append(topic)
+                new_cards.append(f"{card_id}\t{topic}\n")
+
+        rows = np.empty(len(frame), dtype=REVIEW_DTYPE)
+        rows["ts"] = frame["ts"].to_numpy()
+        rows["card"] = frame["card_id"].map(self._codes).to_numpy()
+        rows["grade"] = frame["grade"].to_numpy()
+        rows["elapsed"] = frame["elapsed"].to_numpy()
+        rows["interval"] = frame["interval"].to_numpy()
+        rows["ease"] = frame["ease"].to_numpy()
+
+        with open(self.reviews_path, "ab") as f:
+            f.write(rows.tobytes())
+        if new_cards:
+            with open(self.cards_path, "a", encoding="utf-8") as f:
+                f.writelines(new_cards)
+        self.meta = {
+            "log_offset": self.meta["log_offset"] + end,
+            "rows": self.meta["rows"] + len(rows),
+            "cards": len(self.card_ids),
+        }
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.meta_path)
+        return rows
+
+
+class LearningStats:
+    """Running aggregates over review rows.
+
+    Every aggregate is a sum (or a "latest value" per card), so update() only has
+    to fold in new rows; reports are then derived from per-bucket and per-card
+    arrays without touching the review history again.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.ret_total = np.zeros(MAX_RETENTION_DAYS + 1, dtype=np.int64)
+        self.ret_recalled = np.zeros(MAX_RETENTION_DAYS + 1, dtype=np.int64)
+        self.card_reviews = np.zeros(0, dtype=np.int64)
+        self.card_lapses = np.zeros(0, dtype=np.int64)
+        self.card_grade_sum = np.zeros(0, dtype=np.float64)
+        self.card_due = np.zeros(0, dtype=np.float64)
+        self.card_ease = np.zeros(0, dtype=np.float64)
+
+    def _grow(self, n: int) -> None:
+        extra = n - len(self.card_reviews)
+        if extra <= 0:
+            return
+        for name in ("card_reviews", "card_lapses", "card_grade_sum", "card_due", "card_ease"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros(extra, dtype=arr.dtype)]))
+
+    def update(self, rows: np.ndarray) -> None:
+        if len(rows) == 0:
+            return
+        # Packed records make field views strided; copy the hot columns once
+        cards = np.ascontiguousarray(rows["card"], dtype=np.int64)
+        grades = np.ascontiguousarray(rows["grade"])
+        elapsed = np.ascontiguousarray(rows["elapsed"])
+        self._grow(int(cards.max()) + 1)
+        n = len(self.card_reviews)
+
+        repeat = elapsed > 0
+        buckets = np.minimum(elapsed[repeat].astype(np.int64), MAX_RETENTION_DAYS)
+        self.ret_total += np.bincount(buckets, minlength=MAX_RETENTION_DAYS + 1)
+        self.ret_recalled += np.bincount(
+            buckets, weights=grades[repeat] >= 3, minlength=MAX_RETENTION_DAYS + 1
+        ).astype(np.int64)
+
+        self.card_reviews += np.bincount(cards, minlength=n)
+        self.card_lapses += np.bincount(cards, weights=grades < 3, minlength=n).astype(np.int64)
+        self.card_grade_sum += np.bincount(cards, weights=grades, minlength=n)
+
+        # Rows are chronological, so the last occurrence of a card is its current schedule
+        last = np.full(n, -1, dtype=np.int64)
+        np.maximum.at(last, cards, np.arange(len(cards)))
+        seen = np.nonzero(last >= 0)[0]
+        last = last[seen]
+        self.card_due[seen] = rows["ts"][last] + rows["interval"][last].astype(np.float64) * DAY
+        self.card_ease[seen] = rows["ease"][last]
+        self.rows += len(rows)
+
+    def retention_curve(self) -> list[dict]:
+        days = np.nonzero(self.ret_total)[0]
+        rates = self.ret_recalled[days] / self.ret_total[days]
+        return [
+            {"days": int(d), "reviews": int(t), "retention": round(float(r), 4)}
+            for d, t, r in zip(days, self.ret_total[days], rates)
+        ]
+
+    def forecast(self, now: float, days: int = 30, mask: np.ndarray | None = None) -> list[int]:
+        """Number of reviewed cards falling due on each of the next `days` days (overdue count as today)."""
+        reviewed = self.card_reviews > 0
+        if mask is not None:
+            reviewed &= mask[: len(reviewed)]
+        offsets = np.floor((self.card_due[reviewed] - now) / DAY).astype(np.int64)
+        offsets = np.maximum(offsets, 0)
+        return np.bincount(offsets[offsets < days], minlength=days).tolist()
+
+    def topic_difficulty(self, card_topic: np.ndarray, topics: list[str]) -> list[dict]:
+        """Per-topic lapse rate, mean grade and mean ease, hardest first."""
+        k = len(topics)
+        codes = card_topic[: len(self.card_reviews)]
+        reviews = np.bincount(codes, weights=self.card_reviews, minlength=k)
+        lapses = np.bincount(codes, weights=self.card_lapses, minlength=k)
+        grade_sum = np.bincount(codes, weights=self.card_grade_sum, minlength=k)
+        reviewed = self.card_reviews > 0
+        cards = np.bincount(codes[reviewed], minlength=k)
+        ease_sum = np.bincount(codes[reviewed], weights=self.card_ease[reviewed], minlength=k)
+
+        out = []
+        for i in np.nonzero(reviews)[0]:
+            out.append(
+                {
+                    "topic": topics[i],
+                    "cards": int(cards[i]),
+                    "reviews": int(reviews[i]),
+                    "lapse_rate": round(float(lapses[i] / reviews[i]), 4),
+                    "mean_grade": round(float(grade_sum[i] / reviews[i]), 3),
+                    "mean_ease": round(float(ease_sum[i] / cards[i]), 3) if cards[i] else None,
+                }
+            )
+        out.sort(key=lambda t: t["lapse_rate"], reverse=True)
+        return out
@@ -0,0 +1,114 @@
+# app/storage.py
+# This module reads and writes deck and history files in either format: pretty-printed JSON
+# (the default) or compact gzip-compressed JSON. Files keep their .json names; readers tell
+# the formats apart by the gzip magic bytes.
+#
+#   python -m app.storage --to gzip|json [--data-dir saved_flashcards]
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from app import tracing
+from app.config import DATA_DIR, STORAGE_FORMAT
+
+GZIP_MAGIC = b"\x1f\x8b"
+FORMATS = ("json", "gzip")
+
+
+def is_compressed(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def load_json(path: str):
+    """Load a JSON document written in either format."""
+    with tracing.span("file.read", path=os.path.basename(path)):
+        if is_compressed(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _dump(data, path: str, fmt: str) -> None:
+    if fmt == "gzip":
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            # mtime=0 keeps the output byte-identical for identical data
+            f.write(gzip.compress(payload, compresslevel=6, mtime=0))
+        os.replace(tmp, path)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def dump_json(data, path: str, fmt: str | None = None) -> None:
+    """Write data to path in fmt (default: STORAGE_FORMAT)."""
+    fmt = fmt or STORAGE_FORMAT
+    with tracing.span("file.write", path=os.path.basename(path), format=fmt):
+        try:
+            _dump(data, path, fmt)
+        except FileNotFoundError:
+            # the first deck of a shard (see app.paths): its directory is created on demand
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            _dump(data, path, fmt)
+
+
+def dump_json_atomic(data, path: str, fmt: str | None = None) -> None:
+    """dump_json via a temporary file renamed over path, so readers never see a partial file."""
+    tmp = path + ".write"
+    dump_json(data, tmp, fmt)
+    os.replace(tmp, path)
+
+
+def convert(data_dir: str, fmt: str) -> dict:
+    """Rewrite every deck (in either layout) and history file in data_dir to fmt."""
+    # imported here: app.paths builds on this module
+    from app.paths import shard_dirs
+
+    report = {"converted": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0}
+    files = [
+        (name, os.path.join(directory, name))
+        for directory in [data_dir] + shard_dirs(data_dir)
+        for name in sorted(os.listdir(directory))
+    ]
+    for name, path in files:
+        if not name.endswith(".json") or not os.path.isfile(path):
+            continue
+        before = os.path.getsize(path)
+        report["bytes_before"] += before
+        if is_compressed(path) == (fmt == "gzip"):
+            report["skipped"] += 1
+            report["bytes_after"] += before
+            continue
+        try:
+            data = load_json(path)
+        except (OSError, ValueError) as e:
+            print(f"[storage] skipping {name}: {e}", file=sys.stderr)
+            report["skipped"] += 1
+            report["bytes_after"] += before
+            continue
+        dump_json_atomic(data, path, fmt)
+        report["converted"] += 1
+        report["bytes_after"] += os.path.getsize(path)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Convert saved decks and history between storage formats.")
+    parser.add_argument("--to", choices=FORMATS, required=True)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+    report = convert(args.data_dir, args.to)
+    print(
+        f"[storage] converted {report['converted']} files ({report['skipped']} unchanged): "
+        f"{report['bytes_before']} -> {report['bytes_after']} bytes"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# app/sync.py
+# This module keeps the change feed clients sync from: every card written to a deck is appended
+# to app_state/changes.jsonl with a monotonically increasing revision, so a client that has seen
+# revision N only needs the entries after N.
+#
+# The first line names the feed ({"feed": "<id>"}); a client whose cached feed id differs (the
+# feed was rebuilt) starts over from revision 0. Every other line is one change:
+#   {"rev": 42, "op": "upsert", "topic": "food", "id": "<card id>", "card": {...}}
+
+import json
+import os
+import threading
+import uuid
+from bisect import bisect_right
+from app.flashcard_utils import make_card_id
+
+
+class ChangeFeed:
+    """Append-only, revisioned log of card changes, held in memory for `since` queries."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.feed_id = None
+        self.rev = 0
+        self._entries = []
+        self._revs = []
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        with self._lock:
+            entries = []
+            feed_id = None
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            # tolerate a torn last line after a crash
+                            continue
+                        if "feed" in entry:
+                            feed_id = entry["feed"]
+                        elif "rev" in entry:
+                            entries.append(entry)
+            if feed_id is None:
+                feed_id = uuid.uuid4().hex
+                entries = []
+                with open(self.path, "w", encoding="utf-8") as f:
+                    f.write(json.dumps({"feed": feed_id}) + "\n")
+            self.feed_id = feed_id
+            self._entries = entries
+            self._revs = [e["rev"] for e in entries]
+            self.rev = self._revs[-1] if entries else 0
+        if len(self._entries) > 1000 and len(self._entries) > 2 * len({e["id"] for e in self._entries}):
+            self.compact()
+
+    def record(self, topic: str, cards: list[dict], op: str = "upsert") -> int:
+        """Append one change per card and return the new head revision."""
+        with self._lock:
+            lines = []
+            for card in cards:
+                self.rev += 1
+                entry = {
+                    "rev": self.rev,
+                    "op": op,
+                    "topic": topic,
+                    "id": card.get("card_id") or make_card_id(topic, str(card.get("word", ""))),
+                    "card": card,
+                }
+                self._entries.append(entry)
+                self._revs.append(self.rev)
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+            if lines:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+            return self.rev
+
+    def since(self, rev: int, limit: int) -> tuple[list[dict], bool, int]:
+        """Changes after rev (oldest first, at most limit), whether more follow, and the head
+        revision they were read at."""
+        with self._lock:
+            start = bisect_right(self._revs, rev)
+            chunk = self._entries[start : start + limit]
+            return chunk, start + limit < len(self._entries), self.rev
+
+    def compact(self) -> None:
+        """Drop entries superseded by a later change to the same card.
+
+        Revisions are kept, so a client's `since` stays valid: it still gets the
+        latest version of every card changed after it, just not the history.
+        """
+        with self._lock:
+            latest = {}
+            for entry in self._entries:
+                latest[entry["id"]] = entry
+            entries = sorted(latest.values(), key=lambda e: e["rev"])
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"feed": self.feed_id}) + "\n")
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+            self._entries = entries
+            self._revs = [e["rev"] for e in entries]
@@ -0,0 +1,189 @@
+# app/tracing.py
+# This module records request-scoped traces: one span per route, plus nested spans for each
+# Mistral attempt, parse, TTS word and deck file read or write made while serving it.
+#
+# The current span lives in a context variable, so spans opened in stage workers (which run in
+# a copy of the caller's context, see app.stages) nest under the request that queued them.
+# Outside a request span() is a no-op. Finished traces go to a rotating JSON-lines file and a
+# small in-memory window served by GET /debug/traces.
+
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from app.config import TRACE_FILE, TRACE_MAX_BYTES, TRACE_BACKUPS, TRACE_RECENT, TRACING_ENABLED
+
+_TRACEPARENT_RE = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_TRACE_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# (trace, span id) of the innermost open span
+_current: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+
+
+class Trace:
+    """The spans of one request; spans may be added from several threads."""
+
+    def __init__(self, trace_id: str, parent_id: str | None = None):
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span: dict) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ms"])
+        root = next((s for s in spans if s["parent_id"] is None), {})
+        return {
+            "trace_id": self.trace_id,
+            "parent_id": self.parent_id,
+            "name": root.get("name"),
+            "start": round(self.start, 3),
+            "duration_ms": root.get("duration_ms", 0.0),
+            "error": any(s.get("error") for s in spans) or root.get("attrs", {}).get("status", 0) >= 500,
+            "attrs": root.get("attrs", {}),
+            "spans": spans,
+        }
+
+
+class TraceLog:
+    """Append-only JSON-lines file of finished traces, rotated at max_bytes into path.1..path.N."""
+
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write(self, trace: dict) -> None:
+        line = json.dumps(trace, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                if self.max_bytes and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    self._rotate()
+            except FileNotFoundError:
+                pass
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class TraceRecorder:
+    """Keeps the last `recent` finished traces in memory and logs each to a TraceLog."""
+
+    def __init__(self, log: TraceLog | None, recent: int):
+        self.log = log
+        self._recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    def finish(self, trace: Trace) -> dict:
+        data = trace.to_dict()
+        with self._lock:
+            self._recent.append(data)
+        if self.log is not None:
+            try:
+                self.log.write(data)
+            except OSError as e:
+                print(f"[tracing] could not write trace {trace.trace_id}: {e}")
+        return data
+
+    def slowest(self, limit: int, min_ms: float = 0.0) -> list[dict]:
+        """Summaries of the slowest recent traces, slowest first."""
+        with self._lock:
+            traces = [t for t in self._recent if t["duration_ms"] >= min_ms]
+        traces.sort(key=lambda t: t["duration_ms"], reverse=True)
+        return [{k: v for k, v in t.items() if k != "spans"} | {"spans": len(t["spans"])} for t in traces[:limit]]
+
+    def get(self, trace_id: str) -> dict | None:
+        with self._lock:
+            # a client may reuse its trace id; the newest trace wins
+            return next((t for t in reversed(self._recent) if t["trace_id"] == trace_id), None)
+
+
+recorder = TraceRecorder(TraceLog(TRACE_FILE, TRACE_MAX_BYTES, TRACE_BACKUPS), TRACE_RECENT)
+
+
+def incoming_ids(headers) -> tuple[str, str | None]:
+    """(trace id, parent span id) from a W3C traceparent or X-Trace-Id header, else a new id."""
+    m = _TRACEPARENT_RE.match(headers.get("traceparent", "").strip().lower())
+    if m and m.group(1) != "0" * 32:
+        return m.group(1), m.group(2)
+    trace_id = headers.get("x-trace-id", "").strip()
+    if _TRACE_ID_RE.match(trace_id):
+        return trace_id, None
+    return uuid.uuid4().hex, None
+
+
+def current_trace_id() -> str | None:
+    current = _current.get()
+    return current[0].trace_id if current else None
+
+
+def _new_span_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the enclosed block as a child of the current span (no-op outside a trace).
+
+    Yields the span's attribute dict so the block can add results to it.
+    """
+    current = _current.get()
+    if current is None:
+        yield attrs
+        return
+    trace, parent = current
+    span_id = _new_span_id()
+    token = _current.set((trace, span_id))
+    start = time.perf_counter()
+    record = {"span_id": span_id, "parent_id": parent, "name": name, "attrs": attrs}
+    try:
+        yield attrs
+    except BaseException as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        record["start_ms"] = round(1000 * (start - trace._t0), 3)
+        record["duration_ms"] = round(1000 * (time.perf_counter() - start), 3)
+        record["thread"] = threading.current_thread().name
+        trace.add(record)
+
+
+@contextmanager
+def trace_request(name: str, trace_id: str, parent_id: str | None = None, **attrs):
+    """Open a trace whose root span is name; it is recorded when the block exits.
+
+    Yields the root span's attribute dict. With tracing disabled nothing is recorded.
+    """
+    if not TRACING_ENABLED:
+        yield attrs
+        return
+    trace = Trace(trace_id, parent_id)
+    token = _current.set((trace, None))
+    try:
+        with span(name, **attrs) as root:
+            yield root
+    finally:
+        _current.reset(token)
+        recorder.finish(trace)
@@ -1,9 +1,89 @@
 # app/tts.py
-# This module provides text-to-speech functionality using gTTS, including file management and reuse
+# This module provides text-to-speech functionality, including file management and reuse.
+# Synthesis itself goes through the configured backend chain in app.tts_backends.
 
-from gtts import gTTS
+from app import paths, tracing
+from app.tts_backends import get_chain
 import os
 import random
+import threading
+
+from app.paths import AUDIO_EXTENSIONS  # noqa: F401 (re-exported)
+
+
+class AudioIndex:
+    """Map of lowercased word -> existing audio path in one audio directory.
+
+    A word is looked up in its shard directory and then in the flat root (see
+    app.paths). Each directory is listed once and rescanned only when its mtime
+    changes (a file was added or removed by someone else), so lookups neither
+    list the whole library nor list a directory per word.
+    """
+
+    def __init__(self, audio_dir: str):
+        self.audio_dir = audio_dir
+        # directory -> (mtime_ns, {word prefix: path})
+        self._dirs: dict[str, tuple[int, dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _scan(self, directory: str) -> dict[str, str]:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            self._dirs.pop(directory, None)
+            return {}
+        cached = self._dirs.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        found = {}
+        # sorted, so "x_1234.mp3" wins over the player's converted "x_1234.wav"
+        for fname in sorted(os.listdir(directory)):
+            if not fname.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            # filenames are "<word_lower>_<random>.<ext>"; the word is the prefix before the first '_'
+            prefix = os.path.splitext(fname)[0].split("_", 1)[0].lower()
+            found.setdefault(prefix, os.path.join(directory, fname))
+        self._dirs[directory] = (mtime, found)
+        return found
+
+    def lookup(self, word: str) -> str | None:
+        label = (word or "").lower().strip()
+        with self._lock:
+            for directory in paths.audio_lookup_dirs(self.audio_dir, label):
+                found = self._scan(directory)
+                path = found.get(label)
+                if path is None:
+                    continue
+                if os.path.exists(path):
+                    return path
+                # removed since the last scan without the directory mtime moving on
+                del found[label]
+            return None
+
+    def add(self, word: str, path: str) -> None:
+        with self._lock:
+            cached = self._dirs.get(os.path.dirname(path))
+            if cached is not None:
+                cached[1][(word or "").lower().strip()] = path
+
+    def __len__(self):
+        with self._lock:
+            words = set()
+            for directory in [self.audio_dir] + paths.shard_dirs(self.audio_dir):
+                words.update(self._scan(directory))
+            return len(words)
+
+
+_indexes: dict[str, AudioIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_audio_index(audio_dir: str) -> AudioIndex:
+    with _indexes_lock:
+        index = _indexes.get(audio_dir)
+        if index is None:
+            index = _indexes[audio_dir] = AudioIndex(audio_dir)
+        return index
 
 
 def generate_tts(word: str, audio_dir: str) -> str:
@@ -11,35 +91,30 @@ def generate_tts(word: str, audio_dir: str) -> str:
 
     Reuse an existing file when any file in audio_dir has the same prefix
     before the first '_' (case-insensitive). Filenames keep the original
-    pattern: "<word_lower>_<random>.mp3".
+    pattern: "<word_lower>_<random>.<ext>", the extension depending on the
+    backend that produced it (.mp3 for gTTS, .wav for espeak).
     """
-    os.makedirs(audio_dir, exist_ok=True)
-    orig_label = (word or "").lower().strip()
+    with tracing.span("generate_tts", word=word) as attrs:
+        os.makedirs(audio_dir, exist_ok=True)
+        orig_label = (word or "").lower().strip()
 
-    # Look for existing file whose prefix before first '_' matches the word
-    try:
-        for fname in os.listdir(audio_dir):
-            if not fname.lower().endswith(".mp3"):
-                continue
-            name_no_ext = os.path.splitext(fname)[0]
-            prefix = name_no_ext.split("_", 1)[0]
-            if prefix.lower() == orig_label:
-                return os.path.join(audio_dir, fname)
-    except FileNotFoundError:
-        pass
-
-    # No existing file — create a new one with the original naming scheme
-    filename = f"{orig_label}_{random.randint(1000, 9999)}.mp3"
-    filepath = os.path.join(audio_dir, filename)
-    try:
-        tts = gTTS(text=word, lang="ko")
-        tts.save(filepath)
+        # Look for an existing file whose prefix before first '_' matches the word
+        index = get_audio_index(audio_dir)
+        existing = index.lookup(orig_label)
+        if existing:
+            # refresh mtime so audio_gc's grace period covers a reused, not yet referenced file
+            try:
+                os.utime(existing)
+            except OSError:
+                pass
+            attrs["reused"] = True
+            return existing
+
+        # No existing file — create a new one with the original naming scheme
+        target_dir = paths.audio_dir_for(audio_dir, orig_label)
+        os.makedirs(target_dir, exist_ok=True)
+        base = os.path.join(target_dir, f"{orig_label}_{random.randint(1000, 9999)}")
+        filepath = get_chain().synthesize(word, lambda ext: base + ext)
+        index.add(orig_label, filepath)
+        attrs["reused"] = False
         return filepath
-    except Exception:
-        # cleanup partial file if created
-        try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-        except Exception:
-            pass
-        raise
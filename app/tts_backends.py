@@ -0,0 +1,148 @@
+# app/tts_backends.py
+# This module defines the text-to-speech backends (gTTS, local espeak-ng, a deterministic fake)
+# and the registry/fallback chain app.tts uses to pick one.
+
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+from app import metrics
+from app.circuit_breaker import CircuitBreaker, CircuitOpen
+from app.config import TTS_BACKEND_FAILURES, TTS_BACKEND_PROBE_INTERVAL, TTS_BACKENDS, TTS_LANG
+
+
+class TTSBackend:
+    """Turns text into an audio file. Subclasses set name/extension and implement synthesize()."""
+
+    name = ""
+    extension = ".mp3"
+
+    def available(self) -> bool:
+        return True
+
+    def synthesize(self, text: str, path: str, lang: str) -> None:
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS (network round-trip per word)."""
+
+    name = "gtts"
+    extension = ".mp3"
+
+    def synthesize(self, text, path, lang):
+        from gtts import gTTS
+
+        gTTS(text=text, lang=lang).save(path)
+
+
+class EspeakBackend(TTSBackend):
+    """Local, offline espeak-ng (or espeak) run as a subprocess; writes WAV."""
+
+    name = "espeak"
+    extension = ".wav"
+
+    def __init__(self):
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self):
+        return self.binary is not None
+
+    def synthesize(self, text, path, lang):
+        subprocess.run(
+            [self.binary, "-v", lang, "-w", path, text],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=30,
+        )
+
+
+class FakeBackend(TTSBackend):
+    """Deterministic stand-in for tests: the file content depends only on the text."""
+
+    name = "fake"
+    extension = ".mp3"
+
+    def synthesize(self, text, path, lang):
+        with open(path, "wb") as f:
+            f.write(b"FAKE" + hashlib.sha1(f"{lang}:{text}".encode("utf-8")).digest())
+
+
+_registry: dict[str, type] = {}
+
+
+def register_backend(cls: type) -> type:
+    _registry[cls.name] = cls
+    return cls
+
+
+for _cls in (GTTSBackend, EspeakBackend, FakeBackend):
+    register_backend(_cls)
+
+
+class TTSChain:
+    """Tries backends in order until one succeeds.
+
+    Each backend sits behind its own circuit breaker, so a backend that keeps
+    failing (e.g. gTTS without network) is skipped immediately instead of
+    costing a timeout per word until its next probe.
+    """
+
+    def __init__(self, names: list[str], lang: str = TTS_LANG):
+        self.lang = lang
+        self.backends = []
+        for name in names:
+            cls = _registry.get(name)
+            if cls is None:
+                print(f"[tts] unknown backend {name!r} ignored")
+                continue
+            backend = cls()
+            if backend.available():
+                breaker = CircuitBreaker(f"tts.{name}", TTS_BACKEND_FAILURES, TTS_BACKEND_PROBE_INTERVAL)
+                self.backends.append((backend, breaker))
+        if not self.backends:
+            raise RuntimeError(f"no usable TTS backend in {names}")
+
+    def synthesize(self, text: str, path_for) -> str:
+        """Synthesize text with the first working backend.
+
+        path_for(extension) returns the output path for that backend's format.
+        Returns the written path; raises the last error if every backend fails.
+        """
+        error = None
+        for backend, breaker in self.backends:
+            path = path_for(backend.extension)
+            start = time.perf_counter()
+            try:
+                breaker.call(backend.synthesize, text, path, self.lang)
+            except CircuitOpen as e:
+                error = error or e
+                continue
+            except Exception as e:
+                metrics.incr(f"tts.{backend.name}.failures")
+                error = e
+                # cleanup partial file if created
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except OSError:
+                    pass
+                continue
+            metrics.observe(f"tts.{backend.name}", time.perf_counter() - start)
+            return path
+        raise error
+
+    def status(self) -> dict:
+        return {backend.name: breaker.status() for backend, breaker in self.backends}
+
+
+_chain = None
+
+
+def get_chain() -> TTSChain:
+    global _chain
+    if _chain is None:
+        _chain = TTSChain([n.strip() for n in TTS_BACKENDS.split(",") if n.strip()])
+    return _chain
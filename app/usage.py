@@ -0,0 +1,214 @@
+# app/usage.py
+# This module records LLM token usage per call, topic and client in a local JSON-lines
+# ledger, and enforces per-client and global token-per-minute budgets.
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+
+class UsageLedger:
+    """Append-only ledger of LLM calls with running totals per topic and client.
+
+    Totals are loaded from the file on first read and then kept up to date in
+    memory, so summaries never re-scan the ledger.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._totals = None
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_s": 0.0}
+
+    def _add(self, entry: dict) -> None:
+        for key, name in (("by_topic", entry.get("topic")), ("by_client", entry.get("client"))):
+            bucket = self._totals[key].setdefault(name or "unknown", self._empty())
+            bucket["calls"] += 1
+            bucket["prompt_tokens"] += entry.get("prompt_tokens", 0)
+            bucket["completion_tokens"] += entry.get("completion_tokens", 0)
+            bucket["latency_s"] += entry.get("latency_s", 0.0)
+
+    def record(self, topic, client, prompt_tokens, completion_tokens, latency_s, ts=None) -> dict:
+        entry = {
+            "ts": round(time.time() if ts is None else ts, 3),
+            "topic": topic,
+            "client": client,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency_s": round(latency_s, 4),
+        }
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            if self._totals is not None:
+                self._add(entry)
+        return entry
+
+    def summary(self) -> dict:
+        with self._lock:
+            if self._totals is None:
+                self._totals = {"by_topic": {}, "by_client": {}}
+                if os.path.exists(self.path):
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            try:
+                                self._add(json.loads(line))
+                            except json.JSONDecodeError:
+                                continue
+            out = {}
+            for key, buckets in self._totals.items():
+                out[key] = {
+                    name: dict(
+                        b,
+                        total_tokens=b["prompt_tokens"] + b["completion_tokens"],
+                        avg_latency_s=round(b["latency_s"] / b["calls"], 4) if b["calls"] else 0.0,
+                        latency_s=round(b["latency_s"], 4),
+                    )
+                    for name, b in buckets.items()
+                }
+            return out
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"{scope} token budget exceeded")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class _Window:
+    """Token spend over a sliding window: [ts, tokens] entries, oldest first."""
+
+    def __init__(self):
+        self.entries = deque()
+        self.used = 0
+
+    def expire(self, now: float, window: float) -> None:
+        while self.entries and self.entries[0][0] <= now - window:
+            self.used -= self.entries.popleft()[1]
+
+    def retry_after(self, needed: int, now: float, window: float) -> float:
+        """Seconds until `needed` tokens have expired out of the window."""
+        freed = 0
+        for ts, tokens in self.entries:
+            freed += tokens
+            if freed >= needed:
+                return max(ts + window - now, 0.0)
+        return window
+
+
+class AdmissionController:
+    """Token-per-minute budgets per client and globally.
+
+    admit() reserves an estimate up front so bursts of concurrent requests can't
+    all slip under the budget; settle() replaces the estimate with the actual
+    usage once the request is done. A budget of 0 disables that check.
+
+    Client ids come from the caller, so at most max_clients windows are kept:
+    windows are dropped once their entries have expired, and while the table is
+    full, new ids (and "unknown") are charged to one shared SHARED_CLIENT window
+    instead of getting a fresh budget each.
+    """
+
+    SHARED_CLIENT = "*"
+
+    def __init__(self, global_tpm: int, client_tpm: int, window: float = 60.0, max_clients: int = 1000):
+        self.global_tpm = global_tpm
+        self.client_tpm = client_tpm
+        self.window = window
+        self.max_clients = max_clients
+        self._global = _Window()
+        self._clients: dict[str, _Window] = {}
+        self._lock = threading.Lock()
+
+    def _expire_clients(self, now: float) -> None:
+        for cid in list(self._clients):
+            win = self._clients[cid]
+            win.expire(now, self.window)
+            if not win.entries:
+                del self._clients[cid]
+
+    def _client_window(self, client_id: str, now: float) -> tuple[str, _Window]:
+        if client_id == "unknown":
+            client_id = self.SHARED_CLIENT
+        if client_id not in self._clients and len(self._clients) >= self.max_clients:
+            self._expire_clients(now)
+            if len(self._clients) >= self.max_clients:
+                client_id = self.SHARED_CLIENT
+        return client_id, self._clients.setdefault(client_id, _Window())
+
+    def _check(self, scope, win: _Window, limit: int, estimate: int, now: float) -> None:
+        if not limit or not win.entries:
+            # an empty window always admits, even a request larger than the budget
+            return
+        over = win.used + estimate - limit
+        if over > 0:
+            raise BudgetExceeded(scope, win.retry_after(over, now, self.window))
+
+    def admit(self, client_id: str, estimate: int, now: float | None = None) -> list:
+        """Reserve estimate tokens for client_id or raise BudgetExceeded."""
+        now = time.time() if now is None else now
+        with self._lock:
+            client_id, client = self._client_window(client_id, now)
+            self._global.expire(now, self.window)
+            client.expire(now, self.window)
+            try:
+                self._check("client", client, self.client_tpm, estimate, now)
+                self._check("global", self._global, self.global_tpm, estimate, now)
+            except BudgetExceeded:
+                if not client.entries:
+                    # rejected with nothing reserved: don't keep a window for it
+                    self._clients.pop(client_id, None)
+                raise
+            reservation = [now, estimate]
+            client.entries.append(reservation)
+            client.used += estimate
+            # both windows share the same entry object so settle() updates them together
+            self._global.entries.append(reservation)
+            self._global.used += estimate
+            return [client_id, reservation]
+
+    def settle(self, handle: list, actual: int, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        client_id, reservation = handle
+        with self._lock:
+            client = self._clients.get(client_id)
+            # expire first: an entry past the window but not yet popped still counts in used,
+            # and popping it later subtracts whatever reservation[1] holds by then
+            self._global.expire(now, self.window)
+            if client is not None:
+                client.expire(now, self.window)
+                if not client.entries:
+                    del self._clients[client_id]
+            if reservation[0] <= now - self.window:
+                # popped out of both windows with the estimate; nothing left to adjust
+                return
+            delta = actual - reservation[1]
+            reservation[1] = actual
+            if client is not None:
+                client.used += delta
+            self._global.used += delta
+
+    def status(self, now: float | None = None) -> dict:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._global.expire(now, self.window)
+            self._expire_clients(now)
+            return {
+                "window_s": self.window,
+                "global": {"used": self._global.used, "limit": self.global_tpm},
+                "clients": {
+                    cid: {"used": win.used, "limit": self.client_tpm}
+                    for cid, win in self._clients.items()
+                },
+            }
+
+
+def retry_after_header(seconds: float) -> dict:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
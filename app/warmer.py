@@ -0,0 +1,188 @@
+# app/warmer.py
+# This module holds the pieces of the warm catalog: a decaying request counter per topic, the
+# ranking of topics worth pre-generating (request counts plus history.json), and the reserve of
+# ready cards (audio already synthesized) that POST /flashcards serves before calling the LLM.
+# The background pass that fills the reserve is in app.services.warmer_service.
+
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, time as dtime
+from app.storage import dump_json_atomic, load_json
+
+
+def _decay(age_s: float, half_life_s: float) -> float:
+    return 0.5 ** (max(age_s, 0.0) / half_life_s) if half_life_s > 0 else 1.0
+
+
+class DemandCounter:
+    """Requests per topic, each one worth 1 today and half that a half-life later.
+
+    A topic keeps one (score, at) pair, decayed lazily when it is hit or read, so
+    hits are O(1) however long the history. save() writes the scores atomically
+    when they changed.
+    """
+
+    def __init__(self, path: str, half_life_s: float):
+        self.path = path
+        self.half_life_s = half_life_s
+        self._scores = {}  # topic -> [score, at]
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        scores = {}
+        if os.path.exists(self.path):
+            try:
+                data = load_json(self.path)
+                scores = {t: [float(s), float(at)] for t, (s, at) in data.items()}
+            except (OSError, ValueError, TypeError) as e:
+                print(f"[warmer] ignoring unreadable demand file: {e}")
+        with self._lock:
+            self._scores = scores
+
+    def hit(self, topic: str, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._scores.get(topic)
+            score = entry[0] * _decay(now - entry[1], self.half_life_s) if entry else 0.0
+            self._scores[topic] = [score + 1.0, now]
+            self._dirty = True
+
+    def scores(self, now: float | None = None) -> dict[str, float]:
+        now = time.time() if now is None else now
+        with self._lock:
+            return {t: s * _decay(now - at, self.half_life_s) for t, (s, at) in self._scores.items()}
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {t: [round(s, 4), at] for t, (s, at) in self._scores.items()}
+            self._dirty = False
+        dump_json_atomic(data, self.path, "json")
+
+
+def rank_topics(demand: dict[str, float], history: dict, half_life_s: float, limit: int, now: float | None = None):
+    """The limit topics most likely to be requested next, as [(topic, score)], best first.
+
+    Counted requests score as they are; a topic in history.json also scores as one
+    request made when it was last generated into, so topics the counter has not
+    seen yet (e.g. after a restart with no demand file) are still predicted.
+    """
+    now = time.time() if now is None else now
+    scores = dict(demand)
+    for topic, entry in history.items():
+        try:
+            at = datetime.fromisoformat(entry["updated_at"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            continue
+        scores[topic] = scores.get(topic, 0.0) + _decay(now - at, half_life_s)
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [(t, round(s, 4)) for t, s in ranked[:limit] if s > 0]
+
+
+def in_window(window: str, at: dtime) -> bool:
+    """Whether at falls inside "HH:MM-HH:MM" (may wrap past midnight); empty means always."""
+    if not window:
+        return True
+    start, end = (dtime.fromisoformat(part.strip()) for part in window.split("-", 1))
+    if start <= end:
+        return start <= at < end
+    return at >= start or at < end
+
+
+class Reserve:
+    """Pre-generated cards per topic, waiting to be served.
+
+    Every topic's cards live in memory and in one file of directory, rewritten
+    atomically on each change, so a topic with nothing reserved costs a dict
+    lookup on the request path.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._cards = {}  # topic -> [card, ...]
+        self._lock = threading.Lock()
+
+    def _path(self, topic: str) -> str:
+        # topics are free text; the file is named by a hash and records the topic inside
+        return os.path.join(self.directory, hashlib.sha1(topic.encode("utf-8")).hexdigest()[:16] + ".json")
+
+    def load(self) -> None:
+        cards = {}
+        for name, data in iter_reserve_files(self.directory):
+            if isinstance(data, dict) and isinstance(data.get("cards"), list) and data["cards"]:
+                cards[data["topic"]] = data["cards"]
+        with self._lock:
+            self._cards = cards
+
+    def _write(self, topic: str) -> None:
+        path = self._path(topic)
+        cards = self._cards.get(topic)
+        if not cards:
+            self._cards.pop(topic, None)
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        dump_json_atomic({"topic": topic, "cards": cards}, path, "json")
+
+    def count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._cards.get(topic, ()))
+
+    def cards(self, topic: str) -> list[dict]:
+        with self._lock:
+            return list(self._cards.get(topic, ()))
+
+    def add(self, topic: str, cards: list[dict]) -> None:
+        if not cards:
+            return
+        with self._lock:
+            self._cards.setdefault(topic, []).extend(cards)
+            self._write(topic)
+
+    def put_back(self, topic: str, cards: list[dict]) -> None:
+        """Return cards taken by a request that failed, ahead of the rest of the reserve."""
+        if not cards:
+            return
+        with self._lock:
+            self._cards[topic] = list(cards) + self._cards.get(topic, [])
+            self._write(topic)
+
+    def take(self, topic: str, n: int, select=None) -> list[dict]:
+        """Remove and return up to n cards of topic.
+
+        select(cards) -> cards still worth serving; the ones it drops (e.g. words
+        the deck got from a live generation since) are discarded.
+        """
+        with self._lock:
+            pool = self._cards.get(topic)
+            if not pool or n <= 0:
+                return []
+            if select is not None:
+                pool = select(pool)
+            taken, self._cards[topic] = pool[:n], pool[n:]
+            self._write(topic)
+            return taken
+
+    def status(self) -> dict:
+        with self._lock:
+            return {"topics": len(self._cards), "cards": sum(len(c) for c in self._cards.values())}
+
+
+def iter_reserve_files(directory: str):
+    """Yield (file name, contents) for every reserve file in directory."""
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            yield name, load_json(os.path.join(directory, name))
+        except (OSError, ValueError) as e:
+            print(f"[warmer] skipping unreadable reserve file {name}: {e}")
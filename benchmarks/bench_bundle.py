@@ -0,0 +1,63 @@
+# benchmarks/bench_bundle.py
+# Benchmark opening a card library from a packed bundle against loading every deck file.
+#
+# Usage: python -m benchmarks.bench_bundle [--cards 100000]
+
+import argparse
+import os
+import random
+import tempfile
+import tracemalloc
+from app.bundle import build
+from app.flashcard_utils import iter_topic_files
+from app.storage import dump_json, load_json
+from benchmarks.bench_search import fake_card
+from benchmarks.bench_storage import best_of
+from gui.utils.bundle import Bundle
+
+
+def load_decks(data_dir: str) -> list:
+    return [card for _, path in iter_topic_files(data_dir) for card in load_json(path)]
+
+
+def open_and_show(path: str) -> None:
+    # what the GUI does for a bundle: open it and decode the first topic's first card
+    with Bundle(path) as bundle:
+        bundle.view(next(iter(bundle.topics)))[0]
+
+
+def peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    decks = {}
+    for i in range(args.cards):
+        card = fake_card(rng, i)
+        decks.setdefault(card.pop("topic"), []).append(card)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for topic, cards in decks.items():
+            dump_json(cards, os.path.join(tmp, f"{topic}_20240101000000.json"))
+        bundle_path = os.path.join(tmp, "library.fcb")
+        build_s = best_of(lambda: build(tmp, bundle_path), 1)
+
+        print(f"{args.cards} cards in {len(decks)} decks; bundle built in {build_s:.2f} s")
+        json_s = best_of(lambda: load_decks(tmp), args.repeat)
+        bundle_s = best_of(lambda: open_and_show(bundle_path), args.repeat)
+        print(f"  json decks  load all        {json_s * 1000:8.1f} ms  peak {peak_kib(lambda: load_decks(tmp)):9.0f} KiB")
+        print(f"  bundle      open + 1 card   {bundle_s * 1000:8.1f} ms  peak {peak_kib(lambda: open_and_show(bundle_path)):9.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_gui_startup.py
+# Benchmark GUI time-to-first-frame and time-to-first-card, each run in a fresh interpreter so
+# imports are cold. Needs a display; without one it re-runs itself under xvfb-run (as CI does
+# for the GUI tests).
+#
+# Usage: python -m benchmarks.bench_gui_startup [--cards 100000] [--runs 5]
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from app.bundle import build
+from app.storage import dump_json
+from benchmarks.bench_search import fake_card
+
+# imports the GUI should not pay for before its first frame
+DEFERRED = ("requests", "simpleaudio", "tkinter.messagebox", "gui.audio.player")
+
+
+def child(path: str) -> None:
+    start = time.perf_counter()
+    import tkinter as tk
+    from gui.ui.app import FlashcardUI
+
+    root = tk.Tk()
+    ui = FlashcardUI(root)
+    root.update()
+    first_frame = time.perf_counter() - start
+    loaded = [m for m in DEFERRED if m in sys.modules]
+
+    ui.load_file(path)
+    root.update()
+    first_card = time.perf_counter() - start
+    assert ui.word_var.get(), "no card shown"
+    root.destroy()
+    print(json.dumps({"first_frame": first_frame, "first_card": first_card, "loaded": loaded}))
+
+
+def run_child(path: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_gui_startup", "--child", path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    # the GUI prints debug lines; the measurement is the last line
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return 0
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        if shutil.which("xvfb-run") and not os.environ.get("BENCH_UNDER_XVFB"):
+            env = dict(os.environ, BENCH_UNDER_XVFB="1")
+            cmd = ["xvfb-run", "-a", sys.executable, "-m", "benchmarks.bench_gui_startup", *sys.argv[1:]]
+            return subprocess.call(cmd, env=env)
+        print("no display and no xvfb-run; cannot start Tk", file=sys.stderr)
+        return 1
+
+    rng = random.Random(0)
+    decks = {}
+    for i in range(args.cards):
+        card = fake_card(rng, i)
+        decks.setdefault(card.pop("topic"), []).append(card)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        deck_path = os.path.join(tmp, "all_20240101000000.json")
+        dump_json([c for cards in decks.values() for c in cards], deck_path)
+        data_dir = os.path.join(tmp, "decks")
+        os.makedirs(data_dir)
+        for topic, cards in decks.items():
+            dump_json(cards, os.path.join(data_dir, f"{topic}_20240101000000.json"))
+        bundle_path = os.path.join(tmp, "library.fcb")
+        build(data_dir, bundle_path)
+
+        print(f"{args.cards} cards, median of {args.runs} cold starts")
+        for label, path in (("json deck", deck_path), ("bundle", bundle_path)):
+            runs = [run_child(path) for _ in range(args.runs)]
+            frame = statistics.median(r["first_frame"] for r in runs)
+            card = statistics.median(r["first_card"] for r in runs)
+            print(
+                f"  {label:9s}  first frame {frame * 1000:7.1f} ms  first card {card * 1000:8.1f} ms  "
+                f"loaded before first frame: {', '.join(runs[0]['loaded']) or 'none'}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# benchmarks/bench_paths.py
+# Benchmark deck lookup, audio lookup and listing in the flat and the sharded layout.
+#
+# Usage: python -m benchmarks.bench_paths [--files 500000] [--lookups 200]
+#
+# --files empty files are created per layout (split evenly between decks and audio), so
+# expect a few GB of inodes in the temp directory and a minute or two of setup.
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from app import paths
+from app.tts import AudioIndex
+from benchmarks.bench_storage import best_of
+
+
+def populate(root: str, layout: str, decks: int, audio: int) -> tuple[list[str], list[str]]:
+    data_dir, audio_dir = os.path.join(root, "decks"), os.path.join(root, "audio")
+    topics, words = [f"topic{i}" for i in range(decks)], [f"word{i}" for i in range(audio)]
+    for topic in topics:
+        path = paths.deck_path(data_dir, f"{topic}_20240101000000.json", layout=layout)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+    for word in words:
+        directory = paths.audio_dir_for(audio_dir, word, layout=layout)
+        os.makedirs(directory, exist_ok=True)
+        open(os.path.join(directory, f"{word}_1234.mp3"), "w").close()
+    return topics, words
+
+
+def flat_get_topic_file(topic: str, data_dir: str):
+    # the lookup the flat layout used before app.paths: list the whole directory
+    for f in os.listdir(data_dir):
+        if f.startswith(topic + "_") and f.endswith(".json"):
+            return os.path.join(data_dir, f)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=500_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    decks, audio = args.files // 2, args.files - args.files // 2
+    print(f"{decks} decks + {audio} audio files per layout, {args.lookups} lookups")
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in ("flat", "sharded"):
+            root = os.path.join(tmp, layout)
+            start = time.perf_counter()
+            topics, words = populate(root, layout, decks, audio)
+            setup_s = time.perf_counter() - start
+            data_dir, audio_dir = os.path.join(root, "decks"), os.path.join(root, "audio")
+            sample_topics = rng.sample(topics, min(args.lookups, len(topics)))
+            sample_words = rng.sample(words, min(args.lookups, len(words)))
+
+            find = paths.find_topic_deck if layout == "sharded" else (lambda t, d: flat_get_topic_file(t, d))
+            deck_s = best_of(lambda: [find(t, data_dir) for t in sample_topics], args.repeat)
+            list_s = best_of(lambda: sum(1 for _ in paths.iter_decks(data_dir)), args.repeat)
+
+            # a cold index per run: the first lookup in a directory lists it, later ones hit the cache
+            cold_s = best_of(lambda: [AudioIndex(audio_dir).lookup(w) for w in sample_words[:20]], args.repeat)
+            index = AudioIndex(audio_dir)
+            warm_s = best_of(lambda: [index.lookup(w) for w in sample_words], args.repeat)
+            print(
+                f"  {layout:7s} setup {setup_s:6.1f} s  deck lookup {deck_s * 1000 / len(sample_topics):8.3f} ms  "
+                f"list decks {list_s * 1000:8.1f} ms  audio lookup cold {cold_s * 1000 / 20:8.3f} ms  "
+                f"warm {warm_s * 1000 / len(sample_words):6.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_quiz.py
+# Benchmark the distractor index: build time, the cost of adding one card to a large library,
+# and quiz latency per question.
+#
+# Usage: python -m benchmarks.bench_quiz [--cards 200000] [--quizzes 200]
+
+import argparse
+import random
+import time
+from app.quiz import DistractorIndex, build_quiz
+from benchmarks.bench_search import fake_card
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=200_000)
+    parser.add_argument("--quizzes", type=int, default=200)
+    parser.add_argument("--n", type=int, default=10, help="questions per quiz")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cards = [fake_card(rng, i) for i in range(args.cards + 1000)]
+    index = DistractorIndex()
+    t0 = time.perf_counter()
+    for card in cards[: args.cards]:
+        index.add(card["topic"], [card])
+    build_s = time.perf_counter() - t0
+    print(f"indexed {args.cards:,} cards in {build_s:.2f}s ({build_s / args.cards * 1e6:.1f} µs per card)")
+
+    # incremental: cards saved into the full library, as a generation does
+    t0 = time.perf_counter()
+    for card in cards[args.cards :]:
+        index.add(card["topic"], [card])
+    print(f"add to the full library: {(time.perf_counter() - t0) * 1e6 / 1000:.1f} µs per card")
+
+    topics = index.topics()
+    for kind in ("mixed", "meaning", "synonym", "matching"):
+        questions = 0
+        t0 = time.perf_counter()
+        for i in range(args.quizzes):
+            quiz = build_quiz(index, rng.choice(topics), args.n, kind, seed=i)
+            questions += len(quiz["questions"]) if kind != "matching" else 1
+        elapsed = time.perf_counter() - t0
+        print(
+            f"  {kind:8s} {elapsed * 1000 / args.quizzes:7.3f} ms per quiz, "
+            f"{elapsed * 1000 / max(questions, 1):6.3f} ms per question"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_search.py
+# Benchmark index build and query latency of the flashcard search index.
+#
+# Usage: python -m benchmarks.bench_search [--cards 200000]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from app.search_index import SearchIndex
+
+SYLLABLES = [chr(0xAC00 + i) for i in range(0, 11172, 37)]
+ENGLISH = "greeting food travel school weather family money time friend house water study".split()
+
+
+def fake_card(rng: random.Random, i: int) -> dict:
+    word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return {
+        "card_id": f"c{i}",
+        "topic": f"topic{i % 300}",
+        "word": word,
+        "definition": " ".join(rng.choice(ENGLISH) for _ in range(4)),
+        "example": " ".join(
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(5)
+        ),
+        "synonyms": ["".join(rng.choice(SYLLABLES) for _ in range(2)) for _ in range(2)],
+        "antonyms": ["".join(rng.choice(SYLLABLES) for _ in range(2)) for _ in range(2)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cards = [fake_card(rng, i) for i in range(args.cards)]
+    index = SearchIndex()
+    t0 = time.perf_counter()
+    index.add(cards, persist=False)
+    print(f"indexed {args.cards:,} cards in {time.perf_counter() - t0:.2f}s ({len(index._postings):,} tokens)")
+
+    queries = [c["word"][:2] for c in rng.sample(cards, args.queries // 2)]
+    queries += ["ㄱㄴ", "food", "trav", "ㅎ"] * (args.queries // 8)
+    t0 = time.perf_counter()
+    for q in queries:
+        index.search(q, limit=20)
+    per_query = (time.perf_counter() - t0) / len(queries)
+    print(f"mean query latency over {len(queries)} queries: {per_query * 1000:.2f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index.journal_path = os.path.join(tmp, "search_index.jsonl")
+        open(index.journal_path, "w").close()
+        t0 = time.perf_counter()
+        index.save_snapshot()
+        print(f"snapshot written in {time.perf_counter() - t0:.2f}s")
+        t0 = time.perf_counter()
+        reloaded = SearchIndex(index.journal_path)
+        reloaded.load()
+        print(f"reloaded {len(reloaded):,} cards from snapshot in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_stats.py
+# Benchmark /stats computation over a synthetic review snapshot.
+#
+# Usage: python -m benchmarks.bench_stats [--rows 10000000] [--cards 200000]
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from app.stats import REVIEW_DTYPE, LearningStats, ReviewSnapshot
+
+
+def make_snapshot(path: str, rows: int, cards: int, topics: int) -> None:
+    rng = np.random.default_rng(0)
+    snap = ReviewSnapshot(path)
+    data = np.empty(rows, dtype=REVIEW_DTYPE)
+    data["ts"] = np.sort(rng.uniform(1.6e9, 1.7e9, rows))
+    data["card"] = rng.integers(0, cards, rows)
+    data["grade"] = rng.integers(0, 6, rows)
+    data["elapsed"] = rng.exponential(10.0, rows)
+    data["interval"] = rng.exponential(12.0, rows)
+    data["ease"] = rng.uniform(1.3, 3.0, rows)
+    data.tofile(snap.reviews_path)
+    with open(snap.cards_path, "w", encoding="utf-8") as f:
+        for i in range(cards):
+            f.write(f"card{i}\ttopic{i % topics}\n")
+    snap.meta = {"log_offset": 0, "rows": rows, "cards": cards}
+    import json
+    with open(snap.meta_path, "w", encoding="utf-8") as f:
+        json.dump(snap.meta, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--cards", type=int, default=200_000)
+    parser.add_argument("--topics", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        make_snapshot(tmp, args.rows, args.cards, args.topics)
+        print(f"generated {args.rows:,} rows in {time.perf_counter() - t0:.2f}s")
+
+        t0 = time.perf_counter()
+        snap = ReviewSnapshot(tmp)
+        stats = LearningStats()
+        stats.update(snap.reviews())
+        t_load = time.perf_counter() - t0
+
+        topics = sorted(set(snap.card_topics))
+        codes = {t: i for i, t in enumerate(topics)}
+        card_topic = np.array([codes[t] for t in snap.card_topics])
+        t0 = time.perf_counter()
+        stats.retention_curve()
+        stats.forecast(1.7e9, 30)
+        stats.topic_difficulty(card_topic, topics)
+        t_report = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        stats.update(snap.reviews()[-1000:])
+        t_incr = time.perf_counter() - t0
+
+        print(f"cold aggregate over {args.rows:,} rows: {t_load * 1000:.0f} ms")
+        print(f"report (retention + forecast + difficulty): {t_report * 1000:.1f} ms")
+        print(f"incremental update with 1,000 new rows: {t_incr * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
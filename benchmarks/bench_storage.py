@@ -0,0 +1,51 @@
+# benchmarks/bench_storage.py
+# Benchmark bytes on disk and load/save time of a deck in each storage format.
+#
+# Usage: python -m benchmarks.bench_storage [--cards 10000]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from app.storage import FORMATS, dump_json, load_json
+from benchmarks.bench_search import fake_card
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    deck = []
+    for i in range(args.cards):
+        card = fake_card(rng, i)
+        card["tts_path"] = f"tts_audio/{card['word']}_{rng.randint(1000, 9999)}.mp3"
+        deck.append({k: v for k, v in card.items() if k not in ("card_id", "topic")})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.cards} cards")
+        for fmt in FORMATS:
+            path = os.path.join(tmp, f"deck_{fmt}.json")
+            save_s = best_of(lambda: dump_json(deck, path, fmt), args.repeat)
+            load_s = best_of(lambda: load_json(path), args.repeat)
+            assert load_json(path) == deck
+            print(
+                f"  {fmt:5s} {os.path.getsize(path) / 1024:8.1f} KiB  "
+                f"save {save_s * 1000:7.1f} ms  load {load_s * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,21 @@
 # to generate flashcards and fetch saved flashcards.
 
 import os
-import requests
 import json
+from ..utils.helpers import list_saved_files
+
+# requests is imported inside the functions that call the backend: it is slow to import and
+# the GUI shouldn't pay for it before its first frame
 
 API_BASE = os.environ.get("MISTRAL_API_URL", "http://localhost:8000")
 
 
 def fetch_saved_flashcards():
     """
-    Return a list of filenames found in gui/../saved_flashcards (JSON files).
-    Non-blocking and safe if the folder doesn't exist.
+    Return the files found in gui/../saved_flashcards (JSON decks and .fcb bundles), relative
+    to that folder.
+    Non-blocking and safe if the folder doesn't exist. Only works when the GUI runs next to the
+    server; the GUI lists synced topics (fetch_changes) first and uses this as a fallback.
     """
     folder = os.path.normpath(
         os.path.join(os.path.dirname(__file__), "..", "..", "saved_flashcards")
@@ -20,8 +25,7 @@ def fetch_saved_flashcards():
     try:
         if not os.path.isdir(folder):
             return []
-        files = [f for f in os.listdir(folder) if f.lower().endswith(".json")]
-        return sorted(files)
+        return list_saved_files(folder)
     except Exception:
         return []
 
@@ -53,16 +57,40 @@ def _find_cards(obj):
     return None
 
 
-def generate_flashcards(topic):
+def _extract_cards(data):
+    """Return the list of cards in a generation response, or None if there is none."""
+    # Direct list => good
+    if isinstance(data, list):
+        return data
+
+    # If dict, try common keys then recursive search
+    if isinstance(data, dict):
+        for key in ("cards", "flashcards", "items", "results", "data"):
+            if key in data and isinstance(data[key], list):
+                return data[key]
+        found = _find_cards(data)
+        if found:
+            return found
+        # single-card dict => wrap
+        if any(k in data for k in ("word", "front", "term", "definition", "def")):
+            return [data]
+    return None
+
+
+def generate_flashcards(topic, count=None):
     """
-    Request flashcards from backend POST /flashcards.
+    Request flashcards from backend POST /flashcards (optionally `count` new cards).
     Returns list[dict] or [] on failure. Tries to extract nested lists if response is a dict.
     """
     if not topic:
         return []
 
+    import requests
+
     url = f"{API_BASE}/flashcards"
     payload = {"topic": topic}
+    if count:
+        payload["count"] = count
     try:
         print(f"[gui.api.client] POST {url} payload={payload}")
         resp = requests.post(url, json=payload, timeout=20)
@@ -77,25 +105,94 @@ def generate_flashcards(topic):
         except Exception:
             print("[gui.api.client] response non-serializable, type:", type(data))
 
-        # Direct list => good
-        if isinstance(data, list):
-            return data
-
-        # If dict, try common keys then recursive search
-        if isinstance(data, dict):
-            for key in ("cards", "flashcards", "items", "results", "data"):
-                if key in data and isinstance(data[key], list):
-                    return data[key]
-            found = _find_cards(data)
-            if found:
-                return found
-            # single-card dict => wrap
-            if any(k in data for k in ("word", "front", "term", "definition", "def")):
-                return [data]
-
+        cards = _extract_cards(data)
+        if cards is not None:
+            return cards
         print(f"[gui.api.client] unexpected response shape: {type(data)}")
     except requests.HTTPError as e:
         print("[gui.api.client] HTTP error:", e)
     except Exception as e:
         print("[gui.api.client] request failed:", e)
     return []
+
+
+def prefetch_flashcards(topic, count):
+    """
+    Ask the backend for `count` more cards on its low-priority path (POST /flashcards/prefetch).
+    Returns list[dict], or [] when the backend is busy (503) or the request fails.
+    """
+    if not topic:
+        return []
+
+    import requests
+
+    url = f"{API_BASE}/flashcards/prefetch"
+    try:
+        resp = requests.post(url, json={"topic": topic, "count": count}, timeout=120)
+        if resp.status_code in (429, 503):
+            print(f"[gui.api.client] prefetch deferred by backend ({resp.status_code})")
+            return []
+        resp.raise_for_status()
+        return _extract_cards(resp.json()) or []
+    except Exception as e:
+        print("[gui.api.client] prefetch failed:", e)
+    return []
+
+
+def fetch_changes(since=0, feed=None):
+    """
+    Fetch card changes after revision `since` of feed `feed` (GET /sync); a different feed
+    on the server answers with a full copy marked reset.
+    Returns the delta dict ({feed, rev, more, reset, changes}) or None when the backend is unreachable.
+    """
+    import requests
+
+    url = f"{API_BASE}/sync"
+    try:
+        params = {"since": since}
+        if feed:
+            params["feed"] = feed
+        resp = requests.get(url, params=params, timeout=20)
+        resp.raise_for_status()
+        return resp.json()
+    except Exception as e:
+        print("[gui.api.client] sync failed:", e)
+    return None
+
+
+def fetch_next_review(topic=None):
+    """
+    Ask the backend scheduler for the next due card (GET /review/next).
+    Returns (card, card_id) or (None, None) on failure / empty queue.
+    """
+    import requests
+
+    url = f"{API_BASE}/review/next"
+    params = {"topic": topic} if topic else None
+    try:
+        resp = requests.get(url, params=params, timeout=10)
+        resp.raise_for_status()
+        data = resp.json()
+        card = data.get("card")
+        if not card:
+            return None, None
+        return card, data.get("schedule", {}).get("card_id")
+    except Exception as e:
+        print("[gui.api.client] review fetch failed:", e)
+    return None, None
+
+
+def submit_review(card_id, grade):
+    """Record a 0-5 grade for card_id (POST /review/{card_id}). Returns True on success."""
+    if not card_id:
+        return False
+    import requests
+
+    url = f"{API_BASE}/review/{card_id}"
+    try:
+        resp = requests.post(url, json={"grade": grade}, timeout=10)
+        resp.raise_for_status()
+        return True
+    except Exception as e:
+        print("[gui.api.client] review submit failed:", e)
+    return False
@@ -21,6 +21,26 @@ def convert_mp3_to_wav(mp3_path, wav_path):
         messagebox.showerror("Error", f"Failed to convert audio: {e}")
         return False
 
+def predecode(mp3_path):
+    """Create the .wav that play_audio plays for mp3_path ahead of time, so the first play
+    doesn't wait for ffmpeg. Quiet on failure (it runs off the Tk thread, where dialogs are
+    not allowed); returns the .wav path, or None."""
+    if not mp3_path or not mp3_path.endswith(".mp3") or not os.path.exists(mp3_path):
+        return None
+    wav_path = mp3_path.replace(".mp3", ".wav")
+    if os.path.exists(wav_path):
+        return wav_path
+    try:
+        subprocess.run(
+            ["ffmpeg", "-y", "-i", mp3_path, wav_path],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return wav_path
+
 def play_audio(mp3_path):
     """Convert MP3 to WAV and play the audio."""
     if not os.path.exists(mp3_path):
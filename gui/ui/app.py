@@ -3,13 +3,30 @@
 
 import os
 import json
+import queue
+import re
+import threading
+import time
 import tkinter as tk
-from tkinter import messagebox
 
-import requests
+# requests, tkinter.messagebox and the audio player (simpleaudio) are imported where they are
+# first needed, so none of them delays the first frame
 from . import layout
 from . import widgets
-from datetime import datetime
+from ..utils.bundle import Bundle, BundleView
+from ..utils.helpers import list_saved_files, load_json
+from ..utils.sync_cache import SyncCache
+
+# how often the Tk thread checks whether background work has finished
+BACKGROUND_POLL_MS = 50
+# read-ahead: when at most PREFETCH_AHEAD cards of the topic are left, ask the backend for
+# PREFETCH_COUNT more; after a prefetch that brought nothing, wait PREFETCH_BACKOFF_S
+PREFETCH_AHEAD = int(os.environ.get("GUI_PREFETCH_AHEAD", "3"))
+PREFETCH_COUNT = int(os.environ.get("GUI_PREFETCH_COUNT", "10"))
+PREFETCH_BACKOFF_S = 30.0
+# how often the local card cache pulls changes from the backend (GET /sync)
+SYNC_INTERVAL_MS = int(os.environ.get("GUI_SYNC_INTERVAL_MS", "30000"))
+
 
 class FlashcardUI:
     def __init__(self, root):
@@ -17,6 +34,22 @@ class FlashcardUI:
         self.flashcards = []
         self.current_topic = None
         self.card_index = None
+        # open deck bundle (see app/bundle.py); load_topic looks topics up here first
+        self.bundle = None
+        # local copy of the backend's cards (see gui/utils/sync_cache.py), kept current by the
+        # periodic sync; created here so concurrent background pulls share one cache.
+        # _synced_topic is the topic currently shown from it
+        self.sync_cache = SyncCache(self._sync_cache_path())
+        self._synced_topic = None
+        # resolved player entry points: None until _resolve_player has run, then a list of
+        # (label, kind, fn) tried in order by on_speak
+        self._speakers = None
+        # topic a read-ahead request is running for, and when the next may start
+        self._prefetching = None
+        self._prefetch_after = 0.0
+        # card id of the card shown in review mode (None outside review mode)
+        self.review_card_id = None
+        self._review_card = None
 
         # suppress handling of listbox selection events when we change selection programmatically
         self._suppress_listbox_select = False
@@ -28,6 +61,7 @@ class FlashcardUI:
             new_word_cb=self.on_new_word,
             speak_cb=self.on_speak,
             export_anki_cb=self.export_to_anki,  # to be set later if needed
+            grade_cb=self.on_grade,
         )
         self.word_var = ui["word_var"]
         self.def_var = ui["def_var"]
@@ -38,19 +72,56 @@ class FlashcardUI:
         self.speak_button = ui["speak_button"]
         self.cards_listbox = ui.get("cards_listbox")
         self.saved_listbox = ui.get("listbox")  # list of saved files UI from layout
+        self.review_var = ui.get("review_var")
 
         # bind selection on cards listbox to show that card
         if self.cards_listbox:
             self.cards_listbox.bind("<<ListboxSelect>>", lambda e: self._on_card_select(e))
 
-        # ensure saved files list is up-to-date on startup
+        # fill the saved files list and load the audio player off the Tk thread, so the window
+        # draws before any disk I/O or heavy import happens
         self._refresh_saved_files()
+        self._run_in_background(self._resolve_player, self._set_speakers)
+        self.root.after(SYNC_INTERVAL_MS, self._periodic_sync)
 
         print("[FlashcardUI] initialized")
 
+    def _run_in_background(self, fn, on_done):
+        """Run fn on a worker thread and pass its result to on_done on the Tk thread.
+
+        Tk widgets may only be touched from the thread running the mainloop, so the
+        worker hands its result over through a queue the Tk thread polls.
+        """
+        result = queue.Queue(maxsize=1)
+
+        def work():
+            try:
+                value = fn()
+            except Exception as e:
+                print(f"[FlashcardUI] background {getattr(fn, '__name__', fn)} failed:", e)
+                value = None
+            result.put(value)
+
+        def poll():
+            try:
+                value = result.get_nowait()
+            except queue.Empty:
+                self.root.after(BACKGROUND_POLL_MS, poll)
+                return
+            on_done(value)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(BACKGROUND_POLL_MS, poll)
+
     def _flashcards_path(self):
         return os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "flashcards.json"))
 
+    def _sync_cache_path(self):
+        return os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "sync_cache.json"))
+
+    def _saved_dir(self):
+        return os.path.normpath(os.path.join(os.path.dirname(__file__), "../../saved_flashcards"))
+
     def _populate_cards_listbox(self, cards):
         """Populate cards listbox with titles from cards (safe no-op if no listbox)."""
         if not getattr(self, "cards_listbox", None):
@@ -59,8 +130,14 @@ class FlashcardUI:
         # prevent selection events from firing while we populate/select
         self._suppress_listbox_select = True
         lb.delete(0, tk.END)
-        for i, c in enumerate(cards):
-            title = c.get("word") or c.get("front") or c.get("term") or f"Card {i+1}"
+        if hasattr(cards, "titles"):
+            # bundle view: read only the words instead of decoding every card
+            titles = (t or f"Card {i+1}" for i, t in enumerate(cards.titles()))
+        else:
+            titles = (
+                c.get("word") or c.get("front") or c.get("term") or f"Card {i+1}" for i, c in enumerate(cards)
+            )
+        for title in titles:
             lb.insert(tk.END, title)
         # select first item
         if cards:
@@ -98,23 +175,47 @@ class FlashcardUI:
         self.card_index = idx
         card = None
         # Build the ordered list consistent with advance_topic_index/_current_card
-        all_cards = self.flashcards or []
-        if any("topic" in c for c in all_cards):
-            topic_cards = [c for c in all_cards if c.get("topic") == self.current_topic]
-        else:
-            topic_cards = all_cards
+        topic_cards = widgets.topic_cards(self.flashcards, self.current_topic)
         if 0 <= idx < len(topic_cards):
             card = topic_cards[idx]
         if card:
             self._update_display(card)
 
     def _refresh_saved_files(self):
-        """Refresh the saved-files listbox from disk (safe no-op if no listbox)."""
+        """Refresh the saved-files listbox from disk in the background (safe no-op if no listbox)."""
         print("[FlashcardUI] saved_listbox:", getattr(self, "saved_listbox", None))
         if not getattr(self, "saved_listbox", None):
             print("[FlashcardUI] no saved_listbox to refresh, RETURNING...")
             return
+        self._run_in_background(self._list_saved_files, self._show_saved_files)
 
+    def _periodic_sync(self):
+        self._refresh_saved_files()
+        self.root.after(SYNC_INTERVAL_MS, self._periodic_sync)
+
+    def _pull_changes(self):
+        """Worker thread: bring the local cache up to date; returns the changed topics."""
+        from ..api.client import fetch_changes
+
+        changed = self.sync_cache.pull(fetch_changes)
+        if changed:
+            self.sync_cache.save()
+        return changed or set()
+
+    def _list_saved_files(self):
+        """Worker thread: sync, then list the synced topics plus the local deck bundles (the
+        sync feed has cards, not files). Without a reachable backend (or before the first
+        sync) fall back to the deck files next to gui/."""
+        changed = self._pull_changes()
+        topics = self.sync_cache.topics()
+        if topics:
+            bundles = []
+            try:
+                if os.path.isdir(self._saved_dir()):
+                    bundles = [f for f in list_saved_files(self._saved_dir()) if f.lower().endswith(".fcb")]
+            except Exception as e:
+                print("[FlashcardUI] _refresh_saved_files bundle scan failed:", e)
+            return topics + bundles, changed
         files = []
         # Try API helper first (may list files from other places / remote)
         try:
@@ -127,21 +228,33 @@ class FlashcardUI:
         # Fallback: scan local saved_flashcards dir next to gui/
         if not files:
             try:
-                saved_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../saved_flashcards"))
+                saved_dir = self._saved_dir()
                 if os.path.isdir(saved_dir):
-                    files = sorted([f for f in os.listdir(saved_dir) if f.lower().endswith(".json")])
+                    files = list_saved_files(saved_dir)
             except Exception as e:
                 print("[FlashcardUI] _refresh_saved_files fallback scan failed:", e)
                 files = []
+        return files, changed
 
+    def _show_saved_files(self, result):
+        files, changed = result or ([], set())
         lb = self.saved_listbox
         try:
             lb.delete(0, tk.END)
-            for fn in files:
+            for fn in files or []:
                 lb.insert(tk.END, fn)
         except Exception as e:
             print("[FlashcardUI] error populating saved_listbox:", e)
             return
+        # the topic on screen came from the cache and just changed: show the new cards too
+        topic = self._synced_topic
+        if topic is not None and topic == self.current_topic and topic in changed:
+            index = self.card_index
+            self.flashcards = self.sync_cache.cards_for(topic)
+            self._populate_cards_listbox(self.flashcards)
+            if index is not None and index < len(self.flashcards) and self.cards_listbox:
+                self.cards_listbox.selection_clear(0, tk.END)
+                self.cards_listbox.selection_set(index)
 
     def load_topic(self, topic_name):
         """Load cards for topic_name from local JSON and show first card."""
@@ -150,14 +263,23 @@ class FlashcardUI:
         if not topic_name:
             print("[FlashcardUI] empty topic, nothing to load")
             return
+        if self.bundle is not None and topic_name in self.bundle.topics:
+            self._show_bundle_topic(topic_name)
+            return
+        # the backend stores topics lowercased with underscores
+        synced = re.sub(r"\s+", "_", topic_name.lower())
+        cached = self.sync_cache.cards_for(synced)
+        if cached:
+            self._show_topic(synced, cached)
+            self._synced_topic = synced
+            return
         path = self._flashcards_path()
         data = []
         # honor os.path.exists so tests can patch it and avoid touching disk
         try:
             if os.path.exists(path):
                 try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = load_json(path)
                 except Exception as e:
                     print("[FlashcardUI] failed to read flashcards.json:", e)
                     # Some tests patch `json.load` to return fake data but don't
@@ -198,26 +320,8 @@ class FlashcardUI:
                 self.flashcards = generated + (self.flashcards or [])
                 topic_cards = [c for c in self.flashcards if c.get("topic") == topic_name]
 
-                # persist generated cards locally so "Saved files" shows them
-                try:
-                    saved_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../saved_flashcards"))
-                    os.makedirs(saved_dir, exist_ok=True)
-                    ts = datetime.now().strftime("%Y%m%d%H%M%S")
-                    save_name = f"{topic_name}_{ts}.json"
-                    save_path = os.path.join(saved_dir, save_name)
-                    with open(save_path, "w", encoding="utf-8") as sf:
-                        json.dump(generated, sf, ensure_ascii=False, indent=2)
-                except Exception as e:
-                    print("[FlashcardUI] failed to save generated cards locally:", e)
-
-                # refresh saved-files view in case backend saved generated cards or we just wrote one
-                try:
-                    print("[FlashcardUI] refreshing saved files list after generation")
-                    self._refresh_saved_files()
-                except Exception:
-                    pass
-
-        # Ensure saved-files list is refreshed after a successful load (local or generated)
+        # Ensure saved-files list is refreshed after a successful load (local or generated); after
+        # a generation the backend saved the deck, and this sync brings it into the local cache
         try:
             self._refresh_saved_files()
         except Exception:
@@ -245,10 +349,17 @@ class FlashcardUI:
         print(f"[FlashcardUI] load_file called with: '{filename}'")
         if not filename:
             return
-        path = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../saved_flashcards", filename))
+        cached = self.sync_cache.cards_for(filename)
+        if cached:
+            self._show_topic(filename, cached)
+            self._synced_topic = filename
+            return
+        path = os.path.join(self._saved_dir(), filename)
+        if filename.lower().endswith(".fcb"):
+            self._open_bundle(path)
+            return
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = load_json(path)
         except Exception as e:
             print("[FlashcardUI] failed to load file:", e)
             return
@@ -257,10 +368,7 @@ class FlashcardUI:
             print("[FlashcardUI] loaded file contains no flashcards")
             return
         # compute cards for current selection (for topic-less lists treat all as cards)
-        if any("topic" in c for c in self.flashcards):
-            topic_cards = [c for c in self.flashcards if c.get("topic") == self.current_topic]
-        else:
-            topic_cards = self.flashcards
+        topic_cards = widgets.topic_cards(self.flashcards, self.current_topic)
         # populate and select first
         self._populate_cards_listbox(topic_cards)
         self.card_index = 0
@@ -275,9 +383,71 @@ class FlashcardUI:
         except Exception:
             pass
 
+    def _open_bundle(self, path):
+        """Map a deck bundle and show its first topic; cards are decoded only when shown."""
+        try:
+            bundle = Bundle(path)
+        except (OSError, ValueError) as e:
+            print("[FlashcardUI] failed to open bundle:", e)
+            return
+        if self.bundle is not None:
+            self.bundle.close()
+        self.bundle = bundle
+        print(f"[FlashcardUI] opened bundle with {len(bundle)} cards in {len(bundle.topics)} topics")
+        if bundle.topics:
+            self._show_bundle_topic(next(iter(bundle.topics)))
+
+    def _show_bundle_topic(self, topic_name):
+        cards = self.bundle.view(topic_name)
+        print(f"[FlashcardUI] found {len(cards)} cards for topic '{topic_name}' in bundle")
+        self._show_topic(topic_name, cards)
+
+    def _show_topic(self, topic_name, cards):
+        """Make cards (one topic's) the loaded deck and show the first."""
+        self.flashcards = cards
+        self.current_topic = topic_name
+        self._synced_topic = None
+        self._populate_cards_listbox(cards)
+        if not cards:
+            self.card_index = None
+            self._clear_display()
+            return
+        self.card_index = 0
+        self._update_display(cards[0])
+        self.new_word_button.config(state=tk.NORMAL)
+        self.speak_button.config(state=tk.NORMAL)
+
+    def _review_enabled(self):
+        return bool(self.review_var is not None and self.review_var.get())
+
+    def _show_next_review(self):
+        """Show the next due card from the backend scheduler. Returns True if one was shown."""
+        from ..api.client import fetch_next_review
+        card, card_id = fetch_next_review(self.current_topic)
+        if card is None:
+            print("[FlashcardUI] review queue is empty")
+            return False
+        self.review_card_id = card_id
+        self._review_card = card
+        self._update_display(card)
+        self.speak_button.config(state=tk.NORMAL)
+        return True
+
+    def on_grade(self, grade):
+        """Record a grade for the card shown in review mode and move to the next due card."""
+        if not self.review_card_id:
+            print("[FlashcardUI] no review card to grade")
+            return
+        from ..api.client import submit_review
+        submit_review(self.review_card_id, grade)
+        self.review_card_id = None
+        self._show_next_review()
+
     def on_new_word(self):
         """Advance to next card in current topic (or through the whole list if cards lack 'topic')."""
         print(f"[FlashcardUI] on_new_word called (current_topic={self.current_topic}, index={self.card_index})")
+        if self._review_enabled() and self._show_next_review():
+            return
         # Let advance_topic_index handle both topic-based and topic-less lists.
         card, new_idx = widgets.advance_topic_index(self.flashcards, self.current_topic, self.card_index)
         if card is None:
@@ -286,6 +456,7 @@ class FlashcardUI:
         self.card_index = new_idx
         self._update_display(card)
         print(f"[FlashcardUI] advanced to index {new_idx}")
+        self._maybe_prefetch()
         # update selection in listbox to reflect new index
         if getattr(self, "cards_listbox", None):
             try:
@@ -295,20 +466,60 @@ class FlashcardUI:
             except Exception:
                 pass
 
-    def on_speak(self):
-        """Speak the current card using gui.audio.player when available; verbose debug."""
-        import subprocess
-        print("[FlashcardUI] on_speak called")
-        current = self._current_card()
-        if not current:
-            print("[FlashcardUI] no current card to speak")
+    def _maybe_prefetch(self):
+        """Start fetching more cards for the current topic when the learner nears its end."""
+        topic = self.current_topic
+        if not topic or self._prefetching or time.monotonic() < self._prefetch_after:
+            return
+        cards = self.flashcards or []
+        if not isinstance(cards, BundleView) and not any("topic" in c for c in cards):
+            # a saved file without topics: there is no topic to generate more for
+            return
+        if widgets.cards_remaining(cards, topic, self.card_index) > PREFETCH_AHEAD:
             return
+        print(f"[FlashcardUI] prefetching {PREFETCH_COUNT} cards for '{topic}'")
+        self._prefetching = topic
+        self._run_in_background(lambda: self._prefetch(topic), lambda cards: self._merge_prefetched(topic, cards))
 
-        text = current.get("word") or current.get("front") or current.get("term") or current.get("definition") or ""
-        # support your saved-file key 'tts_path' as well
-        audio_path = current.get("tts_path") or current.get("audio_path") or current.get("audio") or None
-        print(f"[FlashcardUI] speak: text='{text[:60]}' audio_path={audio_path}")
+    def _prefetch(self, topic):
+        """Worker thread: fetch new cards and decode their audio before they are shown."""
+        from ..api.client import prefetch_flashcards
+
+        cards = [c for c in prefetch_flashcards(topic, PREFETCH_COUNT) if isinstance(c, dict)]
+        try:
+            from ..audio import player
+        except Exception:
+            player = None
+        for card in cards:
+            card.setdefault("topic", topic)
+            if player is not None and hasattr(player, "predecode"):
+                player.predecode(card.get("tts_path"))
+        return cards
+
+    def _merge_prefetched(self, topic, cards):
+        """Tk thread: append prefetched cards the deck doesn't have yet after its last card."""
+        self._prefetching = None
+        if topic != self.current_topic:
+            return
+        current = widgets.topic_cards(self.flashcards, topic)
+        known = {c.get("word") for c in current}
+        new = [c for c in cards or [] if c.get("word") not in known]
+        if not new:
+            self._prefetch_after = time.monotonic() + PREFETCH_BACKOFF_S
+            return
+        # a bundle view is read-only; from here on the topic lives in a plain list
+        self.flashcards = list(self.flashcards) + new
+        if getattr(self, "cards_listbox", None):
+            for c in new:
+                self.cards_listbox.insert(tk.END, c.get("word") or f"Card {self.cards_listbox.size() + 1}")
+        print(f"[FlashcardUI] merged {len(new)} prefetched cards into '{topic}'")
+
+    def _resolve_player(self):
+        """Import the audio player once and return its usable entry points, best first.
 
+        Each entry is (label, kind, fn): kind "any" takes the text (or the audio path when
+        there is no text), "text" needs text, "audio" prefers the audio path.
+        """
         player_mod = None
         # try package-relative import first (should work when running as module)
         try:
@@ -321,55 +532,71 @@ class FlashcardUI:
                 print("[FlashcardUI] imported player via 'gui.audio.player'")
             except Exception as e2:
                 print("[FlashcardUI] gui.audio.player import failed:", e2)
-                player_mod = None
-
-        if player_mod:
+                return []
+
+        speakers = []
+        # If module exposes a Player/AudioPlayer class, instantiate it once
+        for cls_name in ("Player", "AudioPlayer", "TTSPlayer"):
+            cls = getattr(player_mod, cls_name, None)
+            if cls is None:
+                continue
             try:
-                attrs = dir(player_mod)
-                print("[FlashcardUI] player module attrs:", attrs)
-            except Exception:
-                attrs = []
+                inst = cls()
+            except Exception as e:
+                print(f"[FlashcardUI] could not instantiate {cls_name}:", e)
+                continue
+            for fn in ("play_text", "speak_text", "say_text", "play", "play_file"):
+                if hasattr(inst, fn):
+                    speakers.append((f"{cls_name}.{fn}", "any", getattr(inst, fn)))
+        # then module-level functions
+        for fn in ("play_text", "speak_text", "say_text"):
+            if hasattr(player_mod, fn):
+                speakers.append((f"player_mod.{fn}", "text", getattr(player_mod, fn)))
+        for fn in ("play_audio", "play_file", "play_audio_file", "play"):
+            if hasattr(player_mod, fn):
+                speakers.append((f"player_mod.{fn}", "audio", getattr(player_mod, fn)))
+        print("[FlashcardUI] player entry points:", [label for label, _, _ in speakers])
+        return speakers
+
+    def _set_speakers(self, speakers):
+        if self._speakers is None:
+            self._speakers = speakers or []
 
-            # If module exposes a Player/AudioPlayer class, try to instantiate
-            for cls_name in ("Player", "AudioPlayer", "TTSPlayer"):
-                if hasattr(player_mod, cls_name):
-                    try:
-                        cls = getattr(player_mod, cls_name)
-                        inst = cls()
-                        print(f"[FlashcardUI] instantiated {cls_name}")
-                        # try common instance methods
-                        for fn in ("play_text", "speak_text", "say_text", "play", "play_file"):
-                            if hasattr(inst, fn):
-                                try:
-                                    getattr(inst, fn)(text or audio_path)
-                                    print(f"[FlashcardUI] used {cls_name}.{fn}")
-                                    return
-                                except Exception as e:
-                                    print(f"[FlashcardUI] {cls_name}.{fn} failed:", e)
-                    except Exception as e:
-                        print(f"[FlashcardUI] could not instantiate {cls_name}:", e)
-
-            # try module-level functions
-            for fn in ("play_text", "speak_text", "say_text"):
-                if hasattr(player_mod, fn) and text:
-                    try:
-                        getattr(player_mod, fn)(text)
-                        print(f"[FlashcardUI] used player_mod.{fn}")
-                        return
-                    except Exception as e:
-                        print(f"[FlashcardUI] player_mod.{fn} failed:", e)
-
-            for fn in ("play_audio", "play_file", "play_audio_file", "play"):
-                if hasattr(player_mod, fn) and (audio_path or text):
-                    try:
-                        # prefer audio_path for audio functions, fall back to text
-                        arg = audio_path or text
-                        getattr(player_mod, fn)(arg)
-                        print(f"[FlashcardUI] used player_mod.{fn}")
-                        return
-                    except Exception as e:
-                        print(f"[FlashcardUI] player_mod.{fn} failed:", e)
+    def on_speak(self):
+        """Speak the current card using gui.audio.player when available; verbose debug."""
+        import subprocess
+        print("[FlashcardUI] on_speak called")
+        current = self._current_card()
+        if not current:
+            print("[FlashcardUI] no current card to speak")
+            return
 
+        text = current.get("word") or current.get("front") or current.get("term") or current.get("definition") or ""
+        # support your saved-file key 'tts_path' as well
+        audio_path = current.get("tts_path") or current.get("audio_path") or current.get("audio") or None
+        print(f"[FlashcardUI] speak: text='{text[:60]}' audio_path={audio_path}")
+
+        if self._speakers is None:
+            # clicked before the background resolution finished
+            self._speakers = self._resolve_player()
+
+        for label, kind, fn in self._speakers:
+            if kind == "any":
+                arg = text or audio_path
+            elif kind == "text":
+                arg = text
+            else:
+                # prefer audio_path for audio functions, fall back to text
+                arg = audio_path or text
+            if not arg:
+                continue
+            try:
+                fn(arg)
+                print(f"[FlashcardUI] used {label}")
+                return
+            except Exception as e:
+                print(f"[FlashcardUI] {label} failed:", e)
+        if self._speakers:
             print("[FlashcardUI] player module present but no usable API succeeded")
 
         # Fallback to macOS `say` for text
@@ -384,16 +611,14 @@ class FlashcardUI:
         print("[FlashcardUI] no available method to speak/play this card")
 
     def _current_card(self):
+        if self.review_card_id and self._review_enabled():
+            return self._review_card
         if self.card_index is None:
             return None
-        all_cards = self.flashcards or []
         # if cards have 'topic' keys, filter by current_topic; otherwise use all cards
-        if any("topic" in c for c in all_cards):
-            if self.current_topic is None:
-                return None
-            cards = [c for c in all_cards if c.get("topic") == self.current_topic]
-        else:
-            cards = all_cards
+        if self.current_topic is None and any("topic" in c for c in self.flashcards or []):
+            return None
+        cards = widgets.topic_cards(self.flashcards, self.current_topic)
         if not cards or not (0 <= self.card_index < len(cards)):
             return None
         return cards[self.card_index]
@@ -423,6 +648,9 @@ class FlashcardUI:
 
     def export_to_anki(self):
         """Export currently loaded flashcards to Anki."""
+        import requests
+        from tkinter import messagebox
+
         if not self.flashcards:
             messagebox.showwarning("Warning", "No flashcards loaded to export!")
             return
@@ -4,7 +4,6 @@
 import tkinter as tk
 from tkinter import font
 from .widgets import create_label, create_button, create_entry, create_listbox
-from ..api.client import fetch_saved_flashcards
 
 
 def setup_layout(
@@ -14,6 +13,7 @@ def setup_layout(
     new_word_cb=None,
     speak_cb=None,
     export_anki_cb=None,
+    grade_cb=None,
 ):
     """Set up the main UI layout. Pass callback functions from app to avoid circular imports."""
     # Variables
@@ -81,28 +81,17 @@ def setup_layout(
         command=(lambda: load_topic_cb(topic_entry.get()) if load_topic_cb else None),
     )
 
-    # Saved files list
-    saved_files = fetch_saved_flashcards()
-    listbox = None
-    if saved_files:
-        create_label(root, "Saved Files:", 8, 0, sticky="w", pady=5)
-        listbox = create_listbox(root, 5, 40, 8, 1, pady=5)
-        for filename in saved_files:
-            listbox.insert(tk.END, filename)
-        create_button(
-            root,
-            "Load File",
-            9,
-            0,
-            command=(
-                lambda: (
-                    load_file_cb(listbox.get(tk.ACTIVE))
-                    if (load_file_cb and listbox)
-                    else None
-                )
-            ),
-            columnspan=2,
-        )
+    # Saved files list; FlashcardUI fills it in the background once the window is up
+    create_label(root, "Saved Files:", 8, 0, sticky="w", pady=5)
+    listbox = create_listbox(root, 5, 40, 8, 1, pady=5)
+    create_button(
+        root,
+        "Load File",
+        9,
+        0,
+        command=(lambda: load_file_cb(listbox.get(tk.ACTIVE)) if load_file_cb else None),
+        columnspan=2,
+    )
 
     # Cards list for the currently loaded topic/file
     create_label(root, "Cards:", 10, 0, sticky="w", pady=5)
@@ -117,6 +106,24 @@ def setup_layout(
         pady = 10,
     )
 
+    # Spaced-repetition review: when enabled, New Word pulls the next due card
+    # from the backend scheduler and the grade buttons record how well it went.
+    review_var = tk.BooleanVar(value=False)
+    review_frame = tk.Frame(root)
+    review_frame.grid(row=12, column=0, columnspan=2, pady=5)
+    tk.Checkbutton(review_frame, text="Review mode", variable=review_var).grid(
+        row=0, column=0, padx=5
+    )
+    for col, (label, grade) in enumerate(
+        (("Again", 1), ("Hard", 3), ("Good", 4), ("Easy", 5)), start=1
+    ):
+        create_button(
+            review_frame,
+            label,
+            0,
+            col,
+            command=(lambda g=grade: grade_cb(g) if grade_cb else None),
+        )
 
     return {
         "word_var": word_var,
@@ -129,4 +136,5 @@ def setup_layout(
         "topic_entry": topic_entry,
         "listbox": listbox,
         "cards_listbox": cards_listbox,
+        "review_var": review_var,
     }
@@ -5,6 +5,7 @@
 
 import tkinter as tk
 from tkinter import font
+from ..utils.bundle import BundleView
 
 
 def create_label(
@@ -76,6 +77,21 @@ def create_listbox(root, height, width, row, column, pady=0):
 
 
 # Added helpers for "New word" behavior
+def topic_cards(flashcards, current_topic):
+    """
+    Return the cards shown for current_topic, in display order.
+    If cards include 'topic' keys, filter by current_topic; if no card has a
+    'topic' key, the entire list is a single topic. A BundleView already holds
+    exactly one topic and is returned as-is, so its cards stay undecoded.
+    """
+    all_cards = flashcards or []
+    if isinstance(all_cards, BundleView):
+        return all_cards
+    if any("topic" in c for c in all_cards):
+        return [c for c in all_cards if c.get("topic") == current_topic]
+    return all_cards
+
+
 def advance_topic_index(flashcards, current_topic, current_index=None):
     """
     Return (next_card, new_index) for the given topic, wrapping around.
@@ -84,13 +100,7 @@ def advance_topic_index(flashcards, current_topic, current_index=None):
     current_index: int or None
     If no cards for topic, returns (None, 0).
     """
-    all_cards = flashcards or []
-    # If cards include 'topic' keys, filter by current_topic.
-    # If no card has a 'topic' key, treat the entire list as a single topic.
-    if any("topic" in c for c in all_cards):
-        cards = [c for c in all_cards if c.get("topic") == current_topic]
-    else:
-        cards = all_cards
+    cards = topic_cards(flashcards, current_topic)
     if not cards:
         return None, 0
     idx = 0 if current_index is None else current_index
@@ -98,6 +108,14 @@ def advance_topic_index(flashcards, current_topic, current_index=None):
     return cards[idx], idx
 
 
+def cards_remaining(flashcards, current_topic, current_index):
+    """Number of cards after current_index before advance_topic_index wraps around."""
+    cards = topic_cards(flashcards, current_topic)
+    if not cards or current_index is None:
+        return len(cards)
+    return max(len(cards) - 1 - current_index, 0)
+
+
 def create_new_word_button(
     root, text, row, column, get_state, set_state, update_display, pady=0, columnspan=1
 ):
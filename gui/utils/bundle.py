@@ -0,0 +1,126 @@
+# gui/utils/bundle.py
+# Read-only access to a deck bundle written by `python -m app.bundle` (layout documented there).
+# The file is memory-mapped and cards are decoded one at a time when accessed, so opening a
+# library costs one header read regardless of its size.
+
+import json
+import mmap
+import struct
+from collections.abc import Sequence
+
+MAGIC = b"FCBUNDLE"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIIQQQ")
+MISSING = 0xFFFFFFFF
+
+
+class Bundle:
+    """An open bundle: topic table in memory, cards decoded from the mapping on demand."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._buf = memoryview(self._mm)
+        if len(self._buf) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a deck bundle")
+        magic, version, nfields, _, count, topics_off, index_off, heap_off = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} deck bundle")
+        table = json.loads(str(self._buf[topics_off:index_off], "utf-8"))
+        self.fields = [(name, kind) for name, kind in table["fields"]]
+        # topic -> (first card, card count), in the order the decks were packed
+        self.topics = {t[0]: (t[2], t[3]) for t in table["topics"]}
+        self._count = count
+        self._record = struct.Struct("<" + "II" * nfields)
+        self._index_off = index_off
+        self._heap_off = heap_off
+        self._word_slot = next(i for i, (name, _) in enumerate(self.fields) if name == "word")
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._buf is not None:
+            self._buf.release()
+            self._buf = None
+            self._mm.close()
+            self._file.close()
+
+    def _slots(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._record.unpack_from(self._buf, self._index_off + i * self._record.size)
+
+    def _text(self, offset, length):
+        start = self._heap_off + offset
+        return str(self._buf[start : start + length], "utf-8")
+
+    def card(self, i, topic=None):
+        """Decode card i into the same dict the deck file holds."""
+        slots = self._slots(i)
+        card = {}
+        extra = None
+        for n, (name, kind) in enumerate(self.fields):
+            offset, length = slots[2 * n], slots[2 * n + 1]
+            if offset == MISSING:
+                continue
+            text = self._text(offset, length)
+            value = json.loads(text) if kind == "j" else text
+            if name == "extra":
+                extra = value
+            else:
+                card[name] = value
+        if extra:
+            card.update(extra)
+        if topic is not None:
+            card.setdefault("topic", topic)
+        return card
+
+    def title(self, i):
+        """Just the word of card i, without decoding the rest of the record."""
+        slots = self._slots(i)
+        offset, length = slots[2 * self._word_slot], slots[2 * self._word_slot + 1]
+        return "" if offset == MISSING else self._text(offset, length)
+
+    def view(self, topic):
+        start, count = self.topics[topic]
+        return BundleView(self, topic, start, count)
+
+
+class BundleView(Sequence):
+    """The cards of one topic in a bundle, as a read-only list decoded on access."""
+
+    def __init__(self, bundle, topic, start, count):
+        self.bundle = bundle
+        self.topic = topic
+        self._start = start
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self.bundle.card(self._start + i, self.topic)
+
+    def titles(self):
+        for i in range(self._count):
+            yield self.bundle.title(self._start + i)
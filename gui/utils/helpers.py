@@ -1 +1,35 @@
-# Add any helper functions here
+# gui/utils/helpers.py
+# Helper functions shared by the GUI modules.
+
+import gzip
+import json
+import os
+import re
+
+GZIP_MAGIC = b"\x1f\x8b"
+# deck files may sit in hash-named shard subdirectories of saved_flashcards/ (see app/paths.py)
+SHARD_RE = re.compile(r"^[0-9a-f]{2}$")
+SAVED_EXTENSIONS = (".json", ".fcb")
+
+
+def load_json(path):
+    """Load a deck/history file saved as plain or gzip-compressed JSON (see app/storage.py)."""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    if compressed:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_saved_files(folder):
+    """Deck and bundle files under folder, as paths relative to it (shard/name for sharded
+    decks), sorted by file name."""
+    found = []
+    for sub in [""] + sorted(d for d in os.listdir(folder) if SHARD_RE.match(d)):
+        directory = os.path.join(folder, sub)
+        if not os.path.isdir(directory):
+            continue
+        found.extend(os.path.join(sub, f) for f in os.listdir(directory) if f.lower().endswith(SAVED_EXTENSIONS))
+    return sorted(found, key=os.path.basename)
@@ -0,0 +1,93 @@
+# gui/utils/sync_cache.py
+# Local copy of the backend's cards, kept current by applying the deltas of GET /sync
+# (see app/sync.py), so the GUI never reads the server's saved_flashcards/ directory.
+
+import json
+import os
+import threading
+
+
+class SyncCache:
+    """Cards by id plus the feed id and revision they are current to."""
+
+    def __init__(self, path):
+        self.path = path
+        self.feed = None
+        self.rev = 0
+        self._cards = {}
+        self._lock = threading.Lock()
+        # one pull at a time: the GUI's timer and its actions both start one off the Tk thread
+        self._pull_lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.feed, self.rev, self._cards = data["feed"], data["rev"], data["cards"]
+            except (OSError, ValueError, KeyError) as e:
+                print("[SyncCache] ignoring unreadable cache:", e)
+
+    def apply(self, delta):
+        """Apply one /sync response; returns the set of topics that changed."""
+        changed = set()
+        with self._lock:
+            if delta.get("reset") or delta.get("feed") != self.feed:
+                # another feed (or a rebuilt one): pull() made sure the response is a full copy
+                changed = self._clear(delta.get("feed"))
+            for change in delta.get("changes", []):
+                if change.get("op") == "delete":
+                    old = self._cards.pop(change["id"], None)
+                    if old is not None:
+                        changed.add(old.get("topic"))
+                    continue
+                self._cards[change["id"]] = dict(change["card"], topic=change["topic"])
+                changed.add(change["topic"])
+            self.rev = delta.get("rev", self.rev)
+        return changed
+
+    def _clear(self, feed):
+        changed = {c.get("topic") for c in self._cards.values()}
+        self._cards = {}
+        self.feed = feed
+        self.rev = 0
+        return changed
+
+    def pull(self, fetch_changes):
+        """Fetch and apply pages until current. Returns the changed topics, or None if the
+        backend could not be reached.
+
+        fetch_changes(since, feed) -> one /sync response, or None.
+        """
+        with self._pull_lock:
+            return self._pull(fetch_changes)
+
+    def _pull(self, fetch_changes):
+        changed = set()
+        while True:
+            delta = fetch_changes(self.rev, self.feed)
+            if delta is None:
+                return None
+            if self.rev and delta.get("feed") != self.feed and not delta.get("reset"):
+                # a new feed that didn't reset us (e.g. an older server ignoring our feed id)
+                # sent only what follows our old revision: start over from its beginning
+                with self._lock:
+                    changed |= self._clear(delta.get("feed"))
+                continue
+            changed |= self.apply(delta)
+            if not delta.get("more"):
+                return changed
+
+    def save(self):
+        with self._lock:
+            data = {"feed": self.feed, "rev": self.rev, "cards": self._cards}
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+    def topics(self):
+        with self._lock:
+            return sorted({c.get("topic") for c in self._cards.values() if c.get("topic")})
+
+    def cards_for(self, topic):
+        with self._lock:
+            return [dict(c) for c in self._cards.values() if c.get("topic") == topic]
@@ -6,7 +6,7 @@ LOG_DIR="$ROOT_DIR/logs"
 mkdir -p "$LOG_DIR"
 FASTAPI_LOG="$LOG_DIR/fastapi.log"
 GUI_LOG="$LOG_DIR/gui.log"
-START_TIMEOUT=30
+START_TIMEOUT=60
 VENV_PATH="./venv"
 ENV_PATH="./app/.env"
 PYTHON_VENV_PATH="$VENV_PATH/bin/python"
@@ -45,11 +45,11 @@ echo "Starting FastAPI server... (logs: $FASTAPI_LOG)"
 FASTAPI_PID=$!
 echo "FastAPI PID: $FASTAPI_PID"
 
-# Wait for HTTP 200 from the server root endpoint, with timeout.
-echo "Waiting for FastAPI to become ready on http://127.0.0.1:8000/ (timeout: ${START_TIMEOUT}s)"
+# Wait for /readyz to answer 200 (it answers 503 until the startup warm-up is done), with timeout.
+echo "Waiting for FastAPI to become ready on http://127.0.0.1:8000/readyz (timeout: ${START_TIMEOUT}s)"
 READY=0
 for i in $(seq 1 $START_TIMEOUT); do
-    if curl -sS --max-time 2 http://127.0.0.1:8000/ >/dev/null 2>&1; then
+    if curl -fsS --max-time 2 http://127.0.0.1:8000/readyz >/dev/null 2>&1; then
         READY=1
         break
     fi
@@ -1,7 +1,93 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.dedupe import WordIndex
+from app.quiz import DistractorIndex
+from app.services import (
+    dedupe_service, flashcard_service, history_service, quiz_service, sync_service, usage_service, warmer_service,
+)
+from app.history import HistoryJournal
+from app.sync import ChangeFeed
+from app.circuit_breaker import CircuitBreaker
+from app import tracing, tts_backends
+from app.usage import AdmissionController, UsageLedger
+from app.warmer import DemandCounter, Reserve
 
 @pytest.fixture
 def client():
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def isolated_word_index(monkeypatch):
+    # The global word index outlives a single request; start every test with an
+    # empty one so cards "saved" by one test don't count as duplicates in the next.
+    monkeypatch.setattr(dedupe_service, "_index", WordIndex())
+
+
+@pytest.fixture(autouse=True)
+def isolated_usage(monkeypatch, tmp_path):
+    # Keep token accounting out of the real ledger and give every test fresh budgets.
+    monkeypatch.setattr(usage_service, "ledger", UsageLedger(str(tmp_path / "usage.jsonl")))
+    monkeypatch.setattr(usage_service, "admission", AdmissionController(0, 0))
+
+
+@pytest.fixture(autouse=True)
+def closed_llm_breaker(monkeypatch):
+    # Failures injected by one test must not leave the LLM circuit open for the next.
+    monkeypatch.setattr(flashcard_service, "llm_breaker", CircuitBreaker("mistral", 5, 30.0))
+    monkeypatch.setattr(flashcard_service, "_completion_cache", flashcard_service.OrderedDict())
+
+
+@pytest.fixture(autouse=True)
+def fake_tts(monkeypatch):
+    # Never reach the network for speech; the fake backend writes deterministic files.
+    monkeypatch.setattr(tts_backends, "_chain", tts_backends.TTSChain(["fake"]))
+
+
+@pytest.fixture(autouse=True)
+def isolated_history(monkeypatch, tmp_path):
+    # Loaded up front, before a test patches open/os.path.exists, and away from the real files.
+    store = HistoryJournal(str(tmp_path / "history.json"), str(tmp_path / "history.jsonl"))
+    store.load()
+    monkeypatch.setattr(history_service, "_store", store)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def isolated_sync(monkeypatch, tmp_path_factory):
+    # A fresh change feed per test, so revisions start at 0 and the real feed is never seeded.
+    # Kept out of tmp_path: loading writes the feed header, and tests list tmp_path.
+    feed = ChangeFeed(str(tmp_path_factory.mktemp("sync") / "changes.jsonl"))
+    feed.load()
+    monkeypatch.setattr(sync_service, "_feed", feed)
+    monkeypatch.setattr(sync_service, "CHANGES_INBOX_DIR", str(tmp_path_factory.mktemp("sync_inbox")))
+    return feed
+
+
+@pytest.fixture(autouse=True)
+def isolated_traces(monkeypatch, tmp_path_factory):
+    # Finished traces go to a per-test log and window instead of app_state/traces.jsonl.
+    log = tracing.TraceLog(str(tmp_path_factory.mktemp("traces") / "traces.jsonl"), 0, 0)
+    recorder = tracing.TraceRecorder(log, 50)
+    monkeypatch.setattr(tracing, "recorder", recorder)
+    return recorder
+
+
+@pytest.fixture(autouse=True)
+def isolated_warmer(monkeypatch, tmp_path_factory):
+    # Empty demand counts and reserve per test, so no test is served another's reserved cards.
+    # Kept out of tmp_path for the same reason as the change feed.
+    state = tmp_path_factory.mktemp("warmer")
+    monkeypatch.setattr(warmer_service, "_demand", DemandCounter(str(state / "demand.json"), 86400.0))
+    reserve = Reserve(str(state / "reserve"))
+    monkeypatch.setattr(warmer_service, "_reserve", reserve)
+    return reserve
+
+
+@pytest.fixture(autouse=True)
+def isolated_quiz_index(monkeypatch):
+    # Quizzes only see the cards a test saves or adds, never the real decks.
+    index = DistractorIndex()
+    monkeypatch.setattr(quiz_service, "_index", index)
+    return index
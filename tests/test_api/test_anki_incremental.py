@@ -0,0 +1,64 @@
+import os
+import pandas as pd
+from datetime import datetime
+from app.anki_export import export
+from app.storage import dump_json
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+GREETINGS = [{"word": "안녕하세요", "definition": "hello"}, {"word": "잘 가", "definition": "bye"}]
+FOOD = [{"word": "밥", "definition": "rice", "tts_path": "tts_audio/밥_1111.mp3"}]
+
+
+def _export(tmp_path, **kw):
+    return export(
+        data_dir=str(tmp_path / "decks"),
+        output_dir=str(tmp_path / "out"),
+        manifest_path=str(tmp_path / "manifest.json"),
+        now=NOW,
+        **kw,
+    )
+
+
+def test_delta_exports_only_new_and_changed_cards(tmp_path):
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    dump_json(GREETINGS, str(decks / "greetings_20231001120000.json"))
+    dump_json(FOOD, str(decks / "food_20231001120000.json"))
+
+    first = _export(tmp_path)
+    assert first["cards"] == 3 and first["decks_read"] == 2
+    assert set(pd.read_csv(first["file"])["Tags"]) == {"greetings", "food"}
+
+    # untouched decks are skipped without being read
+    assert _export(tmp_path) == {"mode": "delta", "file": None, "cards": 0, "decks_read": 0, "removed": []}
+
+    changed = [dict(GREETINGS[0], definition="hi"), GREETINGS[1], {"word": "감사합니다", "definition": "thanks"}]
+    dump_json(changed, str(decks / "greetings_20231001120000.json"))
+    delta = _export(tmp_path)
+    assert delta["file"] != first["file"]
+    assert list(pd.read_csv(delta["file"])["Front"]) == ["안녕하세요", "감사합니다"]
+
+    # topic selection
+    assert _export(tmp_path, topics=["food"], full=True)["cards"] == 1
+
+
+def test_full_export_compacts_earlier_files(tmp_path):
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    dump_json(GREETINGS, str(decks / "greetings_20231001120000.json"))
+    first = _export(tmp_path)
+
+    full = _export(tmp_path, full=True)
+    assert full["cards"] == 2
+    assert full["removed"] == [first["file"]]
+    assert os.listdir(tmp_path / "out") == [os.path.basename(full["file"])]
+
+
+def test_incremental_route(client, tmp_path, monkeypatch):
+    from app.services import export_service
+
+    calls = []
+    monkeypatch.setattr(export_service, "export", lambda topics, full: calls.append((topics, full)) or {"cards": 0})
+    assert client.post("/flashcards/export/anki/incremental", json={"topics": ["food"]}).json() == {"cards": 0}
+    assert calls == [(["food"], False)]
+    assert client.post("/flashcards/export/anki/incremental", json={"topics": "food"}).status_code == 400
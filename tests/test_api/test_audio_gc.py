@@ -0,0 +1,56 @@
+import json
+import os
+from app.audio_gc import collect
+
+OLD = 0.0
+NOW = 10 * 86400.0
+
+
+def _setup(tmp_path):
+    audio, decks = tmp_path / "audio", tmp_path / "decks"
+    audio.mkdir()
+    decks.mkdir()
+    files = {
+        "밥_1111.mp3": b"rice",
+        "밥_2222.mp3": b"rice",  # same audio under another name
+        "밥_1111.wav": b"w" * 100,  # player's converted copy
+        "물_3333.mp3": b"water",  # no deck points here
+        "물_3333.wav": b"w" * 100,
+    }
+    for name, data in files.items():
+        (audio / name).write_bytes(data)
+        os.utime(audio / name, (OLD, OLD))
+    cards = [{"word": "밥", "tts_path": str(audio / "밥_1111.mp3")}, {"word": "쌀", "tts_path": str(audio / "밥_2222.mp3")}]
+    (decks / "food_20231001120000.json").write_text(json.dumps(cards), encoding="utf-8")
+    return audio, decks
+
+
+def test_dry_run_reports_without_changes(tmp_path):
+    audio, decks = _setup(tmp_path)
+    report = collect(str(decks), str(audio), dry_run=True, wav_cap_bytes=0,
+                     hash_cache_path=str(tmp_path / "h.json"), now=NOW)
+    assert report["orphans"] == ["물_3333.mp3", "물_3333.wav"]
+    assert report["duplicates"] == [{"file": "밥_2222.mp3", "same_as": "밥_1111.mp3"}]
+    assert report["evicted"] == ["밥_1111.wav"]
+    assert len(os.listdir(audio)) == 5
+
+
+def test_apply_links_duplicates_and_sweeps(tmp_path):
+    audio, decks = _setup(tmp_path)
+    (audio / "new_4444.mp3").write_bytes(b"fresh")  # too recent to sweep
+    collect(str(decks), str(audio), dry_run=False, wav_cap_bytes=1000,
+            hash_cache_path=str(tmp_path / "h.json"), now=os.path.getmtime(audio / "new_4444.mp3"))
+    assert sorted(os.listdir(audio)) == ["new_4444.mp3", "밥_1111.mp3", "밥_1111.wav", "밥_2222.mp3"]
+    assert os.stat(audio / "밥_1111.mp3").st_ino == os.stat(audio / "밥_2222.mp3").st_ino
+
+
+def test_audio_of_the_given_reserve_is_kept(tmp_path):
+    audio, decks = _setup(tmp_path)
+    reserve = tmp_path / "reserve"
+    reserve.mkdir()
+    (reserve / "drinks.json").write_text(
+        json.dumps({"cards": [{"word": "물", "tts_path": str(audio / "물_3333.mp3")}]}), encoding="utf-8"
+    )
+    report = collect(str(decks), str(audio), dry_run=True, wav_cap_bytes=10_000,
+                     hash_cache_path=str(tmp_path / "h.json"), now=NOW, reserve_dir=str(reserve))
+    assert report["orphans"] == []
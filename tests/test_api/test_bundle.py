@@ -0,0 +1,38 @@
+import pytest
+from app.bundle import build
+from app.storage import dump_json
+from gui.utils.bundle import Bundle
+
+GREETINGS = [
+    {"word": "안녕하세요", "definition": "hello", "synonyms": ["반갑습니다"], "tts_path": "tts_audio/a_1.mp3"},
+    {"word": "잘 가", "definition": "bye", "card_id": "x1", "level": 2},
+]
+FOOD = [{"word": ["밥", "쌀"], "definition": "rice"}]
+
+
+def test_bundle_round_trip(tmp_path):
+    dump_json(GREETINGS, str(tmp_path / "greetings_20231001120000.json"), "json")
+    dump_json(FOOD, str(tmp_path / "food_20231001120000.json"), "gzip")
+    out = tmp_path / "library.fcb"
+
+    summary = build(str(tmp_path), str(out))
+    assert summary == {"topics": 2, "cards": 3, "bytes": out.stat().st_size}
+
+    with Bundle(str(out)) as bundle:
+        assert len(bundle) == 3
+        assert list(bundle.topics) == ["food", "greetings"]
+        food, greetings = bundle.view("food"), bundle.view("greetings")
+        assert list(greetings) == [dict(c, topic="greetings") for c in GREETINGS]
+        # a non-string word survives with its type
+        assert food[0] == dict(FOOD[0], topic="food")
+        assert list(greetings.titles()) == ["안녕하세요", "잘 가"]
+        assert greetings[-1]["level"] == 2
+        with pytest.raises(IndexError):
+            greetings[2]
+
+
+def test_bundle_rejects_other_files(tmp_path):
+    path = tmp_path / "deck.fcb"
+    path.write_bytes(b"[]" * 64)
+    with pytest.raises(ValueError):
+        Bundle(str(path))
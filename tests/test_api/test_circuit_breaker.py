@@ -0,0 +1,109 @@
+import json
+from unittest.mock import MagicMock, patch
+import pytest
+from fastapi import HTTPException
+from app.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from app.services import flashcard_service
+from app.services.flashcard_service import create_flashcards_service
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail():
+    raise RuntimeError("down")
+
+
+def test_opens_after_threshold_and_probes_after_interval():
+    clock = Clock()
+    breaker = CircuitBreaker("llm", failure_threshold=2, probe_interval=10, clock=clock)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpen) as exc:
+        breaker.call(calls.append, 1)
+    assert calls == [] and exc.value.retry_after == 10
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    # a failed probe re-opens for another full interval
+    with pytest.raises(RuntimeError):
+        breaker.call(_fail)
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def _run_with_outage(existing):
+    failing = MagicMock(side_effect=HTTPException(status_code=503, detail="API error"))
+    with patch.object(flashcard_service, "call_mistral_with_retry", failing), \
+         patch("app.services.flashcard_service.get_topic_file", return_value="food_20231001120000.json" if existing else None), \
+         patch("app.services.flashcard_service.os.path.exists", return_value=bool(existing)), \
+         patch("builtins.open", create=True), \
+         patch("json.load", return_value=existing), \
+         patch("json.dump"):
+        for _ in range(flashcard_service.llm_breaker.failure_threshold):
+            with pytest.raises(HTTPException):
+                create_flashcards_service({"topic": "food"})
+        calls = failing.call_count
+        try:
+            return create_flashcards_service({"topic": "food"})
+        finally:
+            # the open circuit fails fast without touching the API
+            assert failing.call_count == calls
+
+
+def test_open_circuit_serves_stored_cards_as_stale():
+    result = _run_with_outage([{"word": "밥", "definition": "rice"}])
+    assert result["stale"] is True
+    assert result["added"] == []
+    assert result["cards"] == [{"word": "밥", "definition": "rice"}]
+    assert result["degraded"]["source"] == "stored"
+
+
+def test_open_circuit_falls_back_to_cached_completion():
+    flashcard_service._completion_cache["food"] = json.dumps([{"word": "물", "definition": "water"}])
+    result = _run_with_outage([])
+    assert result["degraded"]["source"] == "cached_completion"
+    assert [c["word"] for c in result["cards"]] == ["물"]
+
+
+def test_open_circuit_without_fallback_is_503(client):
+    flashcard_service.llm_breaker.failure_threshold = 1
+    flashcard_service.llm_breaker.record_failure(RuntimeError("down"))
+    with patch("app.services.flashcard_service.get_topic_file", return_value=None):
+        resp = client.post("/flashcards", json={"topic": "nothing_cached"})
+    assert resp.status_code == 503
+    assert "Retry-After" in resp.headers
+
+    health = client.get("/health").json()
+    assert health["status"] == "degraded"
+    assert health["dependencies"]["mistral"]["state"] == OPEN
+
+
+def test_tts_outage_saves_cards_without_audio():
+    response = MagicMock()
+    response.choices[0].message.content = json.dumps([{"word": "밥", "definition": "rice"}])
+    response.usage.total_tokens = 10
+    tts_down = MagicMock(side_effect=CircuitOpen("tts:fake", 30))
+    with patch.object(flashcard_service, "call_mistral_with_retry", return_value=response), \
+         patch("app.services.flashcard_service.generate_tts", tts_down), \
+         patch("app.services.flashcard_service.get_topic_file", return_value=None), \
+         patch("builtins.open", create=True), \
+         patch("json.dump"):
+        result = create_flashcards_service({"topic": "food", "count": 1})
+
+    # not mistaken for an LLM outage: the generated card is saved, just without audio
+    assert "degraded" not in result and result["added"] == ["밥"]
+    assert result["cards"][0]["tts_path"] is None and result["dedupe"]["tts_failed"] == 1
+    assert flashcard_service.llm_breaker.state == CLOSED
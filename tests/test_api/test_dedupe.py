@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock, patch
+from app.dedupe import WordIndex, minhash, normalize_word, similarity
+from app.services import dedupe_service
+from app.services.flashcard_service import create_flashcards_service
+
+
+def test_normalize_word_folds_space_punctuation_and_nfc():
+    decomposed = "감사"  # 감사 as conjoining jamo
+    assert normalize_word(decomposed) == "감사"
+    assert normalize_word(" 안녕 하세요! ") == normalize_word("안녕하세요")
+    assert normalize_word("Hello.") == "hello"
+
+
+def test_minhash_detects_near_duplicate_definitions():
+    a = minhash("general, common, ordinary knowledge shared by most people")
+    b = minhash("General, common, ordinary knowledge shared by most people.")
+    c = minhash("a fermented dish of vegetables")
+    assert similarity(a, b) == 1.0
+    assert similarity(a, c) < 0.5
+
+
+def test_select_new_cards_skips_duplicates_and_reuses_known_audio(monkeypatch):
+    index = WordIndex()
+    index.add("food", {"word": "김치", "definition": "fermented vegetables", "tts_path": "tts_audio/김치_1234.mp3"})
+    index.add("greetings", {"word": "안녕하세요", "definition": "hello, a polite greeting"})
+    monkeypatch.setattr(dedupe_service, "_index", index)
+
+    generated = [
+        {"word": "안녕 하세요", "definition": "something else"},
+        {"word": "반갑습니다", "definition": "Hello, a polite greeting!"},
+        {"word": "김치", "definition": "spicy side dish"},
+        {"word": "김치", "definition": "spicy side dish"},
+    ]
+    new_cards, report = dedupe_service.select_new_cards("greetings", generated, [])
+    assert [c["word"] for c in new_cards] == ["김치"]
+    assert new_cards[0]["tts_path"] == "tts_audio/김치_1234.mp3"
+    assert report == {"duplicates": 2, "near_duplicates": 1}
+
+
+def test_service_skips_tts_for_duplicates(monkeypatch):
+    index = WordIndex()
+    index.add("greetings", {"word": "안녕하세요", "definition": "Hello"})
+    monkeypatch.setattr(dedupe_service, "_index", index)
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = (
+        '[{"word": "안녕하세요", "definition": "Hello"}, {"word": "감사합니다", "definition": "Thank you"}]'
+    )
+    with patch("app.services.flashcard_service.call_mistral_with_retry", return_value=mock_response), \
+         patch("app.services.flashcard_service.generate_tts", return_value="/fake.mp3") as tts, \
+         patch("app.services.flashcard_service.get_topic_file", return_value=None), \
+         patch("app.services.flashcard_service.os.path.exists", return_value=False), \
+         patch("builtins.open", create=True), \
+         patch("json.dump"):
+        result = create_flashcards_service({"topic": "greetings"})
+
+    assert result["added"] == ["감사합니다"]
+    assert tts.call_count == 1
+    # the second round only returns known words, so generation stops there
+    assert result["generation"]["llm_calls"] == 2
+    assert result["dedupe"]["duplicates"] == 3
+    assert result["dedupe"]["tts_generated"] == 1
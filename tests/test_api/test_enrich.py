@@ -0,0 +1,85 @@
+import json
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+from app.enrich import enrich
+from app.services import flashcard_service
+
+
+def _deck(tmp_path, name, words):
+    path = tmp_path / name
+    path.write_text(json.dumps([{"word": w, "definition": w} for w in words], ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _fake_llm(calls, fail_on=()):
+    """Answer every batch with hanja/frequency for each id, counting calls."""
+
+    def complete(prompt):
+        calls.append(prompt)
+        if len(calls) in fail_on:
+            raise HTTPException(status_code=429, detail="rate limited")
+        words = json.loads(prompt.split("Words: ", 1)[1].split("\n", 1)[0])
+        resp = MagicMock()
+        resp.choices[0].message.content = json.dumps(
+            [{"id": w["id"], "hanja": None, "frequency": "common"} for w in words]
+        )
+        resp.usage.total_tokens = 100
+        return resp
+
+    return complete
+
+
+def test_batches_cards_merges_and_resumes(tmp_path):
+    food = _deck(tmp_path, "food_20231001120000.json", ["밥", "물", "김치", "라면", "떡"])
+    drinks = _deck(tmp_path, "drinks_20231001120000.json", ["차", "우유"])
+    checkpoint = str(tmp_path / "state" / "checkpoint.json")
+    calls = []
+
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=_fake_llm(calls)):
+        summary = enrich(["hanja", "frequency"], str(tmp_path), batch_size=3, workers=2, checkpoint_path=checkpoint)
+        assert summary["cards"] == 7 and summary["calls"] == 3 and len(calls) == 3
+        assert summary["enriched"] == 7 and summary["tokens"] == 300 and summary["stopped"] is None
+        for deck in (food, drinks):
+            cards = json.loads(deck.read_text(encoding="utf-8"))
+            assert all(c["frequency"] == "common" and c["hanja"] is None for c in cards)
+
+        # everything is checkpointed: a second run reads no deck and makes no call
+        summary = enrich(["hanja"], str(tmp_path), batch_size=3, checkpoint_path=checkpoint)
+        assert summary["decks"] == 0 and len(calls) == 3
+
+
+def test_rate_limit_stops_and_next_run_finishes(tmp_path):
+    _deck(tmp_path, "food_20231001120000.json", ["밥", "물", "김치", "라면"])
+    checkpoint = str(tmp_path / "checkpoint.json")
+    calls = []
+
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=_fake_llm(calls, fail_on={2})):
+        first = enrich(["frequency"], str(tmp_path), batch_size=2, workers=1, checkpoint_path=checkpoint)
+        assert first["stopped"] and first["enriched"] == 2 and first["unanswered"] == 2
+
+        second = enrich(["frequency"], str(tmp_path), batch_size=2, workers=1, checkpoint_path=checkpoint)
+    # only the two cards still missing the field are sent again
+    assert second["cards"] == 2 and second["enriched"] == 2 and second["stopped"] is None
+
+
+def test_token_budget_stops_submitting(tmp_path):
+    _deck(tmp_path, "food_20231001120000.json", ["밥", "물", "김치", "라면", "떡", "차"])
+    calls = []
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=_fake_llm(calls)):
+        summary = enrich(
+            ["frequency"], str(tmp_path), batch_size=2, workers=1, max_tokens=100, checkpoint_path=str(tmp_path / "c.json")
+        )
+    assert "token budget" in summary["stopped"]
+    assert summary["enriched"] < 6 and len(calls) < 3
+
+
+def test_enriched_cards_reach_the_sync_feed(tmp_path, client, isolated_sync):
+    _deck(tmp_path, "food_20231001120000.json", ["밥", "물"])
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=_fake_llm([])):
+        enrich(["frequency"], str(tmp_path), checkpoint_path=str(tmp_path / "checkpoint.json"))
+    assert isolated_sync.rev == 0  # the CLI only queues; the server records
+
+    changes = client.get("/sync", params={"since": 0}).json()["changes"]
+    assert sorted(c["card"]["word"] for c in changes) == ["물", "밥"]
+    assert all(c["topic"] == "food" and c["card"]["frequency"] == "common" for c in changes)
+    assert client.get("/sync", params={"since": 2}).json()["changes"] == []
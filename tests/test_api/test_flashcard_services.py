@@ -9,7 +9,7 @@ import pandas as pd
 import tempfile
 from datetime import datetime
 
-def test_create_flashcards_service():
+def test_create_flashcards_service(isolated_history):
     # Mock Mistral API response
     mock_response = MagicMock()
     mock_response.choices = [MagicMock()]
@@ -48,8 +48,8 @@ def test_create_flashcards_service():
         assert len(result["added"]) == 1
         assert result["added"][0] == "안녕하세요"
 
-        # Verify json.dump was called twice (once for flashcards, once for history)
-        assert mock_json_dump.call_count == 2
+        # Verify json.dump was called once, for the flashcards; history is journaled instead
+        assert mock_json_dump.call_count == 1
 
         # Verify the calls to json.dump
         calls = mock_json_dump.call_args_list
@@ -59,10 +59,11 @@ def test_create_flashcards_service():
         assert len(flashcards_call[0][0]) == 1  # One flashcard
         assert flashcards_call[0][0][0]["word"] == "안녕하세요"
 
-        # Second call should be for history
-        history_call = calls[1]
-        assert "greetings" in history_call[0][0]
-        assert history_call[0][0]["greetings"]["filename"].endswith(".json")
+        # History should now list the topic
+        history = isolated_history.view()
+        assert "greetings" in history
+        assert history["greetings"]["filename"].endswith(".json")
+        assert history["greetings"]["count"] == 1
 
 
 def test_export_to_anki():
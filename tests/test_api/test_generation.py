@@ -0,0 +1,103 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+import pytest
+from fastapi import HTTPException
+from app.services import flashcard_service
+from app.services.flashcard_service import _build_prompt, create_flashcards_service
+
+
+MEANINGS = {"밥": "cooked rice", "물": "water", "김치": "fermented cabbage", "라면": "instant noodles", "떡": "rice cake"}
+
+
+def _response(words, tokens=100):
+    resp = MagicMock()
+    resp.choices[0].message.content = json.dumps([{"word": w, "definition": MEANINGS[w]} for w in words])
+    resp.usage.total_tokens = tokens
+    return resp
+
+
+def _run(responses, existing=None, **config):
+    prompts = []
+
+    def fake_call(prompt):
+        prompts.append(prompt)
+        return responses.pop(0)
+
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=fake_call), \
+         patch.multiple(flashcard_service, **config), \
+         patch("app.services.flashcard_service.generate_tts", return_value="/fake.mp3"), \
+         patch("app.services.flashcard_service.get_topic_file", return_value="food_20231001120000.json" if existing else None), \
+         patch("app.services.flashcard_service.os.path.exists", return_value=bool(existing)), \
+         patch("builtins.open", create=True), \
+         patch("json.load", return_value=existing or []), \
+         patch("json.dump"):
+        return create_flashcards_service({"topic": "food"}), prompts
+
+
+def test_prompt_lists_known_words_and_count():
+    prompt = _build_prompt("food", 3, ["밥", "물"])
+    assert "Create 3 flashcards" in prompt
+    assert "물, 밥" in prompt
+
+
+def test_tops_up_until_target():
+    responses = [_response(["밥", "물", "김치"]), _response(["물", "라면", "떡"])]
+    result, prompts = _run(responses, existing=[{"word": "밥"}], FLASHCARDS_PER_REQUEST=4)
+
+    assert result["added"] == ["물", "김치", "라면", "떡"]
+    assert result["generation"]["llm_calls"] == 2
+    assert result["generation"]["yield_per_call"] == 2.0
+    assert "Create 4 flashcards" in prompts[0] and "밥" in prompts[0]
+    # the follow-up only asks for the shortfall and excludes everything seen so far
+    assert "Create 2 flashcards" in prompts[1] and "김치" in prompts[1]
+
+
+def test_token_budget_caps_rounds():
+    responses = [_response(["밥"], tokens=5000), _response(["물"])]
+    result, prompts = _run(responses, FLASHCARDS_PER_REQUEST=5, GENERATION_MAX_TOKENS=5000)
+    assert len(prompts) == 1
+    assert result["added"] == ["밥"]
+
+
+def test_large_count_fans_out_in_parallel_chunks():
+    lock = threading.Lock()
+    counter = iter(range(1000))
+    running, peak = [0], [0]
+    # chunks wait for each other in pairs, which only happens if they run side by side
+    pair = threading.Barrier(2, timeout=5)
+
+    def concurrent_chunk(prompt):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        pair.wait()
+        n = int(prompt.split("Create ")[1].split(" ")[0])
+        with lock:
+            words = [f"단어{next(counter)}" for _ in range(n)]
+            running[0] -= 1
+        resp = MagicMock()
+        resp.choices[0].message.content = json.dumps(
+            [{"word": w, "definition": f"definition of {w}"} for w in words]
+        )
+        resp.usage.total_tokens = 10
+        return resp
+
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=concurrent_chunk), \
+         patch.object(flashcard_service, "select_new_cards", side_effect=lambda t, b, e: (b, {})), \
+         patch("app.services.flashcard_service.generate_tts", return_value="/fake.mp3"), \
+         patch("app.services.flashcard_service.get_topic_file", return_value=None), \
+         patch("builtins.open", create=True), \
+         patch("json.dump"):
+        result = create_flashcards_service({"topic": "food", "count": 35})
+
+    assert len(result["added"]) == 35
+    assert result["generation"]["chunks"] == 4
+    assert result["generation"]["llm_calls"] == 4
+    assert peak[0] >= 2
+
+
+def test_count_is_validated():
+    with pytest.raises(HTTPException) as exc:
+        create_flashcards_service({"topic": "food", "count": 1000})
+    assert exc.value.status_code == 400
@@ -0,0 +1,46 @@
+import json
+from app.history import HistoryJournal
+
+
+def _journal(tmp_path, compact_every=200):
+    store = HistoryJournal(str(tmp_path / "history.json"), str(tmp_path / "history.jsonl"), compact_every)
+    store.load()
+    return store
+
+
+def test_journal_replays_and_compacts(tmp_path):
+    store = _journal(tmp_path, compact_every=3)
+    store.record("food", "food_1.json", 5, True, at="2023-10-01T12:00:00")
+    store.record("travel", "travel_1.json", 5, True, at="2023-10-02T12:00:00")
+
+    reloaded = _journal(tmp_path)
+    assert reloaded.view()["food"] == {
+        "filename": "food_1.json",
+        "created_at": "2023-10-01T12:00:00",
+        "updated_at": "2023-10-01T12:00:00",
+        "count": 5,
+    }
+
+    assert store.record("food", "food_1.json", 10, False, at="2023-10-03T12:00:00")
+    store.compact()
+    assert (tmp_path / "history.jsonl").read_text() == ""
+    snapshot = json.loads((tmp_path / "history.json").read_text(encoding="utf-8"))
+    assert snapshot["food"]["count"] == 10
+    assert snapshot["food"]["created_at"] == "2023-10-01T12:00:00"
+    assert _journal(tmp_path).view() == store.view()
+
+
+def test_history_route_filters_sorts_and_pages(client, isolated_history):
+    for i, topic in enumerate(["food", "seafood", "travel"]):
+        isolated_history.record(topic, f"{topic}.json", i, True, at=f"2023-10-0{i + 1}T00:00:00")
+
+    assert set(client.get("/flashcards/history").json()) == {"food", "seafood", "travel"}
+
+    page = client.get("/flashcards/history", params={"q": "food", "limit": 1}).json()
+    assert page["total"] == 2
+    assert [e["topic"] for e in page["items"]] == ["seafood"]
+
+    page = client.get("/flashcards/history", params={"sort": "updated_at", "order": "asc", "offset": 1}).json()
+    assert [e["topic"] for e in page["items"]] == ["seafood", "travel"]
+
+    assert client.get("/flashcards/history", params={"sort": "nope"}).status_code == 400
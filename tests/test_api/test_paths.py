@@ -0,0 +1,120 @@
+import json
+import os
+import pytest
+from app import paths, tts
+from app.flashcard_utils import get_topic_file, iter_topic_files
+
+
+def _write(path, data=b""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_decks_are_found_in_either_layout(tmp_path):
+    data = str(tmp_path)
+    sharded = _write(paths.deck_path(data, "food_20231001120000.json", layout="sharded"))
+    flat = _write(paths.deck_path(data, "drinks_20231001120000.json", layout="flat"))
+    _write(os.path.join(data, "food_court_20231001120000.json"))
+
+    assert os.path.dirname(sharded) == os.path.join(data, paths.shard_of("food"))
+    assert get_topic_file("food", data) == sharded
+    assert get_topic_file("drinks", data) == flat
+    assert get_topic_file("fruit", data) is None
+    assert [t for t, _ in iter_topic_files(data)] == ["drinks", "food", "food_court"]
+
+
+def test_namespaces_are_separate_roots(tmp_path):
+    data = str(tmp_path)
+    mine = _write(paths.deck_path(data, "food_20231001120000.json", namespace="alice"))
+    assert mine.startswith(os.path.join(data, "users", "alice"))
+    assert paths.find_topic_deck(data, "food") is None
+    assert paths.find_topic_deck(data, "food", namespace="alice") == mine
+    with pytest.raises(ValueError):
+        paths.namespace_root(data, "../bob")
+
+
+def test_audio_index_looks_in_shard_then_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts, "_indexes", {})
+    audio = str(tmp_path)
+    old = _write(os.path.join(audio, "물_1111.mp3"))
+    new = tts.generate_tts("밥", audio)
+
+    assert os.path.dirname(new) == os.path.join(audio, paths.shard_of("밥"))
+    index = tts.get_audio_index(audio)
+    assert index.lookup("물") == old and index.lookup("밥") == new
+    assert len(index) == 2
+
+
+def test_word_ending_in_a_dot_uses_the_same_shard_as_its_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts, "_indexes", {})
+    audio, data = str(tmp_path / "audio"), str(tmp_path / "decks")
+    _write(os.path.join(audio, "감사합니다._1234.mp3"), b"mp3")
+
+    paths.migrate(data, audio)
+
+    shard = os.path.join(audio, paths.shard_of("감사합니다."))
+    assert paths.audio_dir_for(audio, "감사합니다.", layout="sharded") == shard
+    assert os.path.exists(os.path.join(shard, "감사합니다._1234.mp3"))
+    assert tts.get_audio_index(audio).lookup("감사합니다.") == os.path.join(shard, "감사합니다._1234.mp3")
+
+
+def test_migrate_moves_files_and_rewrites_audio_paths(tmp_path):
+    data, audio = str(tmp_path / "decks"), str(tmp_path / "audio")
+    clip = _write(os.path.join(audio, "밥_1111.mp3"), b"mp3")
+    deck = _write(os.path.join(data, "food_20231001120000.json"))
+    with open(deck, "w", encoding="utf-8") as f:
+        json.dump([{"word": "밥", "tts_path": clip}], f, ensure_ascii=False)
+    _write(os.path.join(data, "history.json"), b"{}")
+
+    report = paths.migrate(data, audio)
+
+    assert report == {"audio_moved": 1, "decks_moved": 1, "paths_rewritten": 1, "skipped": 0}
+    moved = paths.find_topic_deck(data, "food")
+    assert moved == paths.deck_path(data, "food_20231001120000.json", layout="sharded")
+    with open(moved, encoding="utf-8") as f:
+        card = json.load(f)[0]
+    assert card["tts_path"] == os.path.join(audio, paths.shard_of("밥"), "밥_1111.mp3")
+    assert os.path.exists(card["tts_path"]) and paths.find_audio(clip) == card["tts_path"]
+    assert sorted(os.listdir(data)) == [paths.shard_of("food"), "history.json"]
+    assert paths.migrate(data, audio)["decks_moved"] == 0
+
+
+def test_newer_flat_copy_wins_during_migration(tmp_path):
+    data = str(tmp_path)
+    sharded = _write(paths.deck_path(data, "food_20231001120000.json", layout="sharded"), b"[]")
+    flat = _write(os.path.join(data, "food_20231001120000.json"), b'[{"word": "new"}]')
+    os.utime(sharded, ns=(1, 1))
+
+    assert paths.find_deck(data, "food_20231001120000.json") == flat
+    paths.migrate(data, str(tmp_path / "audio"))
+    with open(sharded, encoding="utf-8") as f:
+        assert json.load(f) == [{"word": "new"}]
+
+
+def test_migrate_keeps_cards_saved_while_it_rewrites_a_deck(tmp_path, monkeypatch):
+    data, audio = str(tmp_path / "decks"), str(tmp_path / "audio")
+    clip = _write(os.path.join(audio, "밥_1111.mp3"), b"mp3")
+    deck = _write(os.path.join(data, "food_20231001120000.json"))
+    with open(deck, "w", encoding="utf-8") as f:
+        json.dump([{"word": "밥", "tts_path": clip}], f, ensure_ascii=False)
+    dump_json = paths.dump_json
+
+    def api_saves_meanwhile(cards, path, fmt=None):
+        dump_json(cards, path, fmt)
+        if not api_saves_meanwhile.done:
+            # the API appends a card between migrate's read and its replace
+            api_saves_meanwhile.done = True
+            with open(deck, "w", encoding="utf-8") as f:
+                json.dump([{"word": "밥", "tts_path": clip}, {"word": "물"}], f, ensure_ascii=False)
+            os.utime(deck, ns=(1, 1))
+
+    api_saves_meanwhile.done = False
+    monkeypatch.setattr(paths, "dump_json", api_saves_meanwhile)
+    paths.migrate(data, audio)
+
+    with open(paths.find_topic_deck(data, "food"), encoding="utf-8") as f:
+        cards = json.load(f)
+    assert [c["word"] for c in cards] == ["밥", "물"]
+    assert cards[0]["tts_path"] == os.path.join(audio, paths.shard_of("밥"), "밥_1111.mp3")
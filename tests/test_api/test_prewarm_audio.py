@@ -0,0 +1,38 @@
+import io
+import json
+import os
+from app import paths, tts
+from app.prewarm_audio import prewarm
+
+
+def _deck(tmp_path, name, cards):
+    path = tmp_path / "decks" / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(cards, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def test_prewarm_fills_missing_audio_and_resumes(tmp_path, monkeypatch, client):
+    monkeypatch.setattr(tts, "_indexes", {})
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    (audio_dir / "물_1234.mp3").write_bytes(b"mp3")
+    food = _deck(tmp_path, "food_20231001120000.json", [{"word": "밥"}, {"word": "물", "tts_path": "/gone.mp3"}])
+    drinks = _deck(tmp_path, "drinks_20231001120000.json", [{"word": "물"}, {"word": "밥"}])
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    summary = prewarm(str(tmp_path / "decks"), str(audio_dir), workers=2, checkpoint_path=checkpoint, out=io.StringIO())
+
+    # 물 already had a file and 밥 is synthesized once for both decks
+    assert sorted(e.name.split("_")[0] for e in paths.iter_audio(str(audio_dir))) == ["물", "밥"]
+    assert summary["synthesized"] == 1 and summary["cards_updated"] == 4
+    for deck in (food, drinks):
+        cards = json.loads(deck.read_text(encoding="utf-8"))
+        assert all(os.path.exists(c["tts_path"]) for c in cards)
+    # synced clients get the new audio paths too
+    changes = client.get("/sync", params={"since": 0}).json()["changes"]
+    assert len(changes) == 4 and all(os.path.exists(c["card"]["tts_path"]) for c in changes)
+
+    # a second run skips every checkpointed deck
+    summary = prewarm(str(tmp_path / "decks"), str(audio_dir), checkpoint_path=checkpoint, out=io.StringIO())
+    assert summary["decks"] == 0
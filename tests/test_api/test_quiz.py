@@ -0,0 +1,77 @@
+from app.quiz import DistractorIndex
+from app.services import quiz_service
+
+FOOD = [
+    {"word": "밥", "definition": "cooked rice eaten with a meal", "synonyms": ["식사", "진지"], "antonyms": ["굶주림", "공복"]},
+    {"word": "식사", "definition": "a meal eaten at a regular time", "synonyms": ["밥", "끼니"], "antonyms": ["금식", "단식"]},
+    {"word": "국수", "definition": "long thin noodles served in soup", "synonyms": ["면", "누들"], "antonyms": ["밥", "빵"]},
+    {"word": "라면", "definition": "instant noodles in a spicy soup", "synonyms": ["인스턴트면", "면"], "antonyms": ["집밥", "요리"]},
+    {"word": "김치", "definition": "fermented spicy cabbage side dish", "synonyms": ["김장", "절임"], "antonyms": ["생채소", "샐러드"]},
+    {"word": "물", "definition": "clear liquid you drink", "synonyms": ["생수", "식수"], "antonyms": ["불", "기름"]},
+]
+
+
+def _index(**cards_by_topic) -> DistractorIndex:
+    index = DistractorIndex()
+    for topic, cards in cards_by_topic.items():
+        index.add(topic, cards)
+    return index
+
+
+def test_neighbours_are_kept_current_as_cards_are_added():
+    index = _index(food=FOOD[:3])
+    rice_id = index.topic_cards("food")[0]["id"]
+    assert [c["word"] for c in index.near(rice_id)][:1] == ["식사"]  # shares "meal" and "eaten"
+
+    index.add("food", [FOOD[3]])
+    noodles = index.topic_cards("food")[2]
+    # the earlier card picked up the newcomer without a rebuild
+    assert [c["word"] for c in index.near(noodles["id"])][0] == "라면"
+    # re-adding a saved card changes nothing, and the same word in another topic is no distractor
+    assert index.add("food", [FOOD[0]]) == 0
+    index.add("dinner", [dict(FOOD[0])])
+    assert all(c["word"] != "밥" for c in index.near(rice_id))
+
+
+def test_multiple_choice_quiz_from_stored_cards(client, isolated_quiz_index):
+    isolated_quiz_index.add("food", FOOD)
+    response = client.get("/quiz", params={"topic": "Food", "n": 5, "type": "meaning", "seed": 1})
+    assert response.status_code == 200
+    questions = response.json()["questions"]
+    assert len(questions) == 5
+    by_word = {c["word"]: c for c in FOOD}
+    for q in questions:
+        assert q["type"] == "meaning" and len(q["options"]) == 4 and len(set(q["options"])) == 4
+        word = q["prompt"].split("What does ")[1].split(" mean?")[0]
+        assert q["options"][q["answer"]] == by_word[word]["definition"]
+        # a synonym's definition would also be right, so it is never offered
+        for synonym in by_word[word]["synonyms"]:
+            if synonym in by_word:
+                assert by_word[synonym]["definition"] not in q["options"]
+
+    mixed = client.get("/quiz", params={"topic": "food", "n": 6, "seed": 2}).json()["questions"]
+    assert len(mixed) == 6 and len({q["card_id"] for q in mixed}) == 6
+    for q in mixed:
+        if q["type"] == "antonym":
+            word = q["prompt"].rsplit(" ", 1)[1].rstrip("?")
+            assert q["options"][q["answer"]] in by_word[word]["antonyms"]
+
+
+def test_matching_drill_pairs_words_with_their_definitions(client, isolated_quiz_index):
+    isolated_quiz_index.add("food", FOOD)
+    drill = client.get("/quiz", params={"topic": "food", "n": 4, "type": "matching"}).json()["questions"][0]
+    definitions = {c["word"]: c["definition"] for c in FOOD}
+    assert len(drill["words"]) == 4
+    for word, answer in zip(drill["words"], drill["answer"]):
+        assert drill["definitions"][answer] == definitions[word]
+
+
+def test_saved_cards_are_quizzable_and_errors(client, isolated_quiz_index):
+    quiz_service.add_quiz_cards("drinks", [FOOD[5], {"word": "차", "definition": "hot tea you drink"}])
+    assert len(isolated_quiz_index.topic_cards("drinks")) == 2
+
+    assert client.get("/quiz", params={"topic": "nothing"}).status_code == 404
+    assert client.get("/quiz", params={"topic": "drinks", "type": "essay"}).status_code == 400
+    # one other card in the library is enough for a two-choice question
+    response = client.get("/quiz", params={"topic": "drinks", "type": "word", "choices": 2, "n": 1})
+    assert response.status_code == 200 and len(response.json()["questions"][0]["options"]) == 2
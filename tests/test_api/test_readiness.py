@@ -0,0 +1,63 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import health_service
+
+
+@pytest.fixture
+def cold(monkeypatch, tmp_path):
+    # a worker that hasn't warmed up yet, with its storage in tmp_path
+    monkeypatch.setattr(health_service, "_warmup", {"done": False, "steps": {}})
+    for name in ("DATA_DIR", "STATE_DIR", "AUDIO_DIR"):
+        (tmp_path / name).mkdir()
+        monkeypatch.setattr(health_service, name, str(tmp_path / name))
+    return tmp_path
+
+
+def test_not_ready_until_warm_up_ran(client, cold, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(
+        health_service,
+        "WARMUP_STEPS",
+        [("word_index", lambda: loaded.append("word_index")), ("llm_client", lambda: loaded.append("llm"))],
+    )
+    assert client.get("/healthz").json()["status"] == "alive"
+    response = client.get("/readyz")
+    assert response.status_code == 503 and response.json()["status"] == "warming_up"
+
+    health_service.warm_up()
+
+    response = client.get("/readyz")
+    body = response.json()
+    assert response.status_code == 200 and loaded == ["word_index", "llm"]
+    assert body["status"] == "ready"
+    assert set(body["dependencies"]) == {"storage", "audio_dir", "mistral", "tts"}
+    assert all("ms" in check for check in body["dependencies"].values())
+
+
+def test_failed_llm_client_degrades_but_storage_failure_blocks(client, cold, monkeypatch):
+    def no_key():
+        raise RuntimeError("MISTRAL_API_KEY not configured")
+
+    monkeypatch.setattr(health_service, "WARMUP_STEPS", [("llm_client", no_key)])
+    report = health_service.warm_up()
+    assert report["steps"]["llm_client"]["ok"] is False
+
+    body = client.get("/readyz").json()
+    assert body["status"] == "degraded" and "MISTRAL_API_KEY" in body["dependencies"]["mistral"]["error"]
+
+    monkeypatch.setattr(health_service, "AUDIO_DIR", str(cold / "missing"))
+    response = client.get("/readyz")
+    assert response.status_code == 503 and response.json()["status"] == "unavailable"
+
+
+def test_lifespan_warms_up_in_the_background(cold, monkeypatch):
+    monkeypatch.setattr(health_service, "WARMUP_STEPS", [("history", lambda: time.sleep(0.05))])
+    with TestClient(app) as client:
+        assert client.get("/healthz").status_code == 200
+        deadline = time.time() + 5
+        while client.get("/readyz").status_code != 200:
+            assert time.time() < deadline
+            time.sleep(0.01)
+    assert health_service._warmup["steps"]["history"]["ok"]
@@ -0,0 +1,100 @@
+import json
+import os
+from collections import OrderedDict
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.srs import ReviewLog, ReviewScheduler, sm2
+from app.services import review_service
+
+
+client = TestClient(app)
+
+
+def test_sm2_intervals_grow_and_reset():
+    interval, ease, reps = sm2(0.0, 2.5, 0, 4)
+    assert (interval, reps) == (1.0, 1)
+    interval, ease, reps = sm2(interval, ease, reps, 4)
+    assert interval == 6.0
+    interval, ease, reps = sm2(interval, ease, reps, 5)
+    assert interval > 6.0
+    interval, ease, reps = sm2(interval, ease, reps, 1)
+    assert (interval, reps) == (1.0, 0)
+
+
+def test_scheduler_orders_by_due_and_topic():
+    s = ReviewScheduler()
+    s.add_card("a", "food", "밥", "food_20231001120000.json")
+    s.add_card("b", "food", "물", "food_20231001120000.json")
+    s.add_card("c", "travel", "비행기", "travel_20231001120000.json")
+
+    assert s.next_due().card_id == "a"
+    s.review("a", 4, now=1000.0)
+    assert s.next_due().card_id == "b"
+    assert s.next_due("travel").card_id == "c"
+    assert s.next_due("unknown") is None
+
+
+def test_review_is_logged_while_the_scheduler_is_locked(tmp_path):
+    s = ReviewScheduler()
+    s.add_card("a", "food", "밥", "food_20231001120000.json")
+    held = []
+
+    class Log(ReviewLog):
+        def append(self, *record):
+            held.append(s._lock.locked())
+            super().append(*record)
+
+    log = Log(str(tmp_path / "reviews.tsv"))
+    s.review("a", 4, now=1000.0, log=log)
+    s.review("a", 2, now=2000.0, log=log)
+    assert held == [True, True]
+    assert [(card_id, grade) for _, card_id, grade, *_ in log.replay()] == [("a", 4), ("a", 2)]
+
+
+@pytest.fixture
+def review_env(tmp_path, monkeypatch):
+    deck = [{"word": "안녕하세요", "definition": "Hello"}, {"word": "감사합니다", "definition": "Thanks"}]
+    (tmp_path / "greetings_20231001120000.json").write_text(json.dumps(deck), encoding="utf-8")
+    monkeypatch.setattr(review_service, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(review_service, "_review_log", ReviewLog(str(tmp_path / "reviews.log")))
+    monkeypatch.setattr(review_service, "_scheduler", None)
+    monkeypatch.setattr(review_service, "_deck_cache", OrderedDict())
+    return tmp_path
+
+
+def test_review_routes_and_log_replay(review_env):
+    resp = client.get("/review/next", params={"topic": "greetings"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["card"]["word"] == "안녕하세요"
+    card_id = data["schedule"]["card_id"]
+
+    resp = client.post(f"/review/{card_id}", json={"grade": 5})
+    assert resp.status_code == 200
+    assert resp.json()["schedule"]["interval_days"] == 1.0
+    assert client.get("/review/next").json()["card"]["word"] == "감사합니다"
+
+    assert client.post(f"/review/{card_id}", json={"grade": 9}).status_code == 400
+    assert client.post("/review/missing", json={"grade": 3}).status_code == 404
+
+    # a rebuilt scheduler replays the log and keeps the reviewed card scheduled later
+    review_service._scheduler = None
+    assert client.get("/review/next").json()["card"]["word"] == "감사합니다"
+
+
+def test_next_card_reads_the_deck_once_until_it_changes(review_env, monkeypatch):
+    review_service.get_scheduler()
+    reads = []
+    load_json = review_service.load_json
+    monkeypatch.setattr(review_service, "load_json", lambda path: reads.append(path) or load_json(path))
+
+    for _ in range(3):
+        assert client.get("/review/next").json()["card"]["definition"] == "Hello"
+    assert len(reads) == 1
+
+    deck = review_env / "greetings_20231001120000.json"
+    deck.write_text(json.dumps([{"word": "안녕하세요", "definition": "Hi"}]), encoding="utf-8")
+    os.utime(deck, ns=(1, 1))
+    assert client.get("/review/next").json()["card"]["definition"] == "Hi"
+    assert len(reads) == 2
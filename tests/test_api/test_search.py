@@ -0,0 +1,56 @@
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+from app.search_index import SearchIndex, tokenize
+from app.services import search_service
+
+
+client = TestClient(app)
+
+CARDS = [
+    {"card_id": "1", "topic": "greetings", "word": "안녕하세요", "definition": "Hello", "synonyms": ["반갑습니다"]},
+    {"card_id": "2", "topic": "greetings", "word": "감사합니다", "definition": "Thank you"},
+    {"card_id": "3", "topic": "food", "word": "김치", "definition": "Fermented vegetables", "example": "김치를 먹어요."},
+]
+
+
+def test_tokenize_hangul_and_choseong():
+    tokens = tokenize("안녕")
+    assert {"안", "녕", "안녕", "^ㅇ", "^ㄴ", "^ㅇㄴ"} <= set(tokens)
+    assert tokenize("ㅇㄴ", query=True) == ["^ㅇ", "^ㄴ", "^ㅇㄴ"]
+    assert "^ㅇ" not in tokenize("안녕", query=True)
+
+
+def test_search_partial_choseong_and_topic(tmp_path):
+    index = SearchIndex(str(tmp_path / "idx.jsonl"))
+    index.add(CARDS)
+    assert index.search("안녕")[0]["word"] == "안녕하세요"
+    assert index.search("ㄱㅅㅎㄴㄷ")[0]["word"] == "감사합니다"
+    assert index.search("ferm")[0]["word"] == "김치"
+    assert [r["word"] for r in index.search("안녕", topic="food")] == []
+    assert index.search("ㄱㅅ", jamo=False) == []
+
+    # snapshot + journal tail round-trip
+    index.save_snapshot()
+    index.add([{"card_id": "4", "topic": "food", "word": "김밥", "definition": "Rice roll"}])
+    reloaded = SearchIndex(index.journal_path)
+    assert reloaded.load()
+    assert reloaded.tail_docs == 1
+    assert {r["word"] for r in reloaded.search("김")} == {"김치", "김밥"}
+
+
+def test_search_route_builds_index_from_decks(tmp_path, monkeypatch):
+    deck = [{"word": "안녕하세요", "definition": "Hello"}]
+    (tmp_path / "greetings_20231001120000.json").write_text(json.dumps(deck), encoding="utf-8")
+    monkeypatch.setattr(search_service, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(search_service, "SEARCH_INDEX_FILE", str(tmp_path / "idx.jsonl"))
+    monkeypatch.setattr(search_service, "_index", None)
+
+    resp = client.get("/flashcards/search", params={"q": "ㅇㄴㅎ"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 1
+    assert data["results"][0]["file"] == "greetings_20231001120000.json"
+
+    search_service.index_cards("greetings", "greetings_20231001120000.json", [{"word": "반가워요"}])
+    assert client.get("/flashcards/search", params={"q": "반가"}).json()["total"] == 1
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import pytest
+from app import stages
+from app.stages import Stage, StageOverloaded
+
+
+def _blocked_stage(workers=1, queue_size=1):
+    stage = Stage("test", workers, queue_size)
+    release = threading.Event()
+    futures = [stage.submit(release.wait) for _ in range(workers + queue_size)]
+    return stage, release, futures
+
+
+def test_full_stage_rejects_and_reports_depth():
+    stage, release, futures = _blocked_stage(workers=1, queue_size=1)
+    with pytest.raises(StageOverloaded) as exc:
+        stage.submit(lambda: None)
+    assert exc.value.retry_after >= 1
+
+    status = stage.status()
+    assert status["rejected"] == 1
+    assert status["running"] + status["queued"] == 2
+
+    release.set()
+    for f in futures:
+        f.result(timeout=5)
+    # slots are returned once tasks finish
+    assert stage.submit(lambda: "ok").result(timeout=5) == "ok"
+    assert stage.status()["completed"] == 3
+
+
+def test_generation_stage_full_returns_503(client, monkeypatch):
+    stage, release, _ = _blocked_stage(workers=1, queue_size=0)
+    monkeypatch.setattr(stages, "generation", stage)
+    try:
+        resp = client.post("/flashcards", json={"topic": "food"})
+        assert resp.status_code == 503
+        assert int(resp.headers["Retry-After"]) >= 1
+        # cheap routes run on their own stage and stay available
+        assert client.get("/flashcards/saved").status_code == 200
+    finally:
+        release.set()
+
+
+def test_metrics_expose_stages(client):
+    data = client.get("/metrics").json()
+    assert set(data["stages"]) == {"generation", "llm", "tts", "disk", "prefetch"}
+    assert "utilization" in data["stages"]["llm"]
+
+
+def test_prefetch_yields_to_interactive_generation(client, monkeypatch):
+    busy, release, _ = _blocked_stage(workers=1, queue_size=1)
+    monkeypatch.setattr(stages, "generation", busy)
+    monkeypatch.setattr(stages, "prefetch", Stage("prefetch", 1, 0))
+    try:
+        # a learner is waiting on the generation stage: read-ahead is refused
+        resp = client.post("/flashcards/prefetch", json={"topic": "food"})
+        assert resp.status_code == 503
+    finally:
+        release.set()
+
+    monkeypatch.setattr(stages, "generation", Stage("generation", 1, 1))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.routes.flashcards.create_flashcards_service", lambda data, client_id=None: {"cards": []})
+        resp = client.post("/flashcards/prefetch", json={"topic": "food", "count": 5})
+    assert resp.status_code == 200
+    assert stages.prefetch.status()["completed"] == 1
+
+
+def test_cancelled_queued_task_returns_its_slot():
+    stage, release, futures = _blocked_stage(workers=1, queue_size=1)
+    # the queued task is cancelled before it runs, as when an awaiting request goes away
+    assert futures[1].cancel()
+    assert stage.status()["queued"] == 0
+    assert stage.submit(lambda: "ok") is not None
+
+    release.set()
+    futures[0].result(timeout=5)
+
+
+def test_cancelled_awaiter_frees_the_stage():
+    stage = Stage("test", 1, 1)
+    release = threading.Event()
+    running = stage.submit(release.wait)
+
+    async def cancel_waiting_request():
+        task = asyncio.ensure_future(stage.run(lambda: None))
+        await asyncio.sleep(0)
+        assert stage.status()["queued"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_waiting_request())
+    assert stage.status()["queued"] == 0
+    release.set()
+    running.result(timeout=5)
+    assert stage.submit(lambda: "ok").result(timeout=5) == "ok"
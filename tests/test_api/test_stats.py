@@ -0,0 +1,91 @@
+import json
+import numpy as np
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import review_service, stats_service
+from app.srs import DAY, ReviewLog
+from app.stats import LearningStats, ReviewSnapshot
+
+
+def _write_log(path):
+    log = ReviewLog(str(path))
+    t0 = 1_700_000_000.0
+    log.append(t0, "c1", 4, 0.0, 1.0, 2.5)
+    log.append(t0, "c2", 1, 0.0, 1.0, 2.3)
+    log.append(t0 + DAY, "c1", 5, 1.0, 6.0, 2.6)
+    log.append(t0 + DAY, "c2", 2, 1.0, 1.0, 2.1)
+    return log, t0
+
+
+def test_snapshot_sync_is_incremental(tmp_path):
+    log, t0 = _write_log(tmp_path / "reviews.log")
+    topics = {"c1": "food", "c2": "travel"}
+    snap = ReviewSnapshot(str(tmp_path / "stats"))
+    rows = snap.sync(log.path, topic_of=topics.get)
+    assert len(rows) == 4
+    assert snap.card_topics == ["food", "travel"]
+    assert len(snap.sync(log.path)) == 0
+
+    log.append(t0 + 2 * DAY, "c2", 4, 1.0, 1.0, 2.1)
+    assert len(snap.sync(log.path)) == 1
+
+    # reopening reads the committed snapshot from disk
+    reopened = ReviewSnapshot(str(tmp_path / "stats"))
+    assert len(reopened.reviews()) == 5
+    assert reopened.card_ids == ["c1", "c2"]
+
+
+def test_uncommitted_card_lines_are_dropped_on_load(tmp_path):
+    log, t0 = _write_log(tmp_path / "reviews.log")
+    ReviewSnapshot(str(tmp_path / "stats")).sync(log.path)
+    # a crash after appending a card line but before committing meta.json
+    with open(tmp_path / "stats" / "cards.tsv", "a", encoding="utf-8") as f:
+        f.write("stale\tfood\n")
+
+    log.append(t0 + 2 * DAY, "c3", 4, 0.0, 1.0, 2.5)
+    ReviewSnapshot(str(tmp_path / "stats")).sync(log.path, topic_of={"c3": "travel"}.get)
+
+    reopened = ReviewSnapshot(str(tmp_path / "stats"))
+    assert reopened.card_ids == ["c1", "c2", "c3"] and reopened.card_topics[2] == "travel"
+    assert reopened.card_ids[int(reopened.reviews()["card"][-1])] == "c3"
+
+
+def test_learning_stats_reports(tmp_path):
+    log, t0 = _write_log(tmp_path / "reviews.log")
+    snap = ReviewSnapshot(str(tmp_path / "stats"))
+    stats = LearningStats()
+    stats.update(snap.sync(log.path, topic_of={"c1": "food", "c2": "travel"}.get))
+
+    assert stats.retention_curve() == [{"days": 1, "reviews": 2, "retention": 0.5}]
+    forecast = stats.forecast(t0 + DAY, days=10)
+    assert forecast[1] == 1 and forecast[6] == 1
+
+    difficulty = stats.topic_difficulty(np.array([0, 1]), ["food", "travel"])
+    assert difficulty[0]["topic"] == "travel"
+    assert difficulty[0]["lapse_rate"] == 1.0
+
+
+def test_stats_endpoint_after_new_reviews(tmp_path, monkeypatch):
+    deck = [{"word": "밥", "definition": "rice"}, {"word": "물", "definition": "water"}]
+    (tmp_path / "food_20231001120000.json").write_text(json.dumps(deck), encoding="utf-8")
+    log_path = str(tmp_path / "reviews.log")
+    monkeypatch.setattr(review_service, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(review_service, "_review_log", ReviewLog(log_path))
+    monkeypatch.setattr(review_service, "_scheduler", None)
+    monkeypatch.setattr(stats_service, "STATS_DIR", str(tmp_path / "stats"))
+    monkeypatch.setattr(stats_service, "REVIEW_LOG_FILE", log_path)
+    monkeypatch.setattr(stats_service, "_snapshot", None)
+    monkeypatch.setattr(stats_service, "_stats", None)
+    monkeypatch.setattr(stats_service, "_topic_codes", ([], np.zeros(0, dtype=np.int64)))
+    client = TestClient(app)
+
+    assert client.get("/stats").json()["total_reviews"] == 0
+    card_id = client.get("/review/next").json()["schedule"]["card_id"]
+    assert client.post(f"/review/{card_id}", json={"grade": 4}).status_code == 200
+
+    # the new review brings a new card into the snapshot, so the topic codes are rebuilt
+    response = client.get("/stats", params={"topic": "food"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_reviews"] == 1 and body["cards_reviewed"] == 1
+    assert body["difficulty"][0]["topic"] == "food"
@@ -0,0 +1,47 @@
+import json
+from app.history import load_history
+from app.storage import convert, dump_json, is_compressed, load_json
+
+DECK = [{"word": "안녕하세요", "definition": "hello", "synonyms": ["반갑습니다"]}]
+
+
+def test_both_formats_round_trip(tmp_path):
+    plain, packed = tmp_path / "plain.json", tmp_path / "packed.json"
+    dump_json(DECK, str(plain), "json")
+    dump_json(DECK, str(packed), "gzip")
+    assert not is_compressed(str(plain)) and is_compressed(str(packed))
+    assert load_json(str(plain)) == load_json(str(packed)) == DECK
+    # the default format stays human-readable
+    assert "안녕하세요" in plain.read_text(encoding="utf-8")
+
+
+def test_convert_rewrites_decks_and_history(tmp_path):
+    dump_json(DECK, str(tmp_path / "greetings_20231001120000.json"), "json")
+    dump_json({"greetings": {"count": 1}}, str(tmp_path / "history.json"), "json")
+
+    report = convert(str(tmp_path), "gzip")
+    assert report["converted"] == 2
+    assert report["bytes_after"] < report["bytes_before"]
+    assert load_history(str(tmp_path / "history.json")) == {"greetings": {"count": 1}}
+    assert convert(str(tmp_path), "gzip")["converted"] == 0
+
+    convert(str(tmp_path), "json")
+    deck = tmp_path / "greetings_20231001120000.json"
+    assert json.loads(deck.read_text(encoding="utf-8")) == DECK
+
+
+def test_saved_route_reads_compressed_deck(client, tmp_path, monkeypatch):
+    from app.services import saved_service
+
+    dump_json(DECK, str(tmp_path / "greetings_20231001120000.json"), "gzip")
+    monkeypatch.setattr(saved_service, "DATA_DIR", str(tmp_path))
+    resp = client.get("/flashcards/saved/greetings_20231001120000.json")
+    assert resp.json()["flashcards"] == DECK
+
+
+def test_saved_route_serves_only_decks(client, tmp_path, monkeypatch):
+    from app.services import saved_service
+
+    (tmp_path / "library.fcb").write_bytes(b"FCBUNDLE\x00\xff")
+    monkeypatch.setattr(saved_service, "DATA_DIR", str(tmp_path))
+    assert client.get("/flashcards/saved/library.fcb").status_code == 404
@@ -0,0 +1,63 @@
+from app import stages
+from app.stages import StageOverloaded
+from app.sync import ChangeFeed
+
+
+def test_feed_serves_changes_after_a_revision(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "changes.jsonl"))
+    feed.load()
+    feed.record("food", [{"word": "밥"}, {"word": "물"}])
+    feed.record("food", [{"word": "밥", "definition": "rice"}])
+
+    changes, more, head = feed.since(1, limit=10)
+    assert [c["rev"] for c in changes] == [2, 3] and not more and head == 3
+
+    # reload and compaction keep revisions; only the superseded entry goes
+    reloaded = ChangeFeed(feed.path)
+    reloaded.load()
+    assert reloaded.feed_id == feed.feed_id and reloaded.rev == 3
+    reloaded.compact()
+    changes, _, _ = reloaded.since(0, limit=10)
+    assert [(c["rev"], c["card"]["word"]) for c in changes] == [(2, "물"), (3, "밥")]
+
+
+def test_sync_route_pages_and_resets(client, isolated_sync):
+    isolated_sync.record("food", [{"word": w} for w in ("밥", "물", "김치")])
+
+    page = client.get("/sync", params={"since": 0, "limit": 2}).json()
+    assert [c["card"]["word"] for c in page["changes"]] == ["밥", "물"]
+    assert page["more"] and page["rev"] == 2 and page["head"] == 3
+
+    rest = client.get("/sync", params={"since": page["rev"]}).json()
+    assert [c["card"]["word"] for c in rest["changes"]] == ["김치"]
+    assert not rest["more"] and rest["rev"] == 3
+    assert client.get("/sync", params={"since": 3}).json()["changes"] == []
+
+    # a cursor from another feed gets everything again
+    reset = client.get("/sync", params={"since": 99}).json()
+    assert reset["reset"] and len(reset["changes"]) == 3
+    # so does a client naming another feed, whatever its cursor
+    other = client.get("/sync", params={"since": 2, "feed": "rebuilt-elsewhere"}).json()
+    assert other["reset"] and len(other["changes"]) == 3
+    assert not client.get("/sync", params={"since": 2, "feed": page["feed"]}).json()["reset"]
+
+
+def test_sync_websocket_pushes_deltas(client, isolated_sync):
+    isolated_sync.record("food", [{"word": "밥"}])
+    with client.websocket_connect("/sync/ws?since=0") as ws:
+        first = ws.receive_json()
+        assert [c["card"]["word"] for c in first["changes"]] == ["밥"]
+        isolated_sync.record("food", [{"word": "물"}])
+        pushed = ws.receive_json()
+        assert [c["rev"] for c in pushed["changes"]] == [2]
+
+
+def test_sync_websocket_does_not_need_the_disk_stage(client, isolated_sync, monkeypatch):
+    class Saturated:
+        async def run(self, fn, *args, **kwargs):
+            raise StageOverloaded("disk", 1.0)
+
+    monkeypatch.setattr(stages, "disk", Saturated())
+    isolated_sync.record("food", [{"word": "밥"}])
+    with client.websocket_connect("/sync/ws?since=0") as ws:
+        assert [c["card"]["word"] for c in ws.receive_json()["changes"]] == ["밥"]
@@ -0,0 +1,70 @@
+import json
+from unittest.mock import MagicMock, patch
+from app import tracing
+from app.mistral_client import _sync_call_with_retry
+from app.services import flashcard_service
+
+
+def test_spans_nest_and_are_noops_outside_a_trace(isolated_traces):
+    with tracing.span("outside") as attrs:
+        attrs["ignored"] = True
+    assert tracing.current_trace_id() is None
+
+    with tracing.trace_request("GET /x", "abc") as root:
+        assert tracing.current_trace_id() == "abc"
+        with tracing.span("outer"):
+            with tracing.span("inner", n=1):
+                pass
+        root["status"] = 200
+
+    trace = isolated_traces.get("abc")
+    spans = {s["name"]: s for s in trace["spans"]}
+    assert set(spans) == {"GET /x", "outer", "inner"}
+    assert spans["inner"]["parent_id"] == spans["outer"]["span_id"]
+    assert spans["outer"]["parent_id"] == spans["GET /x"]["span_id"]
+    assert trace["attrs"] == {"status": 200} and not trace["error"]
+
+
+def test_incoming_ids_prefer_traceparent():
+    tid = "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert tracing.incoming_ids({"traceparent": f"00-{tid}-00f067aa0ba902b7-01"}) == (tid, "00f067aa0ba902b7")
+    assert tracing.incoming_ids({"x-trace-id": "client-42"}) == ("client-42", None)
+    generated, parent = tracing.incoming_ids({"x-trace-id": "bad id!"})
+    assert len(generated) == 32 and parent is None
+
+
+def test_trace_log_rotates(tmp_path):
+    log = tracing.TraceLog(str(tmp_path / "t.jsonl"), 200, 2)
+    for i in range(10):
+        log.write({"trace_id": str(i), "pad": "x" * 80})
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ["t.jsonl", "t.jsonl.1", "t.jsonl.2"]
+    last = [json.loads(line) for line in (tmp_path / "t.jsonl").read_text().splitlines()]
+    assert last[-1]["trace_id"] == "9"
+
+
+def test_generation_request_is_traced_end_to_end(client, isolated_traces, tmp_path, monkeypatch):
+    monkeypatch.setattr(flashcard_service, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(flashcard_service, "AUDIO_DIR", str(tmp_path / "audio"))
+    monkeypatch.setattr(flashcard_service, "register_cards", lambda *a: None)
+    monkeypatch.setattr(flashcard_service, "index_cards", lambda *a: None)
+    llm = MagicMock()
+    llm.chat.complete.return_value.choices[0].message.content = json.dumps(
+        [{"word": "밥", "definition": "rice"}, {"word": "물", "definition": "water"}]
+    )
+    llm.chat.complete.return_value.usage.total_tokens = 50
+
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=lambda p: _sync_call_with_retry(llm, p)):
+        response = client.post("/flashcards", json={"topic": "food", "count": 2}, headers={"X-Trace-Id": "req-1"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Trace-Id"] == "req-1"
+    names = [s["name"] for s in isolated_traces.get("req-1")["spans"]]
+    assert names.count("mistral.attempt") == 1
+    assert names.count("generate_tts") == 2
+    assert "parse_flashcards" in names and "file.write" in names
+
+    listed = client.get("/debug/traces").json()["traces"]
+    assert listed[0]["trace_id"] == "req-1"
+    assert listed[0]["attrs"]["route"] == "/flashcards" and listed[0]["spans"] == len(names)
+    assert client.get("/debug/traces/nope").status_code == 404
@@ -0,0 +1,48 @@
+import os
+import pytest
+from app import metrics, tts, tts_backends
+from app.tts_backends import FakeBackend, TTSBackend, TTSChain
+
+
+class BrokenBackend(TTSBackend):
+    name = "broken"
+    calls = 0
+
+    def synthesize(self, text, path, lang):
+        BrokenBackend.calls += 1
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise ConnectionError("no network")
+
+
+def test_fake_backend_is_deterministic(tmp_path):
+    a, b = tmp_path / "a.mp3", tmp_path / "b.mp3"
+    FakeBackend().synthesize("안녕", str(a), "ko")
+    FakeBackend().synthesize("안녕", str(b), "ko")
+    assert a.read_bytes() == b.read_bytes()
+
+
+def test_chain_falls_back_and_skips_failing_backend(tmp_path, monkeypatch):
+    # registered for this test only, so the process-wide registry stays as the app defines it
+    monkeypatch.setitem(tts_backends._registry, BrokenBackend.name, BrokenBackend)
+    BrokenBackend.calls = 0
+    chain = TTSChain(["broken", "fake"])
+    paths = [chain.synthesize(w, lambda ext, w=w: str(tmp_path / f"{w}{ext}")) for w in "abcde"]
+
+    assert all(os.path.exists(p) for p in paths)
+    # the broken backend's partial file is removed and, once its breaker opens, it is not tried again
+    assert sorted(os.listdir(tmp_path)) == [f"{w}.mp3" for w in "abcde"]
+    assert BrokenBackend.calls == 3
+    assert chain.status()["broken"]["state"] == "open"
+    assert metrics.snapshot()["timings"]["tts.fake"]["count"] >= 5
+
+
+def test_unknown_or_empty_chain_is_rejected():
+    with pytest.raises(RuntimeError):
+        TTSChain(["nope"])
+
+
+def test_generate_tts_reuses_indexed_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts, "_indexes", {})
+    first = tts.generate_tts("사과", str(tmp_path))
+    assert tts.generate_tts("사과", str(tmp_path)) == first
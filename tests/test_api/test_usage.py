@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock, patch
+from app.services import usage_service
+from app.usage import AdmissionController, BudgetExceeded, UsageLedger
+
+
+def test_ledger_totals_survive_reload(tmp_path):
+    path = str(tmp_path / "usage.jsonl")
+    ledger = UsageLedger(path)
+    ledger.record("food", "a", 100, 50, 0.5)
+    ledger.record("food", "b", 10, 5, 0.1)
+    ledger.record("travel", "a", 1, 2, 0.2)
+
+    summary = UsageLedger(path).summary()
+    assert summary["by_topic"]["food"]["calls"] == 2
+    assert summary["by_topic"]["food"]["total_tokens"] == 165
+    assert summary["by_client"]["a"]["prompt_tokens"] == 101
+    assert summary["by_client"]["a"]["avg_latency_s"] == 0.35
+
+
+def test_admission_rejects_over_budget_and_frees_after_window():
+    ctl = AdmissionController(global_tpm=0, client_tpm=1000, window=60)
+    handle = ctl.admit("a", 800, now=0)
+    try:
+        ctl.admit("a", 300, now=10)
+        assert False, "expected BudgetExceeded"
+    except BudgetExceeded as e:
+        assert e.scope == "client"
+        assert e.retry_after == 50
+    # other clients have their own budget
+    ctl.admit("b", 900, now=10)
+    # settling with the real (smaller) usage frees budget immediately
+    ctl.settle(handle, 200, now=20)
+    ctl.admit("a", 300, now=20)
+    assert ctl.status(now=20)["clients"]["a"]["used"] == 500
+
+
+def test_settle_after_the_window_does_not_leave_used_behind():
+    ctl = AdmissionController(global_tpm=1000, client_tpm=1000, window=60)
+    handle = ctl.admit("a", 800, now=0)
+    # the request outlived the window and nothing expired its entry in the meantime
+    ctl.settle(handle, 200, now=70)
+    assert ctl.status(now=70)["global"]["used"] == 0
+    ctl.admit("b", 1000, now=70)
+    ctl.admit("a", 0, now=200)
+    assert ctl.status(now=200)["global"]["used"] == 0
+
+
+def test_client_windows_are_capped_and_dropped_once_expired():
+    ctl = AdmissionController(global_tpm=0, client_tpm=1000, window=60, max_clients=2)
+    ctl.admit("a", 100, now=0)
+    ctl.admit("b", 100, now=0)
+    # rotating ids past the cap share one budget instead of getting a fresh one each
+    assert ctl.admit("c", 600, now=1)[0] == AdmissionController.SHARED_CLIENT
+    try:
+        ctl.admit("d", 600, now=2)
+        assert False, "expected BudgetExceeded"
+    except BudgetExceeded as e:
+        assert e.scope == "client"
+    assert ctl.admit("unknown", 300, now=2)[0] == AdmissionController.SHARED_CLIENT
+
+    assert set(ctl.status(now=30)["clients"]) == {"a", "b", AdmissionController.SHARED_CLIENT}
+    assert ctl.status(now=100)["clients"] == {}
+    # the table has room again
+    assert ctl.admit("d", 600, now=100)[0] == "d"
+
+
+def test_generation_over_budget_returns_429(client, monkeypatch):
+    monkeypatch.setattr(usage_service, "admission", AdmissionController(global_tpm=0, client_tpm=1000))
+    with patch("app.routes.flashcards.create_flashcards_service", return_value={"generation": {"tokens": 0}}):
+        ok = client.post("/flashcards", json={"topic": "food", "count": 1}, headers={"X-Client-Id": "a"})
+        assert ok.status_code == 200
+        resp = client.post("/flashcards", json={"topic": "food", "count": 10}, headers={"X-Client-Id": "a"})
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+
+
+def test_failed_generation_settles_at_the_tokens_it_spent(client, monkeypatch):
+    monkeypatch.setattr(usage_service, "admission", AdmissionController(global_tpm=10_000, client_tpm=0))
+
+    def spend_then_fail(data, client_id=None):
+        response = MagicMock(usage=MagicMock(prompt_tokens=300, completion_tokens=200))
+        usage_service.record_llm_call(response, "food", client_id, 0.1)
+        raise ValueError("unparseable completion")
+
+    with patch("app.routes.flashcards.create_flashcards_service", side_effect=spend_then_fail):
+        resp = client.post("/flashcards", json={"topic": "food", "count": 10}, headers={"X-Client-Id": "a"})
+    assert resp.status_code == 500
+    assert usage_service.admission.status()["global"]["used"] == 500
+
+
+def test_usage_endpoint_reports_ledger(client):
+    usage_service.ledger.record("food", "a", 3, 4, 0.01)
+    data = client.get("/usage").json()
+    assert data["ledger"]["by_topic"]["food"]["total_tokens"] == 7
+    assert "global" in data["budgets"]
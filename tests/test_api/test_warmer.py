@@ -0,0 +1,134 @@
+import hashlib
+import itertools
+import json
+import os
+from datetime import datetime, time
+from unittest.mock import MagicMock, patch
+import pytest
+from app.circuit_breaker import CircuitOpen
+from app.services import flashcard_service, warmer_service
+from app.services.flashcard_service import create_flashcards_service
+from app.warmer import DemandCounter, in_window, rank_topics
+
+
+@pytest.fixture
+def llm(tmp_path, monkeypatch):
+    monkeypatch.setattr(flashcard_service, "DATA_DIR", str(tmp_path / "decks"))
+    monkeypatch.setattr(flashcard_service, "AUDIO_DIR", str(tmp_path / "audio"))
+    monkeypatch.setattr(warmer_service, "DATA_DIR", str(tmp_path / "decks"))
+    monkeypatch.setattr(flashcard_service, "register_cards", lambda *a: None)
+    monkeypatch.setattr(flashcard_service, "index_cards", lambda *a: None)
+    prompts, ids = [], itertools.count()
+
+    def fake_call(prompt):
+        prompts.append(prompt)
+        n = int(prompt.split("Create ")[1].split(" ")[0])
+        topic = prompt.split('"')[1]
+        resp = MagicMock()
+        # hashes as definitions, so no two cards look like near-duplicates
+        words = [f"{topic}{next(ids)}" for _ in range(n)]
+        resp.choices[0].message.content = json.dumps(
+            [{"word": w, "definition": hashlib.sha1(w.encode()).hexdigest()} for w in words]
+        )
+        resp.usage.total_tokens = 50
+        return resp
+
+    with patch.object(flashcard_service, "call_mistral_with_retry", side_effect=fake_call):
+        yield prompts
+
+
+def test_demand_decays_and_ranks_with_history(tmp_path):
+    demand = DemandCounter(str(tmp_path / "demand.json"), half_life_s=10)
+    for _ in range(4):
+        demand.hit("food", now=0)
+    demand.hit("travel", now=10)
+    assert demand.scores(now=10) == {"food": 2.0, "travel": 1.0}
+
+    demand.save()
+    reloaded = DemandCounter(str(tmp_path / "demand.json"), half_life_s=10)
+    reloaded.load()
+    assert reloaded.scores(now=10) == demand.scores(now=10)
+
+    now = datetime(2024, 1, 1, 12).timestamp()
+    history = {"weather": {"updated_at": "2024-01-01T12:00:00"}, "food": {"updated_at": "2023-01-01T12:00:00"}}
+    ranked = rank_topics({"food": 2.0, "travel": 0.5}, history, 10, limit=2, now=now)
+    # weather was never counted but was just generated into, so it is predicted above travel
+    assert ranked == [("food", 2.0), ("weather", 1.0)]
+
+
+def test_warm_window_may_wrap_past_midnight():
+    assert in_window("", time(12))
+    assert in_window("01:00-06:00", time(3)) and not in_window("01:00-06:00", time(6))
+    assert in_window("22:00-06:00", time(23, 30)) and in_window("22:00-06:00", time(2))
+    assert not in_window("22:00-06:00", time(12))
+
+
+def test_warm_pass_fills_reserve_and_generation_serves_it(llm, isolated_warmer):
+    for topic in ("food", "food", "food", "travel"):
+        warmer_service.record_request(topic)
+
+    report = warmer_service.warm_pass(budget=10_000, limit=5, reserve_cards=3, idle=lambda: True)
+
+    assert report["topics_warmed"] == 2 and report["cards"] == 6 and report["tokens"] == 100
+    assert [p.split('"')[1] for p in llm] == ["food", "travel"]
+    reserved = isolated_warmer.cards("food")
+    assert len(reserved) == 3 and all(os.path.exists(c["tts_path"]) for c in reserved)
+    # a second pass finds every reserve full and spends nothing
+    assert warmer_service.warm_pass(budget=10_000, limit=5, reserve_cards=3, idle=lambda: True)["cards"] == 0
+
+    llm.clear()
+    result = create_flashcards_service({"topic": "food", "count": 2})
+    assert llm == []
+    assert result["added"] == [c["word"] for c in reserved[:2]]
+    assert result["generation"]["reserved"] == 2 and result["generation"]["tokens"] == 0
+    assert result["dedupe"]["tts_generated"] == 0 and result["dedupe"]["audio_reused"] == 2
+
+    # only the shortfall beyond the reserve is generated
+    result = create_flashcards_service({"topic": "food", "count": 3})
+    assert result["generation"]["reserved"] == 1 and result["generation"]["llm_calls"] == 1
+    assert len(result["added"]) == 3 and isolated_warmer.count("food") == 0
+
+
+def test_warm_pass_yields_to_learners_and_stops_at_budget(llm, isolated_warmer):
+    for topic in ("food", "food", "food", "travel", "travel", "weather"):
+        warmer_service.record_request(topic)
+
+    assert warmer_service.warm_pass(budget=10_000, reserve_cards=3, idle=lambda: False)["stopped"] == "busy"
+    assert llm == []
+
+    report = warmer_service.warm_pass(budget=50, reserve_cards=3, idle=lambda: True)
+    assert report["stopped"] == "budget" and report["topics_warmed"] == 1 and len(llm) == 1
+
+    dry = warmer_service.warm_pass(budget=50, reserve_cards=3, dry_run=True)
+    assert dry["cards"] == 6 and {w["topic"] for w in dry["wanted"]} == {"travel", "weather"}
+    assert len(llm) == 1
+
+
+def test_reserved_cards_already_in_the_deck_are_dropped(isolated_warmer):
+    isolated_warmer.add("food", [{"word": "밥", "definition": "rice"}, {"word": "물", "definition": "water"}])
+    cards = warmer_service.take_reserved("food", [{"word": "밥", "definition": "rice"}], 5)
+    assert [c["word"] for c in cards] == ["물"]
+    assert isolated_warmer.count("food") == 0
+
+
+def test_reserved_cards_go_back_when_the_request_fails(llm, isolated_warmer, monkeypatch):
+    cards = [{"word": "밥", "definition": "rice"}, {"word": "물", "definition": "water"}]
+    isolated_warmer.add("food", cards)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("LLM returned garbage")
+
+    monkeypatch.setattr(flashcard_service, "_generate_unique_cards", broken)
+    with pytest.raises(RuntimeError):
+        create_flashcards_service({"topic": "food", "count": 5})
+    assert [c["word"] for c in isolated_warmer.cards("food")] == ["밥", "물"]
+
+
+def test_tts_outage_is_not_reported_as_an_llm_outage(llm, isolated_warmer, monkeypatch):
+    def tts_down(word, audio_dir):
+        raise CircuitOpen("tts:fake", 30)
+
+    monkeypatch.setattr(flashcard_service, "generate_tts", tts_down)
+    warmer_service.record_request("food")
+    report = warmer_service.warm_pass(budget=10_000, limit=1, reserve_cards=2, idle=lambda: True)
+    assert report["stopped"] is None and report["cards"] == 2 and report["tts_failed"] == 2
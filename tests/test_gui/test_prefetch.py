@@ -0,0 +1,10 @@
+from gui.ui.widgets import cards_remaining
+
+CARDS = [{"topic": "food", "word": w} for w in ("밥", "물", "김치")] + [{"topic": "travel", "word": "기차"}]
+
+
+def test_cards_remaining_counts_only_the_current_topic():
+    assert cards_remaining(CARDS, "food", 0) == 2
+    assert cards_remaining(CARDS, "food", 2) == 0
+    assert cards_remaining(CARDS, "travel", None) == 1
+    assert cards_remaining([], "food", 0) == 0
@@ -0,0 +1,51 @@
+from gui.utils.sync_cache import SyncCache
+
+
+def _delta(feed, rev, changes, more=False, reset=False):
+    return {"feed": feed, "rev": rev, "more": more, "reset": reset, "changes": changes}
+
+
+def _change(rev, topic, word, **card):
+    return {"rev": rev, "op": "upsert", "topic": topic, "id": f"{topic}:{word}", "card": dict(card, word=word)}
+
+
+def test_pull_applies_pages_and_persists(tmp_path):
+    pages = {
+        0: _delta("f1", 1, [_change(1, "food", "밥")], more=True),
+        1: _delta("f1", 3, [_change(2, "food", "물"), _change(3, "food", "밥", definition="rice")]),
+    }
+    cache = SyncCache(str(tmp_path / "cache.json"))
+    assert cache.pull(lambda since, feed: pages.get(since)) == {"food"}
+    assert cache.rev == 3
+    assert [c["word"] for c in cache.cards_for("food")] == ["밥", "물"]
+    assert cache.cards_for("food")[0]["definition"] == "rice"
+
+    cache.save()
+    reloaded = SyncCache(str(tmp_path / "cache.json"))
+    assert reloaded.rev == 3 and reloaded.topics() == ["food"]
+
+
+def test_other_feed_replaces_cache(tmp_path):
+    cache = SyncCache(str(tmp_path / "cache.json"))
+    cache.apply(_delta("f1", 1, [_change(1, "food", "밥")]))
+    changed = cache.apply(_delta("f2", 1, [_change(1, "travel", "기차")], reset=True))
+    assert changed == {"food", "travel"}
+    assert cache.topics() == ["travel"]
+    # unreachable backend
+    assert cache.pull(lambda since, feed: None) is None
+
+
+def test_rebuilt_feed_is_pulled_from_the_start(tmp_path):
+    cache = SyncCache(str(tmp_path / "cache.json"))
+    cache.apply(_delta("f1", 3, [_change(r, "food", w) for r, w in ((1, "밥"), (2, "물"), (3, "김치"))]))
+    rebuilt = [_change(r, "food", w) for r, w in ((1, "밥"), (2, "물"), (3, "김치"), (4, "떡"), (5, "라면"))]
+    calls = []
+
+    def fetch(since, feed):
+        calls.append((since, feed))
+        # a server that ignores the feed id answers with the tail after `since` only
+        return _delta("f2", 5, [c for c in rebuilt if c["rev"] > since])
+
+    cache.pull(fetch)
+    assert calls == [(3, "f1"), (0, "f2")]
+    assert sorted(c["word"] for c in cache.cards_for("food")) == ["김치", "떡", "라면", "물", "밥"]
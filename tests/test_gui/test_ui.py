@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from gui.ui.app import FlashcardUI
+from gui.utils.sync_cache import SyncCache
 import tkinter as tk
 
 def test_flashcard_ui_initialization():
@@ -41,3 +42,50 @@ def test_load_topic():
         assert ui.word_var.get() == "안녕하세요"
 
     root.destroy()
+
+def test_on_speak_uses_resolved_player():
+    root = tk.Tk()
+    ui = FlashcardUI(root)
+    play_audio = MagicMock()
+    ui._speakers = [("player_mod.play_audio", "audio", play_audio)]
+    ui.flashcards = [{"word": "안녕하세요", "tts_path": "tts_audio/안녕하세요_7062.mp3"}]
+    ui.card_index = 0
+
+    with patch.object(ui, "_resolve_player") as resolve:
+        ui.on_speak()
+
+    resolve.assert_not_called()
+    play_audio.assert_called_once_with("tts_audio/안녕하세요_7062.mp3")
+    root.destroy()
+
+def test_prefetch_near_end_merges_new_cards():
+    root = tk.Tk()
+    ui = FlashcardUI(root)
+    ui.flashcards = [{"topic": "food", "word": "밥"}, {"topic": "food", "word": "물"}]
+    ui.current_topic = "food"
+    ui.card_index = 0
+
+    with patch.object(ui, "_run_in_background") as run:
+        ui.on_new_word()
+    assert ui._prefetching == "food"
+    run.assert_called_once()
+
+    ui._merge_prefetched("food", [{"topic": "food", "word": "물"}, {"topic": "food", "word": "김치"}])
+    assert [c["word"] for c in ui.flashcards] == ["밥", "물", "김치"]
+    assert ui._prefetching is None
+    root.destroy()
+
+
+def test_synced_topics_are_listed_with_local_bundles(tmp_path):
+    ui = FlashcardUI.__new__(FlashcardUI)
+    ui.sync_cache = SyncCache(str(tmp_path / "cache.json"))
+    change = {"rev": 1, "op": "upsert", "topic": "food", "id": "food:밥", "card": {"word": "밥"}}
+    ui.sync_cache.apply({"feed": "f1", "rev": 1, "changes": [change]})
+    (tmp_path / "library.fcb").write_bytes(b"FCBUNDLE")
+    (tmp_path / "food_20231001120000.json").write_text("[]", encoding="utf-8")
+
+    with patch.object(FlashcardUI, "_saved_dir", return_value=str(tmp_path)), \
+        patch("gui.api.client.fetch_changes", return_value=None):
+        files, changed = ui._list_saved_files()
+
+    assert files == ["food", "library.fcb"] and changed == set()